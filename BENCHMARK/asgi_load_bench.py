@@ -0,0 +1,57 @@
+# BENCHMARK/asgi_load_bench.py
+#
+# Same workload against the sync WSGI server (gunicorn, 1 sync worker) and
+# the ASGI mode (uvicorn, 1 worker). Signups use a fresh domain each, so
+# every one waits on the (simulated) DNS lookup; that wait is what the
+# event loop overlaps.
+#     python -m BENCHMARK.asgi_load_bench --requests 400 --concurrency 32 --dns-delay 0.05
+
+import argparse
+import http.client
+import json
+
+from BENCHMARK.bench_util import BENCH_DIR
+from BENCHMARK.load_util import start_server, request, signup_body, run_load
+from CREATE_DB_CODE.migrations import run_migrations
+
+
+def bench_server(kind: str, port: int, args) -> dict:
+    proc = start_server(kind, port, dns_delay=args.dns_delay, METRICS_ENABLED='false')
+    try:
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        request(conn, 'POST', '/auth/signup', signup_body(f'{kind}seed', 0))
+        _, body = request(conn, 'POST', '/auth/login',
+                          {'str_Email': f'{kind}seed0@{kind}seed0.bench.io', 'str_Password': 'Passw0rd!0'})
+        token = json.loads(body)['access_token']
+        conn.close()
+
+        return {
+            'signup':   run_load(port, args.requests, args.concurrency,
+                                 lambda c, i: request(c, 'POST', '/auth/signup', signup_body(kind, i))),
+            'get_user': run_load(port, args.requests, args.concurrency,
+                                 lambda c, i: request(c, 'GET', '/users/1', token=token)),
+        }
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Sync WSGI vs ASGI mode under concurrent load.')
+    parser.add_argument('--requests', type=int, default=400)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--dns-delay', type=float, default=0.05, help='simulated DNS lookup latency (s)')
+    parser.add_argument('--port', type=int, default=8711)
+    args = parser.parse_args()
+
+    run_migrations()
+    print(f"database: {BENCH_DIR}")
+    print(f"{args.requests} requests, concurrency {args.concurrency}, dns delay {args.dns_delay * 1000:.0f} ms")
+
+    for offset, kind in enumerate(('wsgi-sync', 'asgi')):
+        for scenario, result in bench_server(kind, args.port + offset, args).items():
+            print(f"{kind:9} {scenario:9} {json.dumps(result)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,15 @@
+# BENCHMARK/asgi_targets.py
+#
+# Server entry points for asgi_load_bench. The bench runs each server as a
+# subprocess with BENCH_DATABASE_URL and BENCH_DNS_DELAY set; the resolver
+# is swapped for a StaticResolver that sleeps BENCH_DNS_DELAY seconds.
+
+import os
+
+from BENCHMARK.bench_util import BENCH_DIR  # noqa: F401  (sets DATABASE_URL)
+from MODULE.USER.util.dns_util import set_resolver, StaticResolver
+
+set_resolver(StaticResolver(delay=float(os.getenv('BENCH_DNS_DELAY', '0.05'))))
+
+from app import app as wsgi_app  # noqa: E402
+from asgi import app as asgi_app  # noqa: E402
@@ -0,0 +1,78 @@
+# BENCHMARK/bench_util.py
+#
+# Shared helpers for the benchmark scripts. Import this module first: it
+# points DATABASE_URL at a throwaway SQLite file before any app module
+# creates the engine.
+
+import os
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+BENCH_DIR = tempfile.mkdtemp(prefix='signspell-bench-')
+os.environ['DATABASE_URL'] = os.getenv('BENCH_DATABASE_URL', f"sqlite:///{os.path.join(BENCH_DIR, 'bench.db')}")
+os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key-not-for-production')
+# One process: the memory user cache keeps its full TTL
+os.environ.setdefault('WEB_CONCURRENCY', '1')
+
+
+def user_rows(n: int, start: int = 0, deleted_every: int = 10, password_hash: str = 'x'):
+    """Synthetic tbl_User rows; every `deleted_every`-th row is soft-deleted."""
+    now = datetime.utcnow()
+    for i in range(start, start + n):
+        yield {
+            'str_First_Name':    f'First{i}',
+            'str_Last_Name':     f'Last{i}',
+            'str_Full_Name':     f'First{i} Last{i}',
+            'str_Location':      random.choice(('Chennai', 'Madurai', 'Coimbatore', 'Salem')),
+            'str_Email':         f'user{i}@bench.test',
+            'str_Password_hash': password_hash,
+            'lng_Created_By':    0,
+            'dte_Created_Date':  now,
+            'dte_Changed_Date':  now,
+            'bln_IsActive':      True,
+            'bln_IsDeleted':     bool(deleted_every) and i % deleted_every == 0,
+        }
+
+
+def seed_users(conn, n: int, start: int = 0, batch: int = 10000, **kwargs):
+    from sqlalchemy import insert
+    from CREATE_DB_CODE.tables_creation import tbl_User
+
+    rows = []
+    for row in user_rows(n, start, **kwargs):
+        rows.append(row)
+        if len(rows) >= batch:
+            conn.execute(insert(tbl_User), rows)
+            rows = []
+    if rows:
+        conn.execute(insert(tbl_User), rows)
+
+
+def time_calls(fn, repeat: int) -> list:
+    """Run fn() `repeat` times; returns per-call latencies in seconds."""
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def summarize(samples) -> dict:
+    """Latency summary in microseconds."""
+    return {
+        'n':   len(samples),
+        'p50': round(percentile(samples, 50) * 1e6, 1),
+        'p95': round(percentile(samples, 95) * 1e6, 1),
+        'p99': round(percentile(samples, 99) * 1e6, 1),
+        'mean': round(statistics.fmean(samples) * 1e6, 1),
+    }
@@ -0,0 +1,66 @@
+# BENCHMARK/bulk_import_bench.py
+#
+# 10k-user import through POST /users/bulk's service vs one
+# save_user_service call per user (sampled and extrapolated). Both are
+# bound by password hashing: the bulk path runs BULK_HASH_WORKERS
+# processes, so its rows/s is roughly that many times 1 / hash time.
+# POST /users/bulk runs the import as outbox jobs of BULK_JOB_ROWS rows;
+# exits 1 if one such job would not finish inside half JOBS_LEASE_SECONDS.
+#     python -m BENCHMARK.bulk_import_bench --rows 10000 --sample 200
+
+import argparse
+import time
+
+from BENCHMARK.bench_util import BENCH_DIR
+from config import Config
+from CREATE_DB_CODE.migrations import run_migrations
+from MODULE.USER.util.dns_util import set_resolver, StaticResolver
+from MODULE.USER.service.user_service import User
+from MODULE.USER.service.bulk_import_service import BulkImport
+
+
+def upload(n: int, prefix: str) -> list:
+    return [{
+        'str_First_Name': f'First{i}',
+        'str_Last_Name':  f'Last{i}',
+        'str_Location':   'Chennai',
+        'str_Email':      f'{prefix}{i}@domain{i % 50}.test',
+        'str_Password':   f'Passw0rd!{i}',
+    } for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk import vs per-user signup.')
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--sample', type=int, default=200)
+    args = parser.parse_args()
+
+    run_migrations()
+    set_resolver(StaticResolver())
+    print(f"database: {BENCH_DIR}")
+
+    t0 = time.perf_counter()
+    for row in upload(args.sample, 'single'):
+        User.save_user_service({**row, 'User_ID': 0})
+    per_user = (time.perf_counter() - t0) / args.sample
+
+    t0 = time.perf_counter()
+    result = User.bulk_save_users_service(upload(args.rows, 'bulk'), 0)
+    bulk = time.perf_counter() - t0
+
+    print(f"per-user signup : {per_user * 1e3:.2f} ms/user -> {per_user * args.rows:.1f} s for {args.rows} (extrapolated)")
+    print(f"bulk import     : {bulk:.2f} s for {args.rows} ({result['Inserted']} inserted, {result['Failed']} failed), "
+          f"{args.rows / bulk:.0f} rows/s with BULK_HASH_WORKERS={Config.BULK_HASH_WORKERS}")
+
+    t0 = time.perf_counter()
+    BulkImport.run_chunk({'offset': 0, 'created_by': 0, 'rows': upload(Config.BULK_JOB_ROWS, 'job')})
+    job = time.perf_counter() - t0
+    budget = Config.JOBS_LEASE_SECONDS / 2
+    print(f"one import job  : {job:.2f} s for BULK_JOB_ROWS={Config.BULK_JOB_ROWS} "
+          f"(budget {budget:.0f} s = JOBS_LEASE_SECONDS / 2)")
+    if job > budget:
+        raise SystemExit(f"An import job of {Config.BULK_JOB_ROWS} rows outlives its lease: lower BULK_JOB_ROWS")
+
+
+if __name__ == '__main__':
+    main()
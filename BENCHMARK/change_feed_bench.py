@@ -0,0 +1,88 @@
+# BENCHMARK/change_feed_bench.py
+#
+# Mirroring the user directory: a full re-read of GET /users pages (what a
+# poll-and-diff client does) vs one GET /users/changes poll after k edits,
+# at growing table sizes. The feed poll should track k, not the row count.
+#     python -m BENCHMARK.change_feed_bench --rows 100000 500000 --changes 10 1000
+
+import argparse
+import random
+import time
+from datetime import datetime
+
+from BENCHMARK.bench_util import seed_users
+from sqlalchemy import update
+from CREATE_DB_CODE.migrations import run_migrations
+from CREATE_DB_CODE.tables_creation import tbl_User
+from DB_CONNECTION.config import engine
+from MODULE.USER.service.user_service import User
+
+PAGE = 1000
+
+
+def full_read() -> int:
+    after, n = None, 0
+    while True:
+        page = User.list_users_service(PAGE, after)
+        n += len(page['Users'])
+        after = page['Next_Cursor']
+        if after is None:
+            return n
+
+
+def drain(cursor):
+    """Follow the feed to its end; returns (cursor, changes seen)."""
+    n = 0
+    while True:
+        page = User.user_changes_service(PAGE, cursor, settle_seconds=0)
+        n += len(page['Changes'])
+        cursor = page['Next_Cursor']
+        if not page['Has_More']:
+            return cursor, n
+
+
+def touch(ids):
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(update(tbl_User).where(tbl_User.c.lng_User_ID.in_(ids))
+                     .values(str_Location='Erode', dte_Modified_Date=now, dte_Changed_Date=now))
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Change feed vs full re-read.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[100000, 500000])
+    parser.add_argument('--changes', type=int, nargs='+', default=[10, 1000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    run_migrations()
+    seeded = 0
+    print(f"{'rows':>8} {'full re-read ms':>16} {'initial feed sync ms':>21} "
+          + ' '.join(f"{f'poll, {k} changes ms':>21}" for k in args.changes))
+    for rows in args.rows:
+        with engine.begin() as conn:
+            seed_users(conn, rows - seeded, start=seeded)
+        seeded = rows
+
+        full_ms = min(timed(full_read)[0] for _ in range(max(1, args.repeat // 2))) * 1000
+        sync_s, (cursor, _) = timed(lambda: drain(None))
+        polls = []
+        for k in args.changes:
+            best = None
+            for _ in range(args.repeat):
+                touch(random.sample(range(1, rows + 1), k))
+                elapsed, (cursor, seen) = timed(lambda: drain(cursor))
+                assert seen == k, (seen, k)
+                best = elapsed if best is None else min(best, elapsed)
+            polls.append(best * 1000)
+        print(f"{rows:>8} {full_ms:>16.0f} {sync_s * 1000:>21.0f} " + ' '.join(f"{p:>21.2f}" for p in polls))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# BENCHMARK/conditional_get_bench.py
+#
+# Full 200 vs revalidated 304 for the user_bp read routes (Flask test
+# client, no network), plus the cost of the table-wide validator query.
+#     python -m BENCHMARK.conditional_get_bench --rows 100000 --limit 1000
+
+import argparse
+
+from BENCHMARK.bench_util import seed_users, time_calls, summarize
+from MODULE.USER.util.dns_util import set_resolver, StaticResolver
+from CREATE_DB_CODE.migrations import run_migrations
+from DB_CONNECTION.config import engine
+from MODULE.USER.service.user_service import User
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Conditional GET: 200 vs 304.')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--limit', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=300)
+    args = parser.parse_args()
+
+    from app import app
+    from flask_jwt_extended import create_access_token
+
+    set_resolver(StaticResolver())
+    run_migrations()
+    with engine.begin() as conn:
+        seed_users(conn, args.rows)
+    with app.app_context():
+        auth = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+    client = app.test_client()
+
+    urls = {
+        'GET /users/<id>':   '/users/2',
+        'GET /users page':   f'/users?limit={args.limit}',
+        'GET /users/search': f'/users/search?name=first1&limit={args.limit}',
+    }
+    print(f"{'route':<18} {'variant':<6} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10}")
+    for name, url in urls.items():
+        etag = client.get(url, headers=auth).headers['ETag']
+        for label, headers in (('200', auth), ('304', {**auth, 'If-None-Match': etag})):
+            s = summarize(time_calls(lambda: client.get(url, headers=headers), args.repeat))
+            print(f"{name:<18} {label:<6} {s['p50']:>10} {s['p95']:>10} {s['p99']:>10}")
+
+    s = summarize(time_calls(User.users_validator, args.repeat))
+    print(f"{'users_validator':<18} {'':<6} {s['p50']:>10} {s['p95']:>10} {s['p99']:>10}")
+
+
+if __name__ == '__main__':
+    main()
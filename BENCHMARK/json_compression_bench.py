@@ -0,0 +1,66 @@
+# BENCHMARK/json_compression_bench.py
+#
+# JSON provider (stdlib vs orjson) and response compression on a large
+# GET /users page (Flask test client, no network), plus encode-only cost
+# of detail-shaped rows with datetimes.
+#     python -m BENCHMARK.json_compression_bench --rows 50000
+
+import argparse
+import os
+
+from BENCHMARK.bench_util import seed_users, time_calls, summarize
+
+os.environ.setdefault('USERS_PAGE_MAX_LIMIT', '50000')
+os.environ.setdefault('SLOW_REQUEST_MS', '60000')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='JSON provider and compression on a large user list.')
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    from datetime import datetime
+    from flask_jwt_extended import create_access_token
+    from app import app
+    from config import Config
+    from CREATE_DB_CODE.migrations import run_migrations
+    from DB_CONNECTION.config import engine
+    from MODULE.COMMON.util.json_util import init_json, orjson
+
+    run_migrations()
+    with engine.begin() as conn:
+        seed_users(conn, args.rows, deleted_every=0)
+    with app.app_context():
+        auth = {'Authorization': f'Bearer {create_access_token(identity="1")}'}
+    client = app.test_client()
+    url = f'/users?limit={args.rows}'
+
+    providers = ['default'] + (['orjson'] if orjson is not None else [])
+    now = datetime.utcnow()
+    details = [{'lng_User_ID': i, 'str_First_Name': f'First{i}', 'str_Last_Name': f'Last{i}',
+                'str_Full_Name': f'First{i} Last{i}', 'str_Email': f'user{i}@bench.test',
+                'str_Location': 'Chennai', 'bln_IsActive': True,
+                'dte_Created_Date': now, 'dte_Modified_Date': now} for i in range(args.rows)]
+
+    print(f"encode {args.rows} detail rows (2 datetimes each)")
+    print(f"{'provider':<9} {'dates':<6} {'p50 ms':>9} {'p95 ms':>9}")
+    for provider in providers:
+        for dates in ('http', 'iso'):
+            json = init_json(app, provider, dates)
+            s = summarize(time_calls(lambda: json.dumps({'Users': details}), args.repeat))
+            print(f"{provider:<9} {dates:<6} {s['p50'] / 1000:>9.1f} {s['p95'] / 1000:>9.1f}")
+
+    print(f"\nGET {url} (min size {Config.COMPRESSION_MIN_SIZE} B, level {Config.COMPRESSION_LEVEL})")
+    print(f"{'provider':<9} {'encoding':<9} {'bytes':>10} {'p50 ms':>9} {'p95 ms':>9}")
+    for provider in providers:
+        init_json(app, provider, Config.JSON_DATETIME_FORMAT)
+        for encoding in ('identity', 'gzip', 'deflate'):
+            headers = {**auth, 'Accept-Encoding': encoding}
+            size = len(client.get(url, headers=headers).data)
+            s = summarize(time_calls(lambda: client.get(url, headers=headers), args.repeat))
+            print(f"{provider:<9} {encoding:<9} {size:>10} {s['p50'] / 1000:>9.1f} {s['p95'] / 1000:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
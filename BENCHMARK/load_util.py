@@ -0,0 +1,119 @@
+# BENCHMARK/load_util.py
+#
+# HTTP load helpers: start the app as a server subprocess (see
+# asgi_targets.py) and drive it from keep-alive client threads.
+
+import http.client
+import json
+import os
+import socket
+import subprocess
+import threading
+import time
+
+from BENCHMARK.bench_util import percentile
+
+SERVERS = {
+    'wsgi': lambda port, threads: ['gunicorn', '-w', '1', '-k', 'gthread', '--threads', str(threads),
+                                   '-b', f'127.0.0.1:{port}', '--log-level', 'warning',
+                                   'BENCHMARK.asgi_targets:wsgi_app'],
+    'wsgi-sync': lambda port, threads: ['gunicorn', '-w', '1', '-b', f'127.0.0.1:{port}', '--log-level', 'warning',
+                                        'BENCHMARK.asgi_targets:wsgi_app'],
+    'asgi': lambda port, threads: ['uvicorn', '--workers', '1', '--port', str(port), '--log-level', 'warning',
+                                   '--no-access-log', 'BENCHMARK.asgi_targets:asgi_app'],
+}
+
+
+def start_server(kind: str, port: int, threads: int = 1, dns_delay: float = 0.0, **env) -> subprocess.Popen:
+    """Server subprocess on the benchmark database, stand-in resolver, no rate limits."""
+    env = {
+        **os.environ,
+        'BENCH_DATABASE_URL': os.environ['DATABASE_URL'],
+        'BENCH_DNS_DELAY':    str(dns_delay),
+        'RATE_LIMIT_ENABLED': 'false',
+        **env,
+    }
+    proc = subprocess.Popen(SERVERS[kind](port, threads), env=env)
+    try:
+        wait_for_port(port)
+    except Exception:
+        proc.terminate()
+        raise
+    return proc
+
+
+def wait_for_port(port: int, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'server on port {port} did not start')
+
+
+def request(conn, method: str, path: str, body=None, token: str = None):
+    headers = {'Content-Type': 'application/json'}
+    if token:
+        headers['Authorization'] = f'Bearer {token}'
+    conn.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+    resp = conn.getresponse()
+    return resp.status, resp.read()
+
+
+def signup_body(tag: str, i: int) -> dict:
+    return {
+        'str_First_Name': f'First{i}',
+        'str_Last_Name':  f'Last{i}',
+        'str_Location':   'Chennai',
+        'str_Email':      f'{tag}{i}@{tag}{i}.bench.io',
+        'str_Password':   f'Passw0rd!{i}',
+    }
+
+
+def run_load(port: int, n: int, concurrency: int, make_call) -> dict:
+    """
+    Fire n calls make_call(conn, i) from `concurrency` keep-alive clients.
+    Responses with status >= 400 (other than the expected ones the caller
+    filters) count as errors.
+    """
+    counter, lock = iter(range(n)), threading.Lock()
+    samples, errors = [], [0]
+
+    def client():
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                break
+            t0 = time.perf_counter()
+            try:
+                status, _ = make_call(conn, i)
+                ok = status < 400
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+                ok = False
+            elapsed = time.perf_counter() - t0
+            with lock:
+                samples.append(elapsed)
+                errors[0] += not ok
+        conn.close()
+
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - t0
+
+    return {
+        'req_per_s': round(n / wall, 1),
+        'p50_ms':    round(percentile(samples, 50) * 1000, 2),
+        'p95_ms':    round(percentile(samples, 95) * 1000, 2),
+        'p99_ms':    round(percentile(samples, 99) * 1000, 2),
+        'errors':    errors[0],
+    }
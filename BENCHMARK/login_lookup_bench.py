@@ -0,0 +1,57 @@
+# BENCHMARK/login_lookup_bench.py
+#
+# Login lookup latency against table size, before and after the
+# migration-2 indexes.
+#     python -m BENCHMARK.login_lookup_bench --sizes 1000 10000 100000
+
+import argparse
+import random
+
+from BENCHMARK.bench_util import seed_users, time_calls, summarize
+from sqlalchemy import text
+from DB_CONNECTION.config import engine, metadata
+from CREATE_DB_CODE.tables_creation import tbl_User
+from CREATE_DB_CODE.migrations import run_migrations, tbl_Schema_Version
+from MODULE.USER.service.user_service import _login_user_stmt
+
+
+def login_lookup(conn, email):
+    # Same statement as User.authenticate_user
+    return conn.execute(_login_user_stmt(email)).fetchone()
+
+
+def bench_size(size: int, repeat: int) -> tuple:
+    tbl_Schema_Version.drop(engine, checkfirst=True)
+    metadata.drop_all(engine)
+    tbl_User.create(engine)
+    with engine.begin() as conn:
+        for index in tbl_User.indexes:
+            conn.execute(text(f'DROP INDEX IF EXISTS "{index.name}"'))
+        seed_users(conn, size)
+
+    emails = [f'user{random.randrange(size)}@bench.test' for _ in range(repeat)]
+    results = []
+    for label in ('no index', 'indexed'):
+        if label == 'indexed':
+            run_migrations()
+        it = iter(emails)
+        with engine.connect() as conn:
+            samples = time_calls(lambda: login_lookup(conn, next(it)), repeat)
+        results.append((label, summarize(samples)))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Login lookup latency against table size.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'variant':<10} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10}")
+    for size in args.sizes:
+        for label, s in bench_size(size, args.repeat):
+            print(f"{size:>10} {label:<10} {s['p50']:>10} {s['p95']:>10} {s['p99']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# BENCHMARK/outbox_bench.py
+#
+# Background job outbox: POST /auth/forgot latency when the email is
+# enqueued vs sent inline over a simulated slow relay, and how fast a
+# JobWorker drains a backlog of send_email jobs.
+#     python -m BENCHMARK.outbox_bench --smtp-delay 0.3 --jobs 2000
+
+import argparse
+import os
+import time
+
+from BENCHMARK.bench_util import seed_users, time_calls, summarize
+
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+os.environ.setdefault('JOBS_WORKER_ENABLED', 'false')   # the benchmark runs its own workers
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Outbox enqueue vs inline send, and worker drain rate.')
+    parser.add_argument('--smtp-delay', type=float, default=0.3, help='simulated relay latency per message (s)')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--jobs', type=int, default=2000)
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 4])
+    args = parser.parse_args()
+
+    from app import app
+    from config import Config
+    from CREATE_DB_CODE.migrations import run_migrations
+    from DB_CONNECTION.config import engine
+    from MODULE.JOBS.service.outbox_service import Outbox
+    from MODULE.JOBS.service.worker_service import JobWorker, send_email_handler
+    from MODULE.JOBS.util.mail_util import MemoryMailer, build_message
+
+    run_migrations()
+    with engine.begin() as conn:
+        seed_users(conn, 10, deleted_every=0)
+    client = app.test_client()
+    slow = MemoryMailer(delay=args.smtp_delay)
+
+    print(f"{'POST /auth/forgot':<28} {'p50 ms':>8} {'p95 ms':>8}")
+    s = summarize(time_calls(lambda: client.post('/auth/forgot', json={'str_Email': 'user1@bench.test'}), args.repeat))
+    print(f"{'enqueue (this build)':<28} {s['p50'] / 1000:>8.1f} {s['p95'] / 1000:>8.1f}")
+    inline = lambda: slow.send(build_message(Config.MAIL_FROM, 'user1@bench.test', 'Reset', 'link'))
+    s = summarize(time_calls(lambda: (client.post('/auth/forgot', json={'str_Email': 'user2@bench.test'}), inline()),
+                             args.repeat))
+    print(f"{'inline send (relay delay)':<28} {s['p50'] / 1000:>8.1f} {s['p95'] / 1000:>8.1f}")
+
+    print(f"\n{'drain':<10} {'jobs':>6} {'seconds':>8} {'jobs/s':>8}")
+    for threads in args.threads:
+        for i in range(args.jobs):
+            Outbox.enqueue('send_email', {'to': f'user{i}@bench.test', 'subject': 'Hi', 'body': 'x'},
+                           f'bench-{threads}-{i}')
+        mailer = MemoryMailer()
+        worker = JobWorker({'send_email': send_email_handler(mailer, Config.MAIL_FROM)},
+                           threads=threads, batch_size=max(10, threads), poll_seconds=0.05)
+        start = time.perf_counter()
+        worker.start()
+        while len(mailer.sent) < args.jobs:
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - start
+        worker.stop()
+        print(f"{f'{threads} thread':<10} {args.jobs:>6} {elapsed:>8.2f} {args.jobs / elapsed:>8.0f}")
+    print(f"\nfinal: {Outbox.stats()}")
+
+
+if __name__ == '__main__':
+    main()
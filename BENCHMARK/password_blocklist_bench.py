@@ -0,0 +1,78 @@
+# BENCHMARK/password_blocklist_bench.py
+#
+# Breached-password blocklist: build time and file size, lookup latency for
+# hits and misses, and resident memory of the mmap'd file vs the same
+# entries held in a Python set.
+#     python -m BENCHMARK.password_blocklist_bench --entries 5000000
+
+import argparse
+import gc
+import os
+import random
+import time
+
+from BENCHMARK.bench_util import BENCH_DIR, time_calls, summarize
+from MODULE.USER.util.blocklist_util import PasswordBlocklist, build_blocklist
+
+
+def _rss_kb() -> dict:
+    """VmRSS split into anonymous (private heap) and file-backed (shareable) pages."""
+    fields = {}
+    with open('/proc/self/status') as f:
+        for line in f:
+            key, _, value = line.partition(':')
+            if key in ('VmRSS', 'RssAnon', 'RssFile'):
+                fields[key] = int(value.split()[0])
+    return fields
+
+
+def _passwords(n: int, seed: int = 7):
+    rnd = random.Random(seed)
+    for i in range(n):
+        yield f'{rnd.choice(("summer", "dragon", "monkey", "sunshine"))}{i}{rnd.randrange(1000)}!'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Memory-mapped password blocklist.')
+    parser.add_argument('--entries', type=int, default=5000000)
+    parser.add_argument('--lookups', type=int, default=100000)
+    parser.add_argument('--compare-set', action='store_true', help='also load the entries into a set (needs a lot of RAM)')
+    args = parser.parse_args()
+
+    path = os.path.join(BENCH_DIR, 'blocklist.bin')
+    t0 = time.perf_counter()
+    count = build_blocklist(_passwords(args.entries), path)
+    print(f"build    {count} entries in {time.perf_counter() - t0:.1f} s, {os.path.getsize(path) / 1e6:.1f} MB")
+
+    rnd = random.Random(1)
+    sample = set(rnd.sample(range(args.entries), min(args.lookups, args.entries)))
+    hits = [p for i, p in enumerate(_passwords(args.entries)) if i in sample]
+    misses = [f'Not-In-List-{i}!' for i in range(len(hits))]
+
+    gc.collect()
+    before = _rss_kb()
+    blocklist = PasswordBlocklist(path)
+    hit_iter, miss_iter = iter(hits), iter(misses)
+    hit = summarize(time_calls(lambda: next(hit_iter) in blocklist, len(hits)))
+    miss = summarize(time_calls(lambda: next(miss_iter) in blocklist, len(misses)))
+    after = _rss_kb()
+    assert all(p in blocklist for p in hits[:1000]) and not any(p in blocklist for p in misses[:1000])
+
+    print(f"\n{'lookup':<8} {'p50 us':>8} {'p95 us':>8} {'p99 us':>8}")
+    for name, s in (('hit', hit), ('miss', miss)):
+        print(f"{name:<8} {s['p50']:>8} {s['p95']:>8} {s['p99']:>8}")
+    print(f"\nmmap RSS after {len(hits) * 2} lookups: +{after['RssFile'] - before['RssFile']} kB file-backed "
+          f"(shared), +{after['RssAnon'] - before['RssAnon']} kB private")
+
+    if args.compare_set:
+        del hits, misses
+        gc.collect()
+        before = _rss_kb()
+        entries = set(_passwords(args.entries))
+        after = _rss_kb()
+        print(f"set()    RSS: +{after['RssAnon'] - before['RssAnon']} kB private per worker ({len(entries)} entries)")
+    blocklist.close()
+
+
+if __name__ == '__main__':
+    main()
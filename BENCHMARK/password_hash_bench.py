@@ -0,0 +1,55 @@
+# BENCHMARK/password_hash_bench.py
+#
+# Hashes per second per core for the legacy AES-CTR scheme and each
+# PasswordHasher backend at a few cost settings, and the cores a given
+# peak login rate would keep busy.
+#     python -m BENCHMARK.password_hash_bench --peak-logins 50
+
+import argparse
+import time
+
+from BENCHMARK.bench_util import summarize
+from MODULE.USER.util.password_util import PasswordHasher, ScryptHasher, Pbkdf2Hasher, legacy_ctr_hex
+
+CANDIDATES = [
+    ('scrypt n=2^13', PasswordHasher(ScryptHasher(n=2 ** 13))),
+    ('scrypt n=2^14', PasswordHasher(ScryptHasher(n=2 ** 14))),
+    ('scrypt n=2^15', PasswordHasher(ScryptHasher(n=2 ** 15))),
+    ('pbkdf2 i=310k', PasswordHasher(Pbkdf2Hasher(iterations=310000))),
+    ('pbkdf2 i=600k', PasswordHasher(Pbkdf2Hasher(iterations=600000))),
+]
+
+
+def measure(fn, min_seconds: float) -> list:
+    """Call fn() (at least 5 times) until min_seconds have passed; per-call seconds."""
+    samples, start = [], time.perf_counter()
+    while len(samples) < 5 or time.perf_counter() - start < min_seconds:
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Password hashing cost per core.')
+    parser.add_argument('--seconds', type=float, default=2.0, help='minimum time per candidate')
+    parser.add_argument('--peak-logins', type=float, default=50.0, help='peak logins per second to size for')
+    args = parser.parse_args()
+
+    password = 'Passw0rd!bench'
+    print(f"{'scheme':16} {'hashes/s/core':>14} {'verify p50 ms':>14} {'p99 ms':>8} {'cores @ peak':>13}")
+
+    rows = [('legacy aes-ctr', lambda: legacy_ctr_hex(password))]
+    for name, hasher in CANDIDATES:
+        stored = hasher.hash(password)
+        rows.append((name, lambda h=hasher, s=stored: h.verify(password, s)))
+
+    for name, fn in rows:
+        stats = summarize(measure(fn, args.seconds))
+        per_second = 1e6 / stats['mean']
+        print(f"{name:16} {per_second:14.1f} {stats['p50'] / 1000:14.2f} {stats['p99'] / 1000:8.2f} "
+              f"{args.peak_logins / per_second:13.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,85 @@
+# BENCHMARK/replica_routing_bench.py
+#
+# Read/write split on two local SQLite files (primary + a copied replica):
+# how much of a read-heavy request mix leaves the primary, and what the
+# routing costs per read (reader() vs a plain engine.connect()).
+#     python -m BENCHMARK.replica_routing_bench --requests 2000
+
+import argparse
+import os
+import random
+import sqlite3
+
+from BENCHMARK.bench_util import BENCH_DIR, seed_users, time_calls, summarize
+
+REPLICA_PATH = os.path.join(BENCH_DIR, 'replica.db')
+os.environ['DATABASE_REPLICA_URLS'] = f'sqlite:///{REPLICA_PATH}'
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+os.environ.setdefault('JOBS_WORKER_ENABLED', 'false')
+os.environ.setdefault('USER_CACHE_ENABLED', 'false')   # count every read as a query
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replica read routing.')
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--write-every', type=int, default=20, help='one PUT per this many requests')
+    parser.add_argument('--repeat', type=int, default=5000)
+    args = parser.parse_args()
+
+    from app import app
+    from sqlalchemy import text
+    from CREATE_DB_CODE.migrations import run_migrations
+    from DB_CONNECTION.config import engine, read_router
+    from DB_CONNECTION.query_counter import count_queries
+    from flask_jwt_extended import create_access_token
+
+    run_migrations()
+    with engine.begin() as conn:
+        seed_users(conn, args.rows)
+    src, dst = sqlite3.connect(engine.url.database), sqlite3.connect(REPLICA_PATH)
+    src.backup(dst)
+    src.close(), dst.close()
+
+    with app.app_context():
+        headers = {'Authorization': f"Bearer {create_access_token(identity='1')}"}
+    client = app.test_client()
+    pick = lambda: random.randrange(1, args.rows + 1)
+    mix = [
+        lambda: client.get(f'/users/{pick()}', headers=headers),
+        lambda: client.get(f'/users?limit=50&after={pick()}', headers=headers),
+        lambda: client.get(f'/users/search?name=first{pick() // 100}', headers=headers),
+        lambda: client.get(f"/users/batch?ids={','.join(str(pick()) for _ in range(20))}", headers=headers),
+    ]
+
+    replica = read_router.replicas[0]
+    with count_queries(engine) as on_primary, count_queries(replica) as on_replica:
+        for i in range(args.requests):
+            if i % args.write_every == 0:
+                client.put(f'/users/{pick()}', json={'str_Location': random.choice(('Erode', 'Vellore'))},
+                           headers=headers)
+            random.choice(mix)()
+    total = on_primary.count + on_replica.count
+    print(f"{args.requests} requests, 1 PUT per {args.write_every}")
+    print(f"  statements on primary: {on_primary.count:>6} ({on_primary.count / total:.0%})")
+    print(f"  statements on replica: {on_replica.count:>6} ({on_replica.count / total:.0%})")
+    print(f"  routing: {read_router.stats()}")
+
+    query = text('SELECT 1')
+
+    def plain():
+        with engine.connect() as conn:
+            conn.execute(query)
+
+    def routed():
+        with read_router.reader(pick()) as conn:
+            conn.execute(query)
+
+    print(f"\n{'SELECT 1 via':<20} {'p50 us':>8} {'p95 us':>8}")
+    for name, fn in (('engine.connect()', plain), ('read_router.reader', routed)):
+        s = summarize(time_calls(fn, args.repeat))
+        print(f"{name:<20} {s['p50']:>8} {s['p95']:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+# BENCHMARK/startup_bench.py
+#
+# Cold start: import + app build time, SQL statements issued while
+# building, and time to the first served request, each in a fresh
+# interpreter. "legacy" reproduces the old import-time work (create_all +
+# flasgger at startup). Then boot-to-first-response of gunicorn with two
+# workers, with and without preload.
+#     python -m BENCHMARK.startup_bench --runs 5
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from BENCHMARK.bench_util import seed_users
+from BENCHMARK.load_util import wait_for_port
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in a fresh interpreter; prints one JSON line
+_CHILD = """
+import json, sys, time
+t0 = time.perf_counter()
+import app as app_module
+from config import Config
+from DB_CONNECTION.query_counter import count_queries
+t1 = time.perf_counter()
+with count_queries() as counter:
+    if {legacy}:
+        from CREATE_DB_CODE.tables_creation import init_db
+        init_db()
+    class StartupConfig(Config):
+        SWAGGER_MODE = {swagger!r}
+    app = app_module.create_app(StartupConfig, start_jobs=False)
+t2 = time.perf_counter()
+from flask_jwt_extended import create_access_token
+with app.app_context():
+    token = create_access_token(identity='1')
+status = app.test_client().get('/users?limit=1', headers={{'Authorization': f'Bearer {{token}}'}}).status_code
+t3 = time.perf_counter()
+print(json.dumps({{'import': t1 - t0, 'build': t2 - t1, 'first': t3 - t2, 'total': t3 - t0,
+                  'sql': counter.count, 'status': status}}))
+"""
+
+
+def run_child(legacy: bool, swagger: str) -> dict:
+    out = subprocess.run([sys.executable, '-c', _CHILD.format(legacy=legacy, swagger=swagger)],
+                         cwd=ROOT, env={**os.environ, 'JOBS_WORKER_ENABLED': 'false'},
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def gunicorn_boot(preload: bool, port: int) -> float:
+    """Seconds from launching gunicorn (2 workers) to the first HTTP response."""
+    env = {**os.environ, 'PORT': str(port), 'WEB_CONCURRENCY': '2', 'JOBS_WORKER_ENABLED': 'false',
+           'GUNICORN_PRELOAD': 'true' if preload else 'false', 'RATE_LIMIT_ENABLED': 'false'}
+    start = time.perf_counter()
+    proc = subprocess.Popen(['gunicorn', '-c', 'gunicorn.conf.py', '--log-level', 'warning',
+                             'app:create_app(start_jobs=False)'], cwd=ROOT, env=env)
+    try:
+        wait_for_port(port)
+        import http.client
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+        conn.request('GET', '/users')
+        conn.getresponse().read()
+        return time.perf_counter() - start
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold-start time of the Flask app.')
+    parser.add_argument('--runs', type=int, default=5)
+    parser.add_argument('--port', type=int, default=8931)
+    parser.add_argument('--no-gunicorn', action='store_true')
+    args = parser.parse_args()
+
+    from CREATE_DB_CODE.migrations import run_migrations
+    from DB_CONNECTION.config import engine
+    run_migrations()
+    with engine.begin() as conn:
+        seed_users(conn, 100)
+
+    print(f"{'startup':<26} {'import ms':>10} {'build ms':>9} {'first req ms':>13} {'total ms':>9} {'SQL':>4}")
+    for label, legacy, swagger in (('legacy (create_all+eager)', True, 'eager'),
+                                   ('lazy swagger (default)', False, 'lazy'),
+                                   ('swagger off', False, 'off')):
+        runs = [run_child(legacy, swagger) for _ in range(args.runs)]
+        assert all(r['status'] == 200 for r in runs), runs
+        med = {k: statistics.median(r[k] for r in runs) * 1000 for k in ('import', 'build', 'first', 'total')}
+        print(f"{label:<26} {med['import']:>10.0f} {med['build']:>9.0f} {med['first']:>13.1f} "
+              f"{med['total']:>9.0f} {runs[0]['sql']:>4}")
+
+    if not args.no_gunicorn:
+        print(f"\n{'gunicorn -w 2':<26} {'boot to first response ms':>26}")
+        for preload in (False, True):
+            times = [gunicorn_boot(preload, args.port + i) for i in range(args.runs)]
+            print(f"{'preload' if preload else 'no preload':<26} {statistics.median(times) * 1000:>26.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+# BENCHMARK/suite.py
+#
+# Regression suite: HTTP load scenarios against the Flask app (gunicorn,
+# gthread) plus in-process micro-benchmarks, on a throwaway SQLite file
+# (BENCH_DATABASE_URL to override) with the DNS check swapped for a
+# StaticResolver.
+#     python -m BENCHMARK.suite --concurrency 16 --requests 300
+#     python -m BENCHMARK.suite --save-baseline              # write BENCHMARK/baseline.json
+#     python -m BENCHMARK.suite --threshold 0.25             # exit 1 if p95 / throughput regress >25%
+
+import argparse
+import http.client
+import json
+import os
+import platform
+import sys
+import time
+
+from BENCHMARK.bench_util import BENCH_DIR, seed_users, time_calls, percentile
+from BENCHMARK.load_util import start_server, request, signup_body, run_load
+from CREATE_DB_CODE.migrations import run_migrations
+from DB_CONNECTION.config import engine
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+
+def load_scenarios(args) -> dict:
+    port, n, c = args.port, args.requests, args.concurrency
+    proc = start_server('wsgi', port, threads=args.threads, dns_delay=args.dns_delay, SLOW_REQUEST_MS='60000')
+    try:
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+        request(conn, 'POST', '/auth/signup', signup_body('seed', 0))
+        credentials = {'str_Email': 'seed0@seed0.bench.io', 'str_Password': 'Passw0rd!0'}
+        tokens = json.loads(request(conn, 'POST', '/auth/login', credentials)[1])
+        access, refresh = tokens['access_token'], tokens['refresh_token']
+        user_id = int(tokens['lng_User_ID'])
+        conn.close()
+
+        scenarios = {
+            'signup':     lambda conn, i: request(conn, 'POST', '/auth/signup', signup_body('load', i)),
+            'login':      lambda conn, i: request(conn, 'POST', '/auth/login', credentials),
+            'refresh':    lambda conn, i: request(conn, 'POST', '/auth/refresh', token=refresh),
+            'list_users': lambda conn, i: request(conn, 'GET', '/users?limit=100', token=access),
+            'get_user':   lambda conn, i: request(conn, 'GET', f'/users/{user_id}', token=access),
+            # Alternate the value so every request is a real change
+            'update':     lambda conn, i: request(conn, 'PUT', f'/users/{user_id}',
+                                                  {'str_Location': f'City{i % 2}'}, token=access),
+        }
+        results = {}
+        for name, call in scenarios.items():
+            if args.only and name not in args.only:
+                continue
+            results[f'http.{name}'] = run_load(port, n, c, call)
+            print(f"http.{name:23} {json.dumps(results[f'http.{name}'])}", flush=True)
+        return results
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def micro(name: str, fn, repeat: int) -> dict:
+    samples = time_calls(fn, repeat)
+    result = {
+        'ops_per_s': round(len(samples) / sum(samples), 1),
+        'p50_us':    round(percentile(samples, 50) * 1e6, 1),
+        'p95_us':    round(percentile(samples, 95) * 1e6, 1),
+        'p99_us':    round(percentile(samples, 99) * 1e6, 1),
+    }
+    print(f"micro.{name:28} {json.dumps(result)}", flush=True)
+    return {f'micro.{name}': result}
+
+
+def micro_benchmarks(args) -> dict:
+    from MODULE.USER.util.user_util import hash_password, validate_password
+    from MODULE.USER.service.user_service import User
+    from MODULE.COMMON.util.schema_util import body_validator
+
+    results = {}
+    results.update(micro('hash_password', lambda: hash_password('Passw0rd!bench'), args.hash_repeat))
+    results.update(micro('validate_password', lambda: validate_password('Passw0rd!bench'), args.repeat))
+    signup_body = body_validator('/auth/signup', message='All fields required')
+    body = {'str_First_Name': 'A', 'str_Last_Name': 'B', 'str_Location': 'X',
+            'str_Email': 'a@bench.test', 'str_Password': 'Passw0rd!bench'}
+    results.update(micro('validate_signup_body', lambda: signup_body.validate(body), args.repeat))
+
+    seeded = 0
+    for rows in args.rows:
+        with engine.begin() as conn:
+            seed_users(conn, rows - seeded, start=10 ** 7 + seeded, deleted_every=0)
+        seeded = rows
+        results.update(micro(f'list_users_{rows // 1000}k_first',
+                             lambda: User.list_users_service(100), args.repeat))
+        # Deep page: keyset cursor half-way through the table
+        with engine.connect() as conn:
+            middle = conn.exec_driver_sql('SELECT MAX(lng_User_ID) FROM tbl_User').scalar() // 2
+        results.update(micro(f'list_users_{rows // 1000}k_deep',
+                             lambda: User.list_users_service(100, after=middle), args.repeat))
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """Regressions beyond `threshold` in p95 latency or throughput, as messages."""
+    failures = []
+    for name, base in baseline.get('results', {}).items():
+        current = results.get(name)
+        if current is None:
+            continue
+        for key, base_value in base.items():
+            value = current.get(key)
+            if value is None or not base_value:
+                continue
+            if key.startswith('p95') and value > base_value * (1 + threshold):
+                failures.append(f"{name} {key}: {value} > {base_value} (+{(value / base_value - 1) * 100:.0f}%)")
+            elif key.endswith('_per_s') and value < base_value * (1 - threshold):
+                failures.append(f"{name} {key}: {value} < {base_value} ({(value / base_value - 1) * 100:.0f}%)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load and micro-benchmark regression suite.')
+    parser.add_argument('--requests', type=int, default=300, help='requests per HTTP scenario')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--threads', type=int, default=16, help='gunicorn gthread threads')
+    parser.add_argument('--dns-delay', type=float, default=0.0, help='simulated DNS latency (s)')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 100000])
+    parser.add_argument('--repeat', type=int, default=500, help='calls per micro-benchmark')
+    parser.add_argument('--hash-repeat', type=int, default=30)
+    parser.add_argument('--only', nargs='+', help='HTTP scenarios to run (default: all)')
+    parser.add_argument('--skip-http', action='store_true')
+    parser.add_argument('--skip-micro', action='store_true')
+    parser.add_argument('--port', type=int, default=8721)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed relative regression')
+    parser.add_argument('--output', help='also write this run as JSON')
+    args = parser.parse_args()
+
+    run_migrations()
+    print(f"database: {BENCH_DIR}", flush=True)
+
+    results = {}
+    if not args.skip_http:
+        results.update(load_scenarios(args))
+    if not args.skip_micro:
+        results.update(micro_benchmarks(args))
+
+    run = {
+        'created':  time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'machine':  {'python': platform.python_version(), 'platform': platform.platform(),
+                     'cpus': os.cpu_count()},
+        'settings': {'requests': args.requests, 'concurrency': args.concurrency,
+                     'threads': args.threads, 'dns_delay': args.dns_delay},
+        'results':  results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(run, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(run, f, indent=2)
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"no baseline at {args.baseline}; run with --save-baseline first")
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    failures = compare(results, baseline, args.threshold)
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    print(f"{len(failures)} regression(s) beyond {args.threshold * 100:.0f}% vs {args.baseline}")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+# BENCHMARK/user_archive_bench.py
+#
+# Soft-deleted rows in tbl_User: hot-path query latency and tbl_User size
+# (table + indexes, SQLite dbstat) with the migration-6 indexes, with the
+# migration-7 partial indexes, and after the archive job has moved the old
+# deleted rows out; plus the job's rows moved per second and how long each
+# batch transaction holds the write lock.
+#     python -m BENCHMARK.user_archive_bench --rows 200000 --deleted-pct 50 --batch-size 500
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from BENCHMARK.bench_util import seed_users, time_calls, summarize
+from sqlalchemy import select, update, text
+from sqlalchemy.schema import CreateIndex
+from CREATE_DB_CODE.migrations import run_migrations
+from CREATE_DB_CODE.tables_creation import tbl_User
+from DB_CONNECTION.config import engine
+from MODULE.USER.service.archive_service import UserArchive
+from MODULE.USER.service.user_service import (
+    _list_users_stmt, _search_users_stmt, _user_details_stmt, _login_user_stmt
+)
+from MODULE.USER.util.user_util import check_unique_value
+
+PARTIAL_INDEXES = ('IX_User_Active_ID', 'IX_User_Deleted_ID', 'IX_User_Deleted_Date_ID')
+
+
+def use_legacy_indexes():
+    """The migration-6 schema: one (bln_IsDeleted, id) index over every row."""
+    with engine.begin() as conn:
+        for name in PARTIAL_INDEXES:
+            conn.execute(text(f'DROP INDEX IF EXISTS "{name}"'))
+        conn.execute(text('CREATE INDEX "IX_User_IsDeleted_ID" ON "tbl_User" ("bln_IsDeleted", "lng_User_ID")'))
+
+
+def use_partial_indexes():
+    with engine.begin() as conn:
+        conn.execute(text('DROP INDEX IF EXISTS "IX_User_IsDeleted_ID"'))
+        for index in tbl_User.indexes:
+            if index.name in PARTIAL_INDEXES:
+                conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+def table_bytes() -> int:
+    names = [i.name for i in tbl_User.indexes] + ['tbl_User', 'IX_User_IsDeleted_ID']
+    with engine.connect() as conn:
+        return sum(conn.execute(text('SELECT coalesce(sum(pgsize), 0) FROM dbstat WHERE name = :name'),
+                                {'name': name}).scalar() for name in names)
+
+
+def measure(active: list, repeat: int) -> dict:
+    """p50 µs per hot-path statement, each run as its service runs it."""
+    picks = random.choices(active, k=repeat * 2)
+    ids = iter([user_id for user_id, _ in picks] * 2)
+    emails = iter([email for _, email in picks])
+    queries = {
+        'list page (100)':     lambda c: c.execute(_list_users_stmt(next(ids)).limit(100)).fetchall(),
+        'get user':            lambda c: c.execute(_user_details_stmt(next(ids))).fetchone(),
+        'login lookup':        lambda c: c.execute(_login_user_stmt(next(emails))).fetchone(),
+        'check_unique_value':  lambda c: check_unique_value(tbl_User, 'str_Email', next(emails), c),
+        'search deleted (50)': lambda c: c.execute(_search_users_stmt(status='deleted')[0].limit(50)).fetchall(),
+        'search all "First1"': lambda c: c.execute(_search_users_stmt(name='First1', status='all')[0].limit(50)).fetchall(),
+    }
+    with engine.connect() as conn:
+        results = {name: summarize(time_calls(lambda: q(conn), repeat))['p50'] for name, q in queries.items()}
+        t0 = time.perf_counter()
+        conn.execute(_list_users_stmt().with_only_columns(tbl_User.c.lng_User_ID)).fetchall()
+        results['all active ids (ms)'] = (time.perf_counter() - t0) * 1000
+    return results
+
+
+def archive(batch_size: int, retention_days: float) -> dict:
+    """UserArchive.archive_batch until done, timing each transaction."""
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    batches, moved = [], 0
+    start = time.perf_counter()
+    while True:
+        t0 = time.perf_counter()
+        count = UserArchive.archive_batch(cutoff, batch_size)
+        if not count:
+            break
+        batches.append(time.perf_counter() - t0)
+        moved += count
+    elapsed = time.perf_counter() - start
+    return {'moved': moved, 'seconds': elapsed, 'batches': len(batches),
+            'batch_p50_ms': statistics.median(batches) * 1000 if batches else 0.0,
+            'batch_max_ms': max(batches, default=0.0) * 1000}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Soft-delete archival: throughput and query latency.')
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--deleted-pct', type=float, default=50, help='share of rows soft-deleted')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    run_migrations()
+    deleted_every = max(1, round(100 / args.deleted_pct)) if args.deleted_pct else 0
+    with engine.begin() as conn:
+        seed_users(conn, args.rows, deleted_every=deleted_every)
+        # Deleted two months ago, well past the default 30-day retention
+        old = datetime.utcnow() - timedelta(days=60)
+        conn.execute(update(tbl_User).where(tbl_User.c.bln_IsDeleted == True).values(dte_Deleted_Date=old))
+        active = conn.execute(select(tbl_User.c.lng_User_ID, tbl_User.c.str_Email)
+                              .where(tbl_User.c.bln_IsDeleted == False)).all()
+    deleted = args.rows - len(active)
+    print(f"{args.rows} rows, {deleted} soft-deleted\n")
+
+    phases = {}
+    use_legacy_indexes()
+    phases['migration 6'] = (measure(active, args.repeat), table_bytes())
+    use_partial_indexes()
+    phases['partial idx'] = (measure(active, args.repeat), table_bytes())
+    stats = archive(args.batch_size, retention_days=30)
+    phases['archived'] = (measure(active, args.repeat), table_bytes())
+
+    labels = list(phases)
+    print(f"{'p50 µs':<22}" + ''.join(f"{label:>14}" for label in labels))
+    for query in phases[labels[0]][0]:
+        print(f"{query:<22}" + ''.join(f"{phases[label][0][query]:>14.1f}" for label in labels))
+    print(f"{'tbl_User + idx MB':<22}" + ''.join(f"{phases[label][1] / 1e6:>14.1f}" for label in labels))
+
+    print(f"\narchive: {stats['moved']} rows in {stats['seconds']:.2f}s = {stats['moved'] / stats['seconds']:.0f} rows/s, "
+          f"{stats['batches']} batches of {args.batch_size}, "
+          f"batch p50 {stats['batch_p50_ms']:.1f} ms, max {stats['batch_max_ms']:.1f} ms")
+    print(f"final: {UserArchive.stats()}")
+
+
+if __name__ == '__main__':
+    main()
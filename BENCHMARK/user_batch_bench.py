@@ -0,0 +1,61 @@
+# BENCHMARK/user_batch_bench.py
+#
+# Rendering a list of N authors: N x GET /users/<id> vs one
+# GET /users/batch?ids=..., with the user cache cold (cleared before each
+# round) and warm. In-process test client, so JWT checks are included but
+# not network round trips.
+#     python -m BENCHMARK.user_batch_bench --ids 20 100 --repeat 30
+
+import argparse
+import os
+import random
+
+from BENCHMARK.bench_util import seed_users, time_calls, summarize
+
+os.environ.setdefault('RATE_LIMIT_ENABLED', 'false')
+os.environ.setdefault('JOBS_WORKER_ENABLED', 'false')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batch user lookup vs one request per id.')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--ids', type=int, nargs='+', default=[20, 100])
+    parser.add_argument('--repeat', type=int, default=30)
+    args = parser.parse_args()
+
+    from app import app
+    from CREATE_DB_CODE.migrations import run_migrations
+    from DB_CONNECTION.config import engine
+    from DB_CONNECTION.query_counter import count_queries
+    from MODULE.USER.service.user_service import user_cache
+    from flask_jwt_extended import create_access_token
+
+    run_migrations()
+    with engine.begin() as conn:
+        seed_users(conn, args.rows)
+    with app.app_context():
+        headers = {'Authorization': f"Bearer {create_access_token(identity='1')}"}
+    client = app.test_client()
+
+    print(f"{'ids':>4} {'cache':<5} {'variant':<14} {'p50 ms':>8} {'p95 ms':>8} {'SQL':>5}")
+    for n in args.ids:
+        ids = random.sample(range(1, args.rows + 1), n)
+        variants = {
+            'per-id GET': lambda: [client.get(f'/users/{i}', headers=headers) for i in ids],
+            'batch GET': lambda: client.get(f"/users/batch?ids={','.join(map(str, ids))}", headers=headers),
+        }
+        for cache in ('cold', 'warm'):
+            for name, fn in variants.items():
+                def run():
+                    if cache == 'cold' and user_cache is not None:
+                        user_cache.clear()
+                    fn()
+                run()
+                with count_queries() as q:
+                    run()
+                s = summarize(time_calls(run, args.repeat))
+                print(f"{n:>4} {cache:<5} {name:<14} {s['p50'] / 1000:>8.2f} {s['p95'] / 1000:>8.2f} {q.count:>5}")
+
+
+if __name__ == '__main__':
+    main()
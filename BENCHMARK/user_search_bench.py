@@ -0,0 +1,72 @@
+# BENCHMARK/user_search_bench.py
+#
+# GET /users/search service latency at a million rows, with and without
+# the migration-3 search indexes.
+#     python -m BENCHMARK.user_search_bench --rows 1000000 --repeat 200
+
+import argparse
+import random
+
+from BENCHMARK.bench_util import seed_users, time_calls, summarize
+from sqlalchemy import text
+from DB_CONNECTION.config import engine
+from CREATE_DB_CODE.migrations import run_migrations
+from MODULE.USER.service.user_service import User
+
+SEARCH_INDEXES = ('IX_User_FullName_Search', 'IX_User_Email_Search', 'IX_User_Location_ID')
+
+
+def cases(rows: int) -> dict:
+    """name -> fn() running one search (first page of 100 unless noted)."""
+    pick = lambda: random.randrange(1, rows)
+
+    def deep_page():
+        # Page 20 of a prefix matching every row
+        after = None
+        for _ in range(20):
+            after = User.search_users_service(name='first', after=after)['Next_Cursor']
+        return after
+
+    deep_cursor = deep_page()
+    return {
+        'name prefix (narrow)':  lambda: User.search_users_service(name=f'First{pick()}'),
+        'name prefix (broad)':   lambda: User.search_users_service(name='first'),
+        'name prefix, page 21':  lambda: User.search_users_service(name='first', after=deep_cursor),
+        'email prefix':          lambda: User.search_users_service(email=f'user{pick()}'),
+        'location':              lambda: User.search_users_service(location='Salem'),
+        'name + location':       lambda: User.search_users_service(name=f'first{pick() // 100}', location='Salem'),
+        'email, deleted':        lambda: User.search_users_service(email=f'user{pick() // 100}', status='deleted'),
+        'name, status=all':      lambda: User.search_users_service(name=f'first{pick()}', status='all'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='User search latency at scale.')
+    parser.add_argument('--rows', type=int, default=1000000)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--no-index-repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    run_migrations()
+    with engine.begin() as conn:
+        seed_users(conn, args.rows)
+    print(f"seeded {args.rows} rows")
+
+    print(f"{'case':<24} {'variant':<10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for label, repeat in (('no index', args.no_index_repeat), ('indexed', args.repeat)):
+        with engine.begin() as conn:
+            for name in SEARCH_INDEXES:
+                conn.execute(text(f'DROP INDEX IF EXISTS "{name}"'))
+        if label == 'indexed':
+            # Recreate exactly as the migration does
+            from CREATE_DB_CODE.migrations import _m003_user_search_indexes
+            with engine.begin() as conn:
+                _m003_user_search_indexes(conn)
+
+        for case, fn in cases(args.rows).items():
+            s = summarize(time_calls(fn, repeat))
+            print(f"{case:<24} {label:<10} {s['p50'] / 1000:>9.2f} {s['p95'] / 1000:>9.2f} {s['p99'] / 1000:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,365 @@
+# CREATE_DB_CODE/migrations.py
+#
+# Versioned schema migrations. Run once per deploy (Procfile "release"),
+# not inside every web worker:
+#     python -m CREATE_DB_CODE.migrations          apply pending migrations
+#     python -m CREATE_DB_CODE.migrations --list   show applied / pending
+#     python -m CREATE_DB_CODE.migrations --wait 60   retry while the database comes up
+
+import argparse
+import logging
+import time
+from datetime import datetime
+from sqlalchemy import (
+    Table, Column, BigInteger, Integer, String, DateTime, Boolean, PrimaryKeyConstraint,
+    Index, MetaData, select, insert, update, func, text, inspect
+)
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy.sql.functions import FunctionElement
+
+from DB_CONNECTION.config import engine
+
+# Kept out of the app metadata so create_all never touches it
+_migration_metadata = MetaData()
+tbl_Schema_Version = Table(
+    'tbl_Schema_Version', _migration_metadata,
+    Column('int_Version',      Integer,     nullable=False, autoincrement=False),
+    Column('str_Name',         String(200), nullable=False),
+    Column('dte_Applied_Date', DateTime,    nullable=False),
+    PrimaryKeyConstraint('int_Version', name='PK_Schema_Version')
+)
+
+
+def _create_index(conn, index: Index):
+    # IF NOT EXISTS rather than checkfirst: SQLite reflection skips expression indexes
+    conn.execute(CreateIndex(index, if_not_exists=True))
+
+
+# Migration 1 as first released: tbl_User and tbl_Revoked_Token, frozen here.
+# Never derive it from tables_creation, or a fresh database would get later
+# migrations' tables, columns and indexes before those migrations run.
+_baseline_metadata = MetaData()
+_baseline_User = Table(
+    'tbl_User', _baseline_metadata,
+    Column('lng_User_ID', BigInteger().with_variant(Integer, 'sqlite'), autoincrement=True),
+    Column('str_First_Name', String(100), nullable=False),
+    Column('str_Last_Name',  String(100), nullable=False),
+    Column('str_Full_Name',  String(200), nullable=False),
+    Column('str_Location',   String(50),  nullable=False),
+    Column('str_Email',      String(300), nullable=False),
+    Column('str_Password_hash', String,    nullable=True),
+    Column('lng_Created_By', BigInteger, nullable=False),
+    Column('lng_Modified_By', BigInteger, nullable=True),
+    Column('lng_Deleted_By',  BigInteger, nullable=True),
+    Column('dte_Created_Date',  DateTime, nullable=False),
+    Column('dte_Modified_Date', DateTime, nullable=True),
+    Column('dte_Deleted_Date',  DateTime, nullable=True),
+    Column('bln_IsActive',   Boolean, nullable=False),
+    Column('bln_IsDeleted',  Boolean, nullable=False),
+    PrimaryKeyConstraint('lng_User_ID', name='PK_User_ID')
+)
+_baseline_Revoked_Token = Table(
+    'tbl_Revoked_Token', _baseline_metadata,
+    Column('str_Jti',          String(64), nullable=False),
+    Column('dte_Expires',      DateTime,   nullable=False),
+    Column('dte_Revoked_Date', DateTime,   nullable=False),
+    PrimaryKeyConstraint('str_Jti', name='PK_Revoked_Token'),
+    Index('IX_Revoked_Token_Expires', 'dte_Expires')
+)
+
+
+def _m001_baseline(conn):
+    _baseline_metadata.create_all(conn, checkfirst=True)
+
+
+# Later migrations are frozen the same way: each one's tables and index
+# definitions are spelled out as they shipped. _frozen_User only lends its
+# columns to that DDL and to the data fixes; it is never created.
+_frozen_metadata = MetaData()
+_frozen_User = Table(
+    'tbl_User', _frozen_metadata,
+    Column('lng_User_ID',       BigInteger),
+    Column('str_Full_Name',     String(200)),
+    Column('str_Location',      String(50)),
+    Column('str_Email',         String(300)),
+    Column('dte_Created_Date',  DateTime),
+    Column('dte_Modified_Date', DateTime),
+    Column('dte_Deleted_Date',  DateTime),
+    Column('dte_Changed_Date',  DateTime),
+    Column('bln_IsDeleted',     Boolean)
+)
+_frozen_User_Archive = Table(
+    'tbl_User_Archive', _frozen_metadata,
+    Column('dte_Archived_Date', DateTime)
+)
+_frozen_Revoked_Token = Table(
+    'tbl_Revoked_Token', _frozen_metadata,
+    Column('dte_Revoked_Date', DateTime)
+)
+
+
+_M002_INDEXES = (
+    Index(
+        'UX_User_Email_Active', _frozen_User.c.str_Email, unique=True,
+        postgresql_where=_frozen_User.c.bln_IsDeleted == False,
+        sqlite_where=_frozen_User.c.bln_IsDeleted == False
+    ),
+    # Superseded by the partial indexes of migration 7
+    Index('IX_User_IsDeleted_ID', _frozen_User.c.bln_IsDeleted, _frozen_User.c.lng_User_ID),
+)
+
+
+def _m002_user_lookup_indexes(conn):
+    dupes = conn.execute(
+        select(_frozen_User.c.str_Email)
+        .where(_frozen_User.c.bln_IsDeleted == False)
+        .group_by(_frozen_User.c.str_Email)
+        .having(func.count() > 1)
+        .limit(10)
+    ).scalars().all()
+    if dupes:
+        raise RuntimeError(f"Duplicate active emails block UX_User_Email_Active: {dupes}")
+    for index in _M002_INDEXES:
+        _create_index(conn, index)
+
+
+class _m003_search_key(FunctionElement):
+    """tables_creation.search_key as migration 3 indexed it."""
+    type = String()
+    name = 'm003_search_key'
+    inherit_cache = True
+
+
+@compiles(_m003_search_key)
+def _m003_search_key_default(element, compiler, **kw):
+    return f"lower({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(_m003_search_key, 'postgresql')
+def _m003_search_key_postgresql(element, compiler, **kw):
+    return f'(lower({compiler.process(element.clauses, **kw)}) COLLATE "C")'
+
+
+_M003_INDEXES = (
+    Index('IX_User_FullName_Search', _frozen_User.c.bln_IsDeleted,
+          _m003_search_key(_frozen_User.c.str_Full_Name), _frozen_User.c.lng_User_ID),
+    Index('IX_User_Email_Search', _frozen_User.c.bln_IsDeleted,
+          _m003_search_key(_frozen_User.c.str_Email), _frozen_User.c.lng_User_ID),
+    Index('IX_User_Location_ID', _frozen_User.c.bln_IsDeleted, _frozen_User.c.str_Location, _frozen_User.c.lng_User_ID),
+)
+
+
+def _m003_user_search_indexes(conn):
+    for index in _M003_INDEXES:
+        _create_index(conn, index)
+
+
+_M004_INDEXES = (
+    Index('IX_User_Modified_Date', _frozen_User.c.dte_Modified_Date),
+    Index('IX_User_Deleted_Date', _frozen_User.c.dte_Deleted_Date),
+)
+
+
+def _m004_user_change_date_indexes(conn):
+    for index in _M004_INDEXES:
+        _create_index(conn, index)
+
+
+# tbl_Outbox as migration 5 created it (str_Result came with migration 10)
+_m005_Outbox = Table(
+    'tbl_Outbox', MetaData(),
+    Column('lng_Job_ID', BigInteger().with_variant(Integer, 'sqlite'), autoincrement=True),
+    Column('str_Job_Type',        String(50),  nullable=False),
+    Column('str_Idempotency_Key', String(200), nullable=False),
+    Column('str_Payload',         String,      nullable=False),
+    Column('str_Status',          String(10),  nullable=False),
+    Column('int_Attempts',        Integer,     nullable=False),
+    Column('str_Last_Error',      String,      nullable=True),
+    Column('dte_Run_After',       DateTime,    nullable=False),
+    Column('dte_Created_Date',    DateTime,    nullable=False),
+    Column('dte_Completed_Date',  DateTime,    nullable=True),
+    PrimaryKeyConstraint('lng_Job_ID', name='PK_Outbox'),
+    Index('UX_Outbox_Idempotency_Key', 'str_Idempotency_Key', unique=True),
+    Index('IX_Outbox_Status_Run_After', 'str_Status', 'dte_Run_After', 'lng_Job_ID')
+)
+
+
+def _m005_outbox(conn):
+    # create() also creates the table's indexes
+    _m005_Outbox.create(conn, checkfirst=True)
+
+
+_M006_INDEX = Index('IX_User_Changed_Date_ID', _frozen_User.c.dte_Changed_Date, _frozen_User.c.lng_User_ID)
+
+
+def _m006_user_changed_date(conn):
+    columns = {c['name'] for c in inspect(conn).get_columns('tbl_User')}
+    if 'dte_Changed_Date' not in columns:
+        conn.execute(text('ALTER TABLE "tbl_User" ADD COLUMN "dte_Changed_Date" TIMESTAMP'))
+    # Existing rows enter the feed at their latest known change
+    user = _frozen_User.c
+    conn.execute(
+        update(_frozen_User)
+        .where(user.dte_Changed_Date.is_(None))
+        .values(dte_Changed_Date=func.coalesce(user.dte_Deleted_Date, user.dte_Modified_Date, user.dte_Created_Date))
+    )
+    _create_index(conn, _M006_INDEX)
+
+
+_m007_User_Archive = Table(
+    'tbl_User_Archive', MetaData(),
+    Column('lng_User_ID',    BigInteger,  nullable=False, autoincrement=False),
+    Column('str_First_Name', String(100), nullable=False),
+    Column('str_Last_Name',  String(100), nullable=False),
+    Column('str_Full_Name',  String(200), nullable=False),
+    Column('str_Location',   String(50),  nullable=False),
+    Column('str_Email',      String(300), nullable=False),
+    Column('str_Password_hash', String,    nullable=True),
+    Column('lng_Created_By', BigInteger, nullable=False),
+    Column('lng_Modified_By', BigInteger, nullable=True),
+    Column('lng_Deleted_By',  BigInteger, nullable=True),
+    Column('dte_Created_Date',  DateTime, nullable=False),
+    Column('dte_Modified_Date', DateTime, nullable=True),
+    Column('dte_Deleted_Date',  DateTime, nullable=True),
+    Column('dte_Changed_Date',  DateTime, nullable=True),
+    Column('bln_IsActive',   Boolean, nullable=False),
+    Column('bln_IsDeleted',  Boolean, nullable=False),
+    Column('dte_Archived_Date', DateTime, nullable=False),
+    PrimaryKeyConstraint('lng_User_ID', name='PK_User_Archive'),
+    Index('IX_User_Archive_Email', 'str_Email')
+)
+
+
+_M007_INDEXES = (
+    Index('IX_User_Active_ID', _frozen_User.c.bln_IsDeleted, _frozen_User.c.lng_User_ID,
+          postgresql_where=_frozen_User.c.bln_IsDeleted == False,
+          sqlite_where=_frozen_User.c.bln_IsDeleted == False),
+    Index('IX_User_Deleted_ID', _frozen_User.c.bln_IsDeleted, _frozen_User.c.lng_User_ID,
+          postgresql_where=_frozen_User.c.bln_IsDeleted == True,
+          sqlite_where=_frozen_User.c.bln_IsDeleted == True),
+    Index('IX_User_Deleted_Date_ID', _frozen_User.c.bln_IsDeleted, _frozen_User.c.dte_Deleted_Date,
+          _frozen_User.c.lng_User_ID,
+          postgresql_where=_frozen_User.c.bln_IsDeleted == True,
+          sqlite_where=_frozen_User.c.bln_IsDeleted == True),
+)
+
+
+def _m007_user_archive(conn):
+    _m007_User_Archive.create(conn, checkfirst=True)
+    for index in _M007_INDEXES:
+        _create_index(conn, index)
+    conn.execute(text('DROP INDEX IF EXISTS "IX_User_IsDeleted_ID"'))
+
+
+_M008_INDEX = Index('IX_User_Archive_Archived_Date', _frozen_User_Archive.c.dte_Archived_Date)
+
+
+def _m008_user_archive_watermark(conn):
+    _create_index(conn, _M008_INDEX)
+
+
+_M009_INDEX = Index('IX_Revoked_Token_Revoked_Date', _frozen_Revoked_Token.c.dte_Revoked_Date)
+
+
+def _m009_revoked_token_revoked_date(conn):
+    _create_index(conn, _M009_INDEX)
+
+
+def _m010_outbox_result(conn):
+    columns = {c['name'] for c in inspect(conn).get_columns('tbl_Outbox')}
+    if 'str_Result' not in columns:
+        conn.execute(text('ALTER TABLE "tbl_Outbox" ADD COLUMN "str_Result" TEXT'))
+
+
+# (version, name, fn(conn)) - append only, never renumber
+MIGRATIONS = [
+    (1, 'baseline tables', _m001_baseline),
+    (2, 'tbl_User active-email and bln_IsDeleted indexes', _m002_user_lookup_indexes),
+    (3, 'tbl_User name/email prefix and location search indexes', _m003_user_search_indexes),
+    (4, 'tbl_User modified/deleted date indexes', _m004_user_change_date_indexes),
+    (5, 'tbl_Outbox background job table', _m005_outbox),
+    (6, 'tbl_User dte_Changed_Date change-feed column and index', _m006_user_changed_date),
+    (7, 'tbl_User_Archive and active/deleted partial indexes', _m007_user_archive),
+    (8, 'tbl_User_Archive archived-date index', _m008_user_archive_watermark),
+    (9, 'tbl_Revoked_Token revoked-date index', _m009_revoked_token_revoked_date),
+    (10, 'tbl_Outbox str_Result job result column', _m010_outbox_result),
+]
+
+
+def applied_versions(conn) -> set:
+    tbl_Schema_Version.create(conn, checkfirst=True)
+    return set(conn.execute(select(tbl_Schema_Version.c.int_Version)).scalars())
+
+
+def run_migrations(bind=None) -> list:
+    """
+    Apply pending migrations in order, each in its own transaction together
+    with its tbl_Schema_Version row. Returns the versions applied.
+    """
+    bind = bind or engine
+    applied = []
+    with bind.begin() as conn:
+        done = applied_versions(conn)
+
+    for version, name, fn in MIGRATIONS:
+        if version in done:
+            continue
+        with bind.begin() as conn:
+            if conn.dialect.name == 'postgresql':
+                # Serialise concurrent runners (e.g. two release jobs)
+                conn.execute(text('SELECT pg_advisory_xact_lock(731001)'))
+                if version in applied_versions(conn):
+                    continue
+            logging.info(f"Applying migration {version}: {name}")
+            fn(conn)
+            conn.execute(insert(tbl_Schema_Version).values(
+                int_Version=version, str_Name=name, dte_Applied_Date=datetime.utcnow()
+            ))
+        applied.append(version)
+    return applied
+
+
+def wait_for_database(timeout: float, bind=None):
+    """Retry a trivial query until the database answers or `timeout` seconds pass."""
+    bind = bind or engine
+    deadline = time.monotonic() + timeout
+    delay = 0.5
+    while True:
+        try:
+            with bind.connect() as conn:
+                conn.execute(text('SELECT 1'))
+            return
+        except OperationalError as e:
+            if time.monotonic() + delay > deadline:
+                raise
+            logging.warning(f"Database not reachable yet ({e.orig}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+            delay = min(delay * 2, 5.0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply database schema migrations.')
+    parser.add_argument('--list', action='store_true', help='show migration status and exit')
+    parser.add_argument('--wait', type=float, default=0, metavar='SECONDS',
+                        help='wait up to SECONDS for the database to accept connections')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
+
+    if args.wait:
+        wait_for_database(args.wait)
+
+    if args.list:
+        with engine.begin() as conn:
+            done = applied_versions(conn)
+        for version, name, _ in MIGRATIONS:
+            print(f"{version:>4}  {'applied' if version in done else 'pending':<8} {name}")
+        return
+
+    applied = run_migrations()
+    print(f"Applied migrations: {applied}" if applied else "Schema is up to date.")
+
+
+if __name__ == '__main__':
+    main()
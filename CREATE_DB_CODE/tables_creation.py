@@ -2,15 +2,41 @@
 
 import logging
 from sqlalchemy import (
-    Table, Column, BigInteger, String, DateTime, Boolean,
-    PrimaryKeyConstraint, func
+    Table, Column, BigInteger, Integer, String, DateTime, Boolean,
+    PrimaryKeyConstraint, Index, func
 )
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
 from DB_CONNECTION.config import engine, metadata
 
+class search_key(FunctionElement):
+    """
+    Case-insensitive sort/prefix key: lower(col) in byte order, so a prefix
+    is one contiguous index range. PostgreSQL needs COLLATE "C" for that;
+    SQLite's default BINARY collation already is.
+    """
+    type = String()
+    name = 'search_key'
+    inherit_cache = True
+
+
+@compiles(search_key)
+def _search_key_default(element, compiler, **kw):
+    return f"lower({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(search_key, 'postgresql')
+def _search_key_postgresql(element, compiler, **kw):
+    return f'(lower({compiler.process(element.clauses, **kw)}) COLLATE "C")'
+
+
+# SQLite only autoincrements an INTEGER PRIMARY KEY (local stand-in databases)
+_PK_BigInteger = BigInteger().with_variant(Integer, 'sqlite')
+
 # Define your table
 tbl_User = Table(
     'tbl_User', metadata,
-    Column('lng_User_ID', BigInteger, autoincrement=True),
+    Column('lng_User_ID', _PK_BigInteger, autoincrement=True),
     Column('str_First_Name', String(100), nullable=False),
     Column('str_Last_Name',  String(100), nullable=False),
     Column('str_Full_Name',  String(200), nullable=False),
@@ -23,22 +49,121 @@ tbl_User = Table(
     Column('dte_Created_Date',  DateTime, nullable=False, default=func.now()),
     Column('dte_Modified_Date', DateTime, nullable=True),
     Column('dte_Deleted_Date',  DateTime, nullable=True),
+    # Set by every insert/update/delete: the GET /users/changes feed position
+    Column('dte_Changed_Date',  DateTime, nullable=True),
     Column('bln_IsActive',   Boolean, nullable=False, default=True),
     Column('bln_IsDeleted',  Boolean, nullable=False, default=False),
     PrimaryKeyConstraint('lng_User_ID', name='PK_User_ID')
 )
 
+# One active account per email; login / forgot / uniqueness checks use it
+Index(
+    'UX_User_Email_Active', tbl_User.c.str_Email, unique=True,
+    postgresql_where=tbl_User.c.bln_IsDeleted == False,
+    sqlite_where=tbl_User.c.bln_IsDeleted == False
+)
+# Keyset paging on lng_User_ID, one partial index per status: GET /users,
+# exports and status=active searches never read deleted entries, and the
+# deleted side stays small once old rows move to tbl_User_Archive. The
+# constant bln_IsDeleted column gives the planner the same equality seek
+# the search indexes offer, so it picks these for id order.
+Index(
+    'IX_User_Active_ID', tbl_User.c.bln_IsDeleted, tbl_User.c.lng_User_ID,
+    postgresql_where=tbl_User.c.bln_IsDeleted == False,
+    sqlite_where=tbl_User.c.bln_IsDeleted == False
+)
+Index(
+    'IX_User_Deleted_ID', tbl_User.c.bln_IsDeleted, tbl_User.c.lng_User_ID,
+    postgresql_where=tbl_User.c.bln_IsDeleted == True,
+    sqlite_where=tbl_User.c.bln_IsDeleted == True
+)
+# Archive job: oldest deletions first
+Index(
+    'IX_User_Deleted_Date_ID', tbl_User.c.bln_IsDeleted, tbl_User.c.dte_Deleted_Date, tbl_User.c.lng_User_ID,
+    postgresql_where=tbl_User.c.bln_IsDeleted == True,
+    sqlite_where=tbl_User.c.bln_IsDeleted == True
+)
+# GET /users/search: status, then a prefix range already in (key, id) order
+Index('IX_User_FullName_Search', tbl_User.c.bln_IsDeleted, search_key(tbl_User.c.str_Full_Name), tbl_User.c.lng_User_ID)
+Index('IX_User_Email_Search', tbl_User.c.bln_IsDeleted, search_key(tbl_User.c.str_Email), tbl_User.c.lng_User_ID)
+Index('IX_User_Location_ID', tbl_User.c.bln_IsDeleted, tbl_User.c.str_Location, tbl_User.c.lng_User_ID)
+# max() lookups for the GET /users / search ETag validator
+Index('IX_User_Modified_Date', tbl_User.c.dte_Modified_Date)
+Index('IX_User_Deleted_Date', tbl_User.c.dte_Deleted_Date)
+# GET /users/changes: keyset range on (change time, id); export modified_since
+Index('IX_User_Changed_Date_ID', tbl_User.c.dte_Changed_Date, tbl_User.c.lng_User_ID)
+
+# Soft-deleted users past the retention window, moved out of tbl_User by
+# MODULE/USER/service/archive_service.py. Same columns, plus when they moved.
+tbl_User_Archive = Table(
+    'tbl_User_Archive', metadata,
+    Column('lng_User_ID',    BigInteger,  nullable=False, autoincrement=False),
+    Column('str_First_Name', String(100), nullable=False),
+    Column('str_Last_Name',  String(100), nullable=False),
+    Column('str_Full_Name',  String(200), nullable=False),
+    Column('str_Location',   String(50),  nullable=False),
+    Column('str_Email',      String(300), nullable=False),
+    Column('str_Password_hash', String,    nullable=True),
+    Column('lng_Created_By', BigInteger, nullable=False),
+    Column('lng_Modified_By', BigInteger, nullable=True),
+    Column('lng_Deleted_By',  BigInteger, nullable=True),
+    Column('dte_Created_Date',  DateTime, nullable=False),
+    Column('dte_Modified_Date', DateTime, nullable=True),
+    Column('dte_Deleted_Date',  DateTime, nullable=True),
+    Column('dte_Changed_Date',  DateTime, nullable=True),
+    Column('bln_IsActive',   Boolean, nullable=False),
+    Column('bln_IsDeleted',  Boolean, nullable=False),
+    Column('dte_Archived_Date', DateTime, nullable=False),
+    PrimaryKeyConstraint('lng_User_ID', name='PK_User_Archive'),
+    Index('IX_User_Archive_Email', 'str_Email'),
+    # max() watermark in the GET /users / search ETag validator
+    Index('IX_User_Archive_Archived_Date', 'dte_Archived_Date')
+)
+
+# Revoked JWTs (logout), shared by every worker; rows are pruned after dte_Expires
+tbl_Revoked_Token = Table(
+    'tbl_Revoked_Token', metadata,
+    Column('str_Jti',          String(64), nullable=False),
+    Column('dte_Expires',      DateTime,   nullable=False),
+    Column('dte_Revoked_Date', DateTime,   nullable=False, default=func.now()),
+    PrimaryKeyConstraint('str_Jti', name='PK_Revoked_Token'),
+    Index('IX_Revoked_Token_Expires', 'dte_Expires'),
+    # Incremental Bloom filter refresh: jtis revoked since the last one
+    Index('IX_Revoked_Token_Revoked_Date', 'dte_Revoked_Date')
+)
+
+# Outbox: background jobs (e.g. emails) written in the request's database and
+# run by the job workers. dte_Run_After is the next eligible time: the retry
+# backoff while pending, the lease expiry while running.
+tbl_Outbox = Table(
+    'tbl_Outbox', metadata,
+    Column('lng_Job_ID', _PK_BigInteger, autoincrement=True),
+    Column('str_Job_Type',        String(50),  nullable=False),
+    Column('str_Idempotency_Key', String(200), nullable=False),
+    Column('str_Payload',         String,      nullable=False),
+    Column('str_Status',          String(10),  nullable=False, default='pending'),
+    Column('int_Attempts',        Integer,     nullable=False, default=0),
+    Column('str_Last_Error',      String,      nullable=True),
+    Column('dte_Run_After',       DateTime,    nullable=False),
+    Column('dte_Created_Date',    DateTime,    nullable=False, default=func.now()),
+    Column('dte_Completed_Date',  DateTime,    nullable=True),
+    # JSON returned by the handler (e.g. a bulk import chunk's report)
+    Column('str_Result',          String,      nullable=True),
+    PrimaryKeyConstraint('lng_Job_ID', name='PK_Outbox'),
+    Index('UX_Outbox_Idempotency_Key', 'str_Idempotency_Key', unique=True),
+    # Claim query: status in (pending, running) and due, oldest first
+    Index('IX_Outbox_Status_Run_After', 'str_Status', 'dte_Run_After', 'lng_Job_ID')
+)
+
 def init_db():
     """
-    Call this once at application startup (not on every import).
-    Creates all tables if they don’t exist.
+    Creates all tables if they don't exist. The app no longer calls this at
+    startup: run the bootstrap command once per deploy instead
+    (python -m CREATE_DB_CODE.migrations), which also records the schema
+    version and brings existing databases up to date.
     """
     try:
         metadata.create_all(engine, checkfirst=True)
         #print("✅ Tables created or already exist.")
     except Exception:
         logging.exception("Table creation failed")
-
-# Note: Do NOT call init_db() on import. Call it in your app entrypoint:
-#     from CREATE_DB_CODE.tables_creation import init_db
-#     init_db()
@@ -0,0 +1,46 @@
+# DB_CONNECTION/async_config.py
+#
+# Async engine for the ASGI mode (asgi.py). Created on first use, so the
+# WSGI app never needs the async drivers: asyncpg for PostgreSQL,
+# aiosqlite for SQLite.
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from config import Config
+from DB_CONNECTION.config import DATABASE_URL
+
+_ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+asyncpg',
+    'postgres':   'postgresql+asyncpg',
+    'sqlite':     'sqlite+aiosqlite',
+}
+
+_async_engine = None
+
+
+def async_database_url(url: str) -> str:
+    scheme, sep, rest = url.partition('://')
+    base = scheme.split('+')[0]
+    return f"{_ASYNC_DRIVERS.get(base, scheme)}{sep}{rest}"
+
+
+def get_async_engine():
+    global _async_engine
+    if _async_engine is None:
+        url = async_database_url(DATABASE_URL)
+        options = {} if url.startswith('sqlite') else {
+            'pool_size':     Config.DB_POOL_SIZE,
+            'max_overflow':  Config.DB_MAX_OVERFLOW,
+            'pool_timeout':  Config.DB_POOL_TIMEOUT,
+            'pool_recycle':  Config.DB_POOL_RECYCLE,
+            'pool_pre_ping': Config.DB_PRE_PING != 'never',
+        }
+        _async_engine = create_async_engine(url, **options)
+    return _async_engine
+
+
+async def dispose_async_engine():
+    global _async_engine
+    if _async_engine is not None:
+        await _async_engine.dispose()
+        _async_engine = None
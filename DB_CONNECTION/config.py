@@ -2,13 +2,33 @@ import os
 from sqlalchemy import create_engine, MetaData
 from dotenv import load_dotenv
 
+from config import Config
+from DB_CONNECTION.pool import engine_options, install_idle_pre_ping
+from DB_CONNECTION.replica import ReplicaRouter
+
 # Load environment variables
 load_dotenv()
 
 # Get database URL from .env
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-# Create engine and metadata
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
+
+def _create_engine(url: str):
+    # Pool sizing / pre-ping come from Config
+    created = create_engine(url, **engine_options(url, Config))
+    if Config.DB_PRE_PING == 'idle':
+        install_idle_pre_ping(created, Config.DB_PRE_PING_IDLE_SECONDS)
+    return created
+
+
+# Create engine (primary: all writes) and metadata
+engine = _create_engine(DATABASE_URL)
 metadata = MetaData()
 
+# Read-only queries: replicas when DATABASE_REPLICA_URLS is set, else the primary
+read_router = ReplicaRouter(
+    engine,
+    [_create_engine(url) for url in Config.DATABASE_REPLICA_URLS],
+    retry_seconds=Config.DB_REPLICA_RETRY_SECONDS,
+    read_your_writes_seconds=Config.READ_YOUR_WRITES_SECONDS
+)
@@ -0,0 +1,114 @@
+# DB_CONNECTION/pool.py
+#
+# Engine/pool options from Config plus pool instrumentation. Sizes are per
+# process: a gunicorn deployment opens up to
+# workers * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections.
+
+import logging
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+from MODULE.COMMON.util.metrics_util import Counter, Histogram
+
+
+class PoolMetrics:
+    def __init__(self):
+        self.checkout_latency = Histogram()   # wait for a connection, incl. pre-ping
+        self.checkouts = Counter()
+        self.timeouts = Counter()
+        self.pings_failed = Counter()
+
+
+# Stand-in for pools that are not instrumented (in-memory SQLite)
+_NO_METRICS = PoolMetrics()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records checkout latency and checkout timeouts. Each
+    engine's pool has its own PoolMetrics, kept across dispose()/recreate().
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            self.metrics.timeouts.inc()
+            logging.warning(f"DB pool checkout timed out ({self.status()})")
+            raise
+        self.metrics.checkout_latency.observe(time.perf_counter() - start)
+        self.metrics.checkouts.inc()
+        return conn
+
+
+def pool_metrics(engine) -> PoolMetrics:
+    return getattr(engine.pool, 'metrics', _NO_METRICS)
+
+
+def engine_options(url: str, config) -> dict:
+    """create_engine kwargs for DATABASE_URL according to the DB_POOL_* / DB_PRE_PING settings."""
+    if url.startswith('sqlite') and (':memory:' in url or url.rstrip('/') in ('sqlite:', 'sqlite:/')):
+        return {}   # in-memory SQLite keeps its single-connection pool
+
+    return {
+        'poolclass':     InstrumentedQueuePool,
+        'pool_size':     config.DB_POOL_SIZE,
+        'max_overflow':  config.DB_MAX_OVERFLOW,
+        'pool_timeout':  config.DB_POOL_TIMEOUT,
+        'pool_recycle':  config.DB_POOL_RECYCLE,
+        'pool_pre_ping': config.DB_PRE_PING == 'always',
+    }
+
+
+def install_idle_pre_ping(engine, idle_seconds: float):
+    """
+    Ping only connections that sat idle in the pool longer than
+    idle_seconds, instead of on every checkout. A failed ping raises
+    DisconnectionError, which makes the pool retry with a fresh connection.
+    """
+    @event.listens_for(engine, 'checkin')
+    def _on_checkin(dbapi_conn, record):
+        record.info['checked_in_at'] = time.monotonic()
+
+    @event.listens_for(engine, 'checkout')
+    def _on_checkout(dbapi_conn, record, proxy):
+        checked_in_at = record.info.get('checked_in_at')
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        cursor = dbapi_conn.cursor()
+        try:
+            cursor.execute('SELECT 1')
+        except Exception as e:
+            pool_metrics(engine).pings_failed.inc()
+            raise exc.DisconnectionError() from e
+        finally:
+            cursor.close()
+
+
+def pool_stats(engine) -> dict:
+    pool, metrics = engine.pool, pool_metrics(engine)
+    stats = {
+        'checkouts':        metrics.checkouts.value,
+        'timeouts':         metrics.timeouts.value,
+        'pings_failed':     metrics.pings_failed.value,
+        'checkout_latency': metrics.checkout_latency.snapshot(),
+    }
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size':     pool.size(),
+            'in_use':   pool.checkedout(),
+            'idle':     pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+        })
+    return stats
@@ -0,0 +1,40 @@
+from contextlib import contextmanager
+from sqlalchemy import event
+
+from DB_CONNECTION.config import read_router
+
+
+class QueryCounter:
+    """Collects the SQL statements sent through an engine."""
+
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(bind=None):
+    """
+    Count round-trips issued inside the block, e.g.
+
+        with count_queries() as q:
+            User.save_user_service(data)
+        assert q.count == 1
+
+    Without `bind` this counts the primary and every read replica.
+    """
+    binds = [bind] if bind is not None else [e for _, e in read_router.named_engines()]
+    counter = QueryCounter()
+    for b in binds:
+        event.listen(b, 'before_cursor_execute', counter)
+    try:
+        yield counter
+    finally:
+        for b in binds:
+            event.remove(b, 'before_cursor_execute', counter)
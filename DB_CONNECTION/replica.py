@@ -0,0 +1,200 @@
+# DB_CONNECTION/replica.py
+#
+# Read routing: one primary engine for writes, N read-replica engines for
+# read-only queries. Replicas are used round-robin; one that fails to
+# connect is skipped for a cool-off period, then re-probed by the next
+# reader (no background threads, so nothing to restart after fork). With
+# no replicas configured every read goes to the primary.
+#
+# Read-your-writes across workers: a request that writes gets back a
+# signed, short-lived token (cookie and X-Read-Your-Writes header) holding
+# the write time; while it is valid that client's reads go to the primary,
+# whichever worker serves them.
+
+import contextvars
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from flask import request
+from itsdangerous import URLSafeTimedSerializer, BadSignature
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError, DBAPIError
+
+from MODULE.COMMON.util.cache_util import TTLCache
+from MODULE.COMMON.util.metrics_util import Counter
+
+# Replica used by the current request: None outside a request, -1 before
+# its first read. Keeps e.g. a list page and its ETag validator on one replica.
+_request_replica = contextvars.ContextVar('request_replica', default=None)
+
+# Per request: whether the client's token pins it to the primary, and
+# whether this request wrote (None outside a request)
+_request_pinned = contextvars.ContextVar('request_pinned', default=False)
+_request_wrote = contextvars.ContextVar('request_wrote', default=None)
+
+READ_ROUTES = ('replica', 'primary', 'pinned', 'fallback')
+RYW_COOKIE = 'ryw'
+RYW_HEADER = 'X-Read-Your-Writes'
+
+
+class ReplicaRouter:
+    """
+    reader(*keys) is a context manager yielding a read connection. `keys`
+    name what the read is about (a user id, 'email:<address>'); a key passed
+    to note_write() within the last `read_your_writes_seconds` sends the
+    read to the primary, so a user sees their own change straight away.
+    Key pins are per process; init_replica_routing() adds the per-client
+    token that carries the pin to other workers.
+    """
+
+    def __init__(self, primary, replicas: list = (), retry_seconds: float = 30.0,
+                 read_your_writes_seconds: float = 0.0, max_pins: int = 100000):
+        self.primary = primary
+        self.replicas = list(replicas)
+        self.retry_seconds = retry_seconds
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._down_until = [0.0] * len(self.replicas)
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+        self._pins = TTLCache(maxsize=max_pins, ttl=read_your_writes_seconds) if read_your_writes_seconds > 0 else None
+        self.reads = {route: Counter() for route in READ_ROUTES}
+
+    def note_write(self, *keys):
+        if _request_wrote.get() is not None:
+            _request_wrote.set(True)
+        if self._pins is not None:
+            for key in keys:
+                if key is not None:
+                    self._pins.set(key, True)
+
+    def pinned(self, *keys) -> bool:
+        if self._pins is None:
+            return False
+        return _request_pinned.get() or any(self._pins.get(key) for key in keys if key is not None)
+
+    def mark_down(self, index: int, error):
+        with self._lock:
+            self._down_until[index] = time.monotonic() + self.retry_seconds
+        logging.warning(f"Read replica {index} unavailable for {self.retry_seconds:.0f}s: {error}")
+
+    def _candidates(self) -> list:
+        """Replica indexes to try: the request's replica, else round-robin; cooling-off ones skipped."""
+        n = len(self.replicas)
+        start = next(self._next) % n
+        order = [(start + i) % n for i in range(n)]
+        sticky = _request_replica.get()
+        if sticky is not None and sticky >= 0:
+            order.remove(sticky)
+            order.insert(0, sticky)
+        now = time.monotonic()
+        return [i for i in order if self._down_until[i] <= now]
+
+    def _connect_replica(self):
+        """(index, connection) of the first replica that connects, or (None, None)."""
+        for index in self._candidates():
+            try:
+                conn = self.replicas[index].connect()
+            except OperationalError as e:
+                self.mark_down(index, e.orig)
+                continue
+            if _request_replica.get() is not None:
+                _request_replica.set(index)
+            return index, conn
+        return None, None
+
+    @contextmanager
+    def reader(self, *keys, primary: bool = False):
+        """primary=True forces the primary (the caller knows the data just changed)."""
+        if not self.replicas or primary or self.pinned(*keys):
+            self.reads['pinned' if self.replicas else 'primary'].inc()
+            with self.primary.connect() as conn:
+                yield conn
+            return
+
+        index, conn = self._connect_replica()
+        if conn is None:
+            self.reads['fallback'].inc()
+            with self.primary.connect() as conn:
+                yield conn
+            return
+
+        self.reads['replica'].inc()
+        try:
+            with conn:
+                yield conn
+        except DBAPIError as e:
+            # Lost mid-query: stop sending reads there; this read still fails
+            if e.connection_invalidated or isinstance(e, OperationalError):
+                self.mark_down(index, e.orig)
+            raise
+
+    def check(self) -> list:
+        """Probe every replica now (SELECT 1); per-replica health for /ops."""
+        health = []
+        for index, replica in enumerate(self.replicas):
+            try:
+                with replica.connect() as conn:
+                    conn.execute(text('SELECT 1'))
+                with self._lock:
+                    self._down_until[index] = 0.0
+                up = True
+            except OperationalError as e:
+                self.mark_down(index, e.orig)
+                up = False
+            health.append({'replica': index, 'url': replica.url.render_as_string(hide_password=True), 'up': up})
+        return health
+
+    def named_engines(self) -> list:
+        """[(label, engine)]: 'primary', then 'replica0', 'replica1', ..."""
+        return [('primary', self.primary)] + [(f'replica{i}', r) for i, r in enumerate(self.replicas)]
+
+    def dispose(self, close: bool = True):
+        for replica in self.replicas:
+            replica.dispose(close=close)
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        return {
+            'replicas':      len(self.replicas),
+            'replicas_down': sum(1 for t in self._down_until if t > now),
+            **{f'reads_{route}': counter.value for route, counter in self.reads.items()},
+        }
+
+
+def init_replica_routing(app, router: ReplicaRouter):
+    """
+    Make the replica choice sticky for the duration of each request, and
+    pin a client that just wrote to the primary on every worker.
+    """
+    if not router.replicas:
+        return
+    window = router.read_your_writes_seconds
+    signer = URLSafeTimedSerializer(app.config['SECRET_KEY'], salt='read-your-writes')
+
+    @app.before_request
+    def _start_request():
+        _request_replica.set(-1)
+        _request_wrote.set(False)
+        token = request.headers.get(RYW_HEADER) or request.cookies.get(RYW_COOKIE)
+        if window > 0 and token:
+            try:
+                signer.loads(token, max_age=window)
+                _request_pinned.set(True)
+            except BadSignature:
+                pass
+
+    @app.after_request
+    def _issue_token(response):
+        if window > 0 and _request_wrote.get():
+            token = signer.dumps(int(time.time()))
+            response.headers[RYW_HEADER] = token
+            response.set_cookie(RYW_COOKIE, token, max_age=int(window) or 1, httponly=True, samesite='Lax')
+        return response
+
+    @app.teardown_request
+    def _end_request(_exc):
+        _request_replica.set(None)
+        _request_pinned.set(False)
+        _request_wrote.set(None)
@@ -0,0 +1,184 @@
+import hashlib
+import logging
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, insert, delete
+from sqlalchemy.exc import IntegrityError
+
+from config import Config
+from DB_CONNECTION.config import engine
+from CREATE_DB_CODE.tables_creation import tbl_Revoked_Token
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (no false negatives)."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self._bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class MemoryRevocationStore:
+    """Per-process store: jti -> exp. Only correct with a single worker."""
+
+    def __init__(self, prune_interval: float = 300.0):
+        self._revoked = {}
+        self._lock = threading.Lock()
+        self._prune_interval = prune_interval
+        self._next_prune = time.time() + prune_interval
+
+    def revoke(self, jti: str, exp: int):
+        with self._lock:
+            self._revoked[jti] = exp
+            if time.time() >= self._next_prune:
+                self._prune()
+
+    def is_revoked(self, jti: str) -> bool:
+        exp = self._revoked.get(jti)
+        return exp is not None and exp > time.time()
+
+    def _prune(self):
+        now = time.time()
+        self._revoked = {j: e for j, e in self._revoked.items() if e > now}
+        self._next_prune = now + self._prune_interval
+
+    def __len__(self):
+        return len(self._revoked)
+
+
+class DatabaseRevocationStore:
+    """
+    Shared store backed by tbl_Revoked_Token, so a logout applies to every
+    worker and survives restarts. Each worker keeps a Bloom filter of the
+    unexpired jtis; only filter hits cost a database round-trip. The
+    filter is kept current off the request path by a refresher thread
+    started every `refresh_interval` seconds: it adds the jtis revoked
+    since its last run and rebuilds from scratch (pruning expired rows)
+    every `prune_interval`. A jti revoked by another worker is therefore
+    seen here within about one refresh interval. While there is no filter
+    or it is older than `max_staleness` (refreshes failing), every check
+    goes to the database.
+    """
+
+    # Overlap between incremental loads: covers commit delay and clock skew across servers
+    SINCE_MARGIN = timedelta(seconds=60)
+
+    def __init__(self, refresh_interval: float = 5.0, prune_interval: float = 300.0,
+                 max_staleness: float = None):
+        self.refresh_interval = refresh_interval
+        self.prune_interval = prune_interval
+        self.max_staleness = max_staleness or 3 * refresh_interval
+        self._filter = None
+        self._capacity = 0
+        self._count = 0
+        self._since = None           # jtis revoked after this (UTC) may be missing from the filter
+        self._loaded_at = 0.0        # monotonic time of the last successful refresh
+        self._attempted_at = float('-inf')
+        self._next_rebuild = 0.0
+        self._refresher = None       # (pid, thread): threads do not survive fork
+        self._lock = threading.Lock()
+
+    def revoke(self, jti: str, exp: int):
+        try:
+            with engine.connect() as conn:
+                conn.execute(insert(tbl_Revoked_Token).values(
+                    str_Jti=jti,
+                    dte_Expires=datetime.utcfromtimestamp(exp),
+                    dte_Revoked_Date=datetime.utcnow()
+                ))
+                conn.commit()
+        except IntegrityError:
+            pass  # already revoked
+        bloom = self._filter
+        if bloom is not None:
+            bloom.add(jti)
+
+    def is_revoked(self, jti: str) -> bool:
+        now = time.monotonic()
+        if now - self._attempted_at >= self.refresh_interval:
+            self._start_refresh()
+        bloom = self._filter
+        if bloom is not None and now - self._loaded_at < self.max_staleness and jti not in bloom:
+            return False
+        try:
+            with engine.connect() as conn:
+                row = conn.execute(
+                    select(tbl_Revoked_Token.c.str_Jti).where(
+                        tbl_Revoked_Token.c.str_Jti == jti,
+                        tbl_Revoked_Token.c.dte_Expires > datetime.utcnow()
+                    )
+                ).fetchone()
+            return row is not None
+        except Exception:
+            logging.exception('DatabaseRevocationStore.is_revoked')
+            return True  # fail closed
+
+    def _start_refresh(self):
+        with self._lock:
+            pid = os.getpid()
+            if self._refresher is not None and self._refresher[0] == pid and self._refresher[1].is_alive():
+                return
+            self._attempted_at = time.monotonic()
+            thread = threading.Thread(target=self.refresh, name='jwt-revocation-refresh', daemon=True)
+            self._refresher = (pid, thread)
+            thread.start()
+
+    def refresh(self):
+        """Bring the filter up to date; runs on the refresher thread."""
+        try:
+            now = datetime.utcnow()
+            rebuild = self._filter is None or time.monotonic() >= self._next_rebuild
+            live = tbl_Revoked_Token.c.dte_Expires > now
+            with engine.connect() as conn:
+                if rebuild:
+                    conn.execute(delete(tbl_Revoked_Token).where(tbl_Revoked_Token.c.dte_Expires <= now))
+                    conn.commit()
+                    jtis = conn.execute(select(tbl_Revoked_Token.c.str_Jti).where(live)).scalars().all()
+                else:
+                    jtis = conn.execute(select(tbl_Revoked_Token.c.str_Jti).where(
+                        tbl_Revoked_Token.c.dte_Revoked_Date >= self._since, live
+                    )).scalars().all()
+
+            if rebuild:
+                bloom = BloomFilter(max(1024, 2 * len(jtis)))
+                self._capacity, self._count = max(1024, 2 * len(jtis)), 0
+                self._next_rebuild = time.monotonic() + self.prune_interval
+            else:
+                bloom = self._filter
+            for jti in jtis:
+                bloom.add(jti)
+            self._count += len(jtis)
+            if self._count > self._capacity:
+                self._next_rebuild = 0.0   # over capacity: resize on the next run
+            self._filter = bloom
+            self._since = now - self.SINCE_MARGIN
+            self._loaded_at = time.monotonic()
+        except Exception:
+            logging.exception('DatabaseRevocationStore.refresh')
+
+
+def build_revocation_store(backend: str):
+    if backend == 'memory':
+        return MemoryRevocationStore()
+    if backend == 'database':
+        return DatabaseRevocationStore(refresh_interval=Config.JWT_REVOCATION_REFRESH_SECONDS)
+    raise ValueError(f"Unknown JWT revocation backend: {backend}")
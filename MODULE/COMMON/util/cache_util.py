@@ -0,0 +1,202 @@
+import itertools
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL and hit/miss/eviction counters.
+    get() returns `default` for missing or expired keys.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._data = OrderedDict()   # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at > self._clock():
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._data[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value, ttl: float = None):
+        expires_at = self._clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'size':      len(self._data),
+            'maxsize':   self.maxsize,
+            'hits':      self.hits,
+            'misses':    self.misses,
+            'evictions': self.evictions,
+            'hit_rate':  round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class MemoryCacheBackend:
+    """
+    Per-process read-through backend. get() hands back a version token and
+    set() only stores if no invalidate() happened since, so a reader that
+    raced a write cannot put the old row back.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 300.0):
+        self._data = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._versions = TTLCache(maxsize=maxsize, ttl=ttl * 2)
+        self._counter = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            return self._data.get(key), self._versions.get(key)
+
+    def set(self, key, value, token=None):
+        with self._lock:
+            if self._versions.get(key) == token:
+                self._data.set(key, value)
+
+    def get_many(self, keys) -> dict:
+        """key -> (value or None, token) for each key, under one lock."""
+        with self._lock:
+            return {key: (self._data.get(key), self._versions.get(key)) for key in keys}
+
+    def set_many(self, items: dict):
+        """items: key -> (value, token from get_many); same rule as set()."""
+        with self._lock:
+            for key, (value, token) in items.items():
+                if self._versions.get(key) == token:
+                    self._data.set(key, value)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._versions.set(key, next(self._counter))
+            self._data.delete(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        # Version lookups also count as TTLCache misses; report the data cache only
+        return {'backend': 'memory', **self._data.stats()}
+
+
+class RedisCacheBackend:
+    """
+    Shared backend for multi-worker deployments. Each key has a version
+    counter; values live under key:version, so invalidate() (INCR) makes
+    every older copy unreachable at once. Requires the optional `redis`
+    package.
+    """
+
+    def __init__(self, url: str, ttl: float = 300.0, prefix: str = 'cache'):
+        try:
+            import redis
+        except ImportError as e:
+            raise RuntimeError("RedisCacheBackend requires the 'redis' package") from e
+        self._redis = redis.Redis.from_url(url)
+        self.ttl = int(ttl)
+        self.prefix = prefix
+        self.hits = 0
+        self.misses = 0
+
+    def _ver_key(self, key):
+        return f'{self.prefix}:ver:{key}'
+
+    def get(self, key):
+        token = int(self._redis.get(self._ver_key(key)) or 0)
+        raw = self._redis.get(f'{self.prefix}:{key}:{token}')
+        if raw is None:
+            self.misses += 1
+            return None, token
+        self.hits += 1
+        return pickle.loads(raw), token
+
+    def set(self, key, value, token=None):
+        self._redis.set(f'{self.prefix}:{key}:{token or 0}', pickle.dumps(value), ex=self.ttl)
+
+    def get_many(self, keys) -> dict:
+        """key -> (value or None, token): two MGETs whatever the number of keys."""
+        keys = list(keys)
+        if not keys:
+            return {}
+        tokens = [int(t or 0) for t in self._redis.mget([self._ver_key(k) for k in keys])]
+        raws = self._redis.mget([f'{self.prefix}:{k}:{t}' for k, t in zip(keys, tokens)])
+        result = {}
+        for key, token, raw in zip(keys, tokens, raws):
+            if raw is None:
+                self.misses += 1
+                result[key] = (None, token)
+            else:
+                self.hits += 1
+                result[key] = (pickle.loads(raw), token)
+        return result
+
+    def set_many(self, items: dict):
+        pipe = self._redis.pipeline(transaction=False)
+        for key, (value, token) in items.items():
+            pipe.set(f'{self.prefix}:{key}:{token or 0}', pickle.dumps(value), ex=self.ttl)
+        pipe.execute()
+
+    def invalidate(self, key):
+        pipe = self._redis.pipeline()
+        pipe.incr(self._ver_key(key))
+        pipe.expire(self._ver_key(key), self.ttl * 2)
+        pipe.execute()
+
+    def clear(self):
+        for k in self._redis.scan_iter(f'{self.prefix}:*'):
+            self._redis.delete(k)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'backend':   'redis',
+            'hits':      self.hits,
+            'misses':    self.misses,
+            'evictions': self._redis.info('stats').get('evicted_keys', 0),
+            'hit_rate':  round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def build_cache_backend(backend: str, maxsize: int, ttl: float, url: str = None, prefix: str = 'cache'):
+    if backend == 'memory':
+        return MemoryCacheBackend(maxsize=maxsize, ttl=ttl)
+    if backend == 'redis':
+        return RedisCacheBackend(url, ttl=ttl, prefix=prefix)
+    raise ValueError(f"Unknown cache backend: {backend}")
@@ -0,0 +1,64 @@
+import zlib
+
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+# Content-Encoding -> zlib wbits (31: gzip container, 15: zlib/"deflate")
+ENCODINGS = {'gzip': 31, 'deflate': 15}
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'text/')
+
+
+def choose_encoding(accept_encoding: str):
+    """Best of gzip/deflate the client accepts (gzip on a tie), or None."""
+    if not accept_encoding:
+        return None
+    accepted = parse_accept_header(accept_encoding, Accept)
+    best, best_q = None, 0
+    for encoding in ENCODINGS:
+        q = accepted[encoding]
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compress(body: bytes, encoding: str, level: int = 6) -> bytes:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, ENCODINGS[encoding])
+    return compressor.compress(body) + compressor.flush()
+
+
+def compress_body(body: bytes, content_type: str, accept_encoding: str, min_size: int = 1024, level: int = 6):
+    """
+    (body, encoding) for a buffered response: compressed when the type is
+    textual, the body is at least min_size bytes and the client accepts
+    gzip or deflate; otherwise (body, None). Small bodies are left alone
+    because the header and CPU cost outweighs the saving.
+    """
+    if len(body) < min_size or not (content_type or '').startswith(COMPRESSIBLE_TYPES):
+        return body, None
+    encoding = choose_encoding(accept_encoding)
+    if encoding is None:
+        return body, None
+    return compress(body, encoding, level), encoding
+
+
+def init_compression(app, min_size: int = 1024, level: int = 6):
+    """
+    after_request hook compressing buffered responses. Streamed responses
+    (exports, ?stream=) are skipped: /users/export negotiates gzip itself.
+    """
+    from flask import request
+
+    @app.after_request
+    def _compress_response(response):
+        if (response.direct_passthrough or response.is_streamed or response.status_code < 200
+                or response.status_code in (204, 304) or 'Content-Encoding' in response.headers):
+            return response
+        response.vary.add('Accept-Encoding')
+        body, encoding = compress_body(response.get_data(), response.mimetype,
+                                       request.headers.get('Accept-Encoding'), min_size, level)
+        if encoding is not None:
+            response.set_data(body)
+            response.headers['Content-Encoding'] = encoding
+        return response
+
+    return _compress_response
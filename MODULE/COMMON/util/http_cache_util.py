@@ -0,0 +1,47 @@
+import hashlib
+
+from flask import Response, jsonify, request
+from werkzeug.sansio.http import is_resource_modified
+
+
+def make_etag(*parts) -> str:
+    """Short opaque entity tag (unquoted) from validator parts."""
+    return hashlib.blake2b('|'.join(map(str, parts)).encode('utf-8'), digest_size=12).hexdigest()
+
+
+def is_modified(if_none_match: str, if_modified_since: str, etag: str, last_modified=None) -> bool:
+    """RFC 7232 evaluation (If-None-Match wins over If-Modified-Since) from raw header values."""
+    return is_resource_modified(
+        http_if_none_match=if_none_match,
+        http_if_modified_since=if_modified_since,
+        etag=etag,
+        last_modified=last_modified
+    )
+
+
+def conditional_json(build_payload, etag: str, last_modified=None):
+    """
+    304 with the validators when the client's copy is current; otherwise
+    jsonify(build_payload()). build_payload only runs on a miss, so a 304
+    does no query or serialization work. It returns a payload dict or
+    (payload, status); only successful (ErrorCode 9999) payloads get
+    validators, so an error body is never revalidated into a 304.
+    etag=None (no validator available) always builds a plain response.
+    """
+    if etag is not None and not is_modified(request.headers.get('If-None-Match'), request.headers.get('If-Modified-Since'),
+                       etag, last_modified):
+        response = Response(status=304)
+    else:
+        result = build_payload()
+        payload, status = result if isinstance(result, tuple) else (result, 200)
+        response = jsonify(payload)
+        response.status_code = status
+        if etag is None or str(payload.get('ErrorCode')) != '9999':
+            return response
+
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # Per-user data behind a token: browsers may keep it but must revalidate
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
@@ -0,0 +1,106 @@
+import dataclasses
+import decimal
+import json
+import logging
+import uuid
+from datetime import date, datetime
+
+from flask.json.provider import JSONProvider, DefaultJSONProvider
+from werkzeug.http import http_date
+
+try:
+    import orjson  # optional
+except ImportError:  # pragma: no cover - depends on the deployment
+    orjson = None
+
+# JSON_DATETIME_FORMAT: "http" keeps Flask's RFC 822 dates ("Mon, 02 Jun 2025
+# 10:00:00 GMT") for existing clients; "iso" sends ISO 8601 like the streamed
+# exports and lets orjson encode datetimes natively (fastest).
+DATETIME_FORMATS = ('http', 'iso')
+
+
+def _default(value):
+    """Types neither encoder handles natively (mirrors Flask's default)."""
+    if isinstance(value, date):
+        return http_date(value)
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def _iso_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return _default(value)
+
+
+class IsoJSONProvider(DefaultJSONProvider):
+    """Flask's stdlib provider with ISO 8601 datetimes."""
+
+    default = staticmethod(_iso_default)
+
+
+class OrjsonProvider(JSONProvider):
+    """
+    orjson-backed provider: encodes straight to bytes (no str round trip in
+    response()), with native datetime, UUID and dataclass support. Output is
+    compact; sort_keys matches Flask's default provider.
+    """
+
+    sort_keys = True
+    mimetype = 'application/json'
+
+    def __init__(self, app, datetime_format: str = 'http'):
+        super().__init__(app)
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        if datetime_format == 'http':
+            # Let _default format dates instead of orjson's ISO output
+            option |= orjson.OPT_PASSTHROUGH_DATETIME
+            self._default = _default
+        else:
+            self._default = _iso_default
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        self._option = option
+
+    def dumps_bytes(self, obj) -> bytes:
+        return orjson.dumps(obj, default=self._default, option=self._option)
+
+    def dumps(self, obj, **kwargs) -> str:
+        if kwargs:
+            # Caller wants json.dumps options (indent, ensure_ascii, ...)
+            kwargs.setdefault('default', self._default)
+            return json.dumps(obj, **kwargs)
+        return self.dumps_bytes(obj)[:-1].decode('utf-8')
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps_bytes(obj), mimetype=self.mimetype)
+
+
+def init_json(app, provider: str = 'orjson', datetime_format: str = 'http'):
+    """
+    Install the app's JSON provider. "orjson" falls back to the stdlib
+    provider (with a warning) when the optional package is missing.
+    """
+    if datetime_format not in DATETIME_FORMATS:
+        raise ValueError(f'Unknown JSON_DATETIME_FORMAT: {datetime_format}')
+    if provider == 'orjson' and orjson is None:
+        logging.warning("JSON_PROVIDER=orjson but the 'orjson' package is not installed; using the stdlib provider")
+        provider = 'default'
+    if provider == 'orjson':
+        app.json = OrjsonProvider(app, datetime_format)
+    elif provider == 'default':
+        app.json = IsoJSONProvider(app) if datetime_format == 'iso' else DefaultJSONProvider(app)
+    else:
+        raise ValueError(f'Unknown JSON_PROVIDER: {provider}')
+    return app.json
@@ -0,0 +1,165 @@
+import bisect
+import threading
+
+# Latency buckets in seconds (upper bounds; +Inf is implicit)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)   # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def cumulative(self) -> list:
+        """[(upper_bound, cumulative_count), ...] ending with ('+Inf', count)."""
+        out, running = [], 0
+        for bound, n in zip(self.buckets + ('+Inf',), self.counts):
+            running += n
+            out.append((bound, running))
+        return out
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th observation."""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        for bound, running in self.cumulative():
+            if running >= target:
+                return bound if bound != '+Inf' else self.buckets[-1]
+        return self.buckets[-1]
+
+    def snapshot(self) -> dict:
+        return {
+            'count':  self.count,
+            'sum':    round(self.sum, 6),
+            'p50':    self.quantile(0.50),
+            'p95':    self.quantile(0.95),
+            'p99':    self.quantile(0.99),
+        }
+
+
+class MetricFamily:
+    """A named metric with labels; children are created on first use."""
+
+    def __init__(self, kind: str, name: str, help: str, labelnames=(), factory=None):
+        self.kind = kind
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._factory())
+        return child
+
+    def items(self):
+        return list(self._children.items())
+
+
+def _label_str(names, values, extra=None) -> str:
+    pairs = list(zip(names, values)) + ([extra] if extra else [])
+    if not pairs:
+        return ''
+    esc = lambda v: str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+    return '{' + ','.join(f'{k}="{esc(v)}"' for k, v in pairs) + '}'
+
+
+class Registry:
+    """Holds metric families and gauge callbacks; renders Prometheus text format."""
+
+    def __init__(self):
+        self._families = {}
+        self._gauges = {}
+
+    def counter(self, name: str, help: str, labelnames=()) -> MetricFamily:
+        return self._families.setdefault(name, MetricFamily('counter', name, help, labelnames, Counter))
+
+    def histogram(self, name: str, help: str, labelnames=(), buckets=DEFAULT_BUCKETS) -> MetricFamily:
+        return self._families.setdefault(
+            name, MetricFamily('histogram', name, help, labelnames, lambda: Histogram(buckets))
+        )
+
+    def register(self, name: str, help: str, metric, labels: dict = None):
+        """
+        Publish an existing Counter or Histogram, optionally as one labelled
+        child of <name> (register once per label set, same label names).
+        """
+        kind = 'histogram' if isinstance(metric, Histogram) else 'counter'
+        labels = labels or {}
+        family = self._families.get(name)
+        if family is None or family.labelnames != tuple(labels):
+            family = self._families[name] = MetricFamily(kind, name, help, tuple(labels))
+        family._children[tuple(labels.values())] = metric
+
+    def gauge(self, name: str, help: str, fn, labels: dict = None):
+        """
+        fn() is called at scrape time and returns a number, or a dict (e.g.
+        a stats() result) whose numeric entries become <name>_<key> gauges.
+        `labels` tells apart several sources of the same gauge.
+        """
+        self._gauges[(name, tuple((labels or {}).items()))] = (help, fn)
+
+    def render(self) -> str:
+        lines = []
+        for fam in self._families.values():
+            lines.append(f'# HELP {fam.name} {fam.help}')
+            lines.append(f'# TYPE {fam.name} {fam.kind}')
+            for values, metric in fam.items():
+                if fam.kind == 'counter':
+                    lines.append(f'{fam.name}{_label_str(fam.labelnames, values)} {metric.value}')
+                    continue
+                for bound, running in metric.cumulative():
+                    labels = _label_str(fam.labelnames, values, ('le', bound))
+                    lines.append(f'{fam.name}_bucket{labels} {running}')
+                labels = _label_str(fam.labelnames, values)
+                lines.append(f'{fam.name}_sum{labels} {metric.sum}')
+                lines.append(f'{fam.name}_count{labels} {metric.count}')
+
+        gauges = {}   # full name -> (help, [sample lines])
+        for (name, labels), (help, fn) in self._gauges.items():
+            try:
+                value = fn()
+            except Exception:
+                continue
+            items = value.items() if isinstance(value, dict) else [(None, value)]
+            label_str = _label_str([k for k, _ in labels], [v for _, v in labels])
+            for key, v in items:
+                if isinstance(v, bool) or not isinstance(v, (int, float)):
+                    continue
+                full = f'{name}_{key}' if key else name
+                gauges.setdefault(full, (help, []))[1].append(f'{full}{label_str} {v}')
+        for full, (help, samples) in gauges.items():
+            lines.append(f'# HELP {full} {help}')
+            lines.append(f'# TYPE {full} gauge')
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
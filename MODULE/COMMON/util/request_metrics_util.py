@@ -0,0 +1,126 @@
+import contextvars
+import hmac
+import logging
+import time
+import weakref
+
+from flask import Response, request
+from sqlalchemy import event
+
+from DB_CONNECTION.pool import pool_metrics, pool_stats
+from MODULE.COMMON.util.metrics_util import registry
+
+# [query_count, query_seconds] for the request running in this context
+_sql_stats = contextvars.ContextVar('sql_stats', default=None)
+
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Engines already carrying the SQL listeners (create_app may run more than once)
+_instrumented = weakref.WeakSet()
+
+
+def _instrument_engine(engine, query_latency):
+    """Time each statement on `engine` and add it to the running request's totals."""
+    if engine in _instrumented:
+        return
+    _instrumented.add(engine)
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def _before_cursor(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def _after_cursor(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info['query_start'].pop()
+        query_latency.observe(elapsed)
+        stats = _sql_stats.get()
+        if stats is not None:
+            stats[0] += 1
+            stats[1] += elapsed
+
+    @event.listens_for(engine, 'handle_error')
+    def _on_error(context):
+        # A failed statement never reaches after_cursor_execute
+        if context.connection is not None and context.execution_context is not None:
+            starts = context.connection.info.get('query_start')
+            if starts:
+                starts.pop()
+
+
+def _metrics_allowed(token: str, public: bool) -> bool:
+    if token:
+        given = request.headers.get('Authorization', '')
+        return hmac.compare_digest(given.encode(), f'Bearer {token}'.encode())
+    return public
+
+
+def init_metrics(app, engines: list, slow_request_ms: float = 500.0, token: str = None, public: bool = False):
+    """
+    Install request/SQL instrumentation and GET /metrics. `engines` is
+    [(label, engine)] (ReplicaRouter.named_engines()): every engine's SQL
+    counts towards its request, and pool/SQL metrics carry an engine label.
+    /metrics wants "Bearer <token>"; with no token it is served only when
+    `public` (an internal-only port), else it is a 404. Nothing here runs
+    unless this is called, so leaving it out removes all overhead.
+    """
+    req_latency = registry.histogram(
+        'http_request_duration_seconds', 'Request latency (until the response is handed back)', ('endpoint', 'method'))
+    req_total = registry.counter('http_requests_total', 'Requests served', ('endpoint', 'method', 'status'))
+    req_queries = registry.histogram(
+        'http_request_sql_queries', 'SQL statements per request', ('endpoint',), buckets=QUERY_COUNT_BUCKETS)
+    req_sql_time = registry.histogram('http_request_sql_seconds', 'SQL time per request', ('endpoint',))
+    query_latency = registry.histogram('sql_query_duration_seconds', 'Single SQL statement latency', ('engine',))
+
+    for label, engine in engines:
+        metrics = pool_metrics(engine)
+        registry.register('db_pool_checkout_seconds', 'Time to check a connection out of the pool',
+                          metrics.checkout_latency, {'engine': label})
+        registry.register('db_pool_timeouts_total', 'Pool checkouts that timed out',
+                          metrics.timeouts, {'engine': label})
+        registry.gauge('db_pool', 'Connection pool gauges', lambda engine=engine: pool_stats(engine), {'engine': label})
+        _instrument_engine(engine, query_latency.labels(label))
+
+    @app.before_request
+    def _start_timer():
+        request.environ['metrics.start'] = time.perf_counter()
+        _sql_stats.set([0, 0.0])
+
+    # (endpoint, method) -> its histogram children, so the hot path skips label lookups
+    children = {}
+
+    @app.after_request
+    def _record(response):
+        environ = request.environ
+        start = environ.get('metrics.start')
+        if start is None:
+            return response
+        elapsed = time.perf_counter() - start
+        endpoint = request.endpoint or 'unmatched'
+        method = environ['REQUEST_METHOD']
+        queries, sql_seconds = _sql_stats.get() or (0, 0.0)
+
+        key = (endpoint, method)
+        latency, n_queries, sql_time = children.get(key) or children.setdefault(key, (
+            req_latency.labels(endpoint, method),
+            req_queries.labels(endpoint),
+            req_sql_time.labels(endpoint),
+        ))
+        latency.observe(elapsed)
+        n_queries.observe(queries)
+        sql_time.observe(sql_seconds)
+        req_total.labels(endpoint, method, response.status_code).inc()
+
+        if elapsed * 1000 >= slow_request_ms:
+            logging.warning(
+                f"Slow request {method} {request.path} -> {response.status_code}: "
+                f"{elapsed * 1000:.1f} ms, {queries} queries / {sql_seconds * 1000:.1f} ms SQL"
+            )
+        return response
+
+    @app.route('/metrics')
+    def metrics():
+        if not _metrics_allowed(token, public):
+            if token:
+                return Response('Unauthorized\n', 401, {'WWW-Authenticate': 'Bearer'}, mimetype='text/plain')
+            return Response('Not Found\n', 404, mimetype='text/plain')
+        return Response(registry.render(), mimetype='text/plain; version=0.0.4')
@@ -0,0 +1,277 @@
+# MODULE/JOBS/service/outbox_service.py
+#
+# Persistent job outbox (tbl_Outbox). Requests enqueue; JobWorker threads
+# claim, run and settle jobs. Operator commands:
+#     python -m MODULE.JOBS.service.outbox_service --stats
+#     python -m MODULE.JOBS.service.outbox_service --requeue-dead
+#     python -m MODULE.JOBS.service.outbox_service --prune-done 30
+#     python -m MODULE.JOBS.service.outbox_service --run      standalone worker process
+
+import argparse
+import json
+import logging
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update, insert, delete, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from DB_CONNECTION.config import engine
+from CREATE_DB_CODE.tables_creation import tbl_Outbox
+
+# pending -> running -> done, or back to pending (retry) / dead (gave up)
+JOB_STATUSES = ('pending', 'running', 'done', 'dead')
+
+# In-process wake-ups for idle workers (other processes find jobs by polling)
+_enqueue_listeners = []
+
+
+def on_enqueue(callback):
+    _enqueue_listeners.append(callback)
+
+
+def notify_enqueued():
+    """Wake local workers; call after committing a transaction that enqueued jobs."""
+    for callback in _enqueue_listeners:
+        callback()
+
+
+def backoff_seconds(attempts: int, base: float, cap: float) -> float:
+    """Exponential backoff with full jitter: uniform(0, min(cap, base * 2**(attempts-1)))."""
+    return random.uniform(0, min(cap, base * 2 ** max(attempts - 1, 0)))
+
+
+_UPSERT_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+
+def _enqueue_stmt(values: dict):
+    """INSERT that skips a duplicate idempotency key; returns the new id or no row."""
+    dialect_insert = _UPSERT_INSERTS.get(engine.dialect.name)
+    if dialect_insert is None:
+        # Other dialects: a duplicate surfaces as IntegrityError
+        return insert(tbl_Outbox).values(values).returning(tbl_Outbox.c.lng_Job_ID)
+    return (
+        dialect_insert(tbl_Outbox).values(values)
+        .on_conflict_do_nothing(index_elements=[tbl_Outbox.c.str_Idempotency_Key])
+        .returning(tbl_Outbox.c.lng_Job_ID)
+    )
+
+
+def _claim_stmt(now: datetime, limit: int, lease_seconds: float):
+    """
+    Atomically take up to `limit` due jobs: pending ones whose backoff has
+    passed and running ones whose lease expired (their worker died). The
+    lease is written to dte_Run_After; int_Attempts is the fencing token
+    for complete()/fail().
+    """
+    due = (
+        select(tbl_Outbox.c.lng_Job_ID)
+        .where(
+            tbl_Outbox.c.str_Status.in_(('pending', 'running')),
+            tbl_Outbox.c.dte_Run_After <= now
+        )
+        .order_by(tbl_Outbox.c.dte_Run_After, tbl_Outbox.c.lng_Job_ID)
+        .limit(limit)
+        .with_for_update(skip_locked=True)    # PostgreSQL; SQLite serialises writers anyway
+    )
+    return (
+        update(tbl_Outbox)
+        .where(
+            tbl_Outbox.c.lng_Job_ID.in_(due.scalar_subquery()),
+            tbl_Outbox.c.str_Status.in_(('pending', 'running')),
+            tbl_Outbox.c.dte_Run_After <= now
+        )
+        .values(
+            str_Status='running',
+            int_Attempts=tbl_Outbox.c.int_Attempts + 1,
+            dte_Run_After=now + timedelta(seconds=lease_seconds)
+        )
+        .returning(
+            tbl_Outbox.c.lng_Job_ID,
+            tbl_Outbox.c.str_Job_Type,
+            tbl_Outbox.c.str_Idempotency_Key,
+            tbl_Outbox.c.str_Payload,
+            tbl_Outbox.c.int_Attempts
+        )
+    )
+
+
+def _settle_stmt(job_id: int, attempts: int, **values):
+    # Only the claim that is still current may settle the job
+    return (
+        update(tbl_Outbox)
+        .where(
+            tbl_Outbox.c.lng_Job_ID == job_id,
+            tbl_Outbox.c.str_Status == 'running',
+            tbl_Outbox.c.int_Attempts == attempts
+        )
+        .values(**values)
+    )
+
+
+class Outbox:
+
+    @staticmethod
+    def enqueue(job_type: str, payload: dict, idempotency_key: str, conn=None, delay: float = 0) -> dict:
+        """
+        Add a job unless one with the same idempotency key already exists.
+        Pass `conn` to enqueue inside the caller's transaction (the job is
+        only visible if that transaction commits; call notify_enqueued()
+        after the commit).
+        """
+        values = {
+            'str_Job_Type':        job_type,
+            'str_Idempotency_Key': idempotency_key,
+            'str_Payload':         json.dumps(payload, separators=(',', ':')),
+            'str_Status':          'pending',
+            'int_Attempts':        0,
+            'dte_Run_After':       datetime.utcnow() + timedelta(seconds=delay),
+            'dte_Created_Date':    datetime.utcnow()
+        }
+        try:
+            if conn is not None:
+                job_id = conn.execute(_enqueue_stmt(values)).scalar()
+            else:
+                with engine.begin() as own:
+                    job_id = own.execute(_enqueue_stmt(values)).scalar()
+        except IntegrityError:
+            job_id = None
+        except Exception:
+            logging.exception('Outbox.enqueue')
+            return {'ErrorCode': 9998, 'Message': 'Could not enqueue job'}
+        if job_id is not None and conn is None:
+            notify_enqueued()
+        return {'ErrorCode': 9999, 'lng_Job_ID': job_id, 'Duplicate': job_id is None}
+
+    @staticmethod
+    def claim(limit: int, lease_seconds: float) -> list:
+        """Claimed jobs as dicts (payload decoded); [] on error."""
+        try:
+            with engine.begin() as conn:
+                rows = conn.execute(_claim_stmt(datetime.utcnow(), limit, lease_seconds)).fetchall()
+            return [{
+                'lng_Job_ID':          r.lng_Job_ID,
+                'str_Job_Type':        r.str_Job_Type,
+                'str_Idempotency_Key': r.str_Idempotency_Key,
+                'payload':             json.loads(r.str_Payload),
+                'int_Attempts':        r.int_Attempts
+            } for r in sorted(rows, key=lambda r: r.lng_Job_ID)]
+        except Exception:
+            logging.exception('Outbox.claim')
+            return []
+
+    @staticmethod
+    def complete(job_id: int, attempts: int, result=None) -> bool:
+        """Mark the job done, keeping the handler's JSON-serialisable `result`."""
+        with engine.begin() as conn:
+            # The payload is dropped once delivered: it may hold credentials (reset links, passwords)
+            settled = conn.execute(_settle_stmt(
+                job_id, attempts, str_Status='done', str_Payload='{}', str_Last_Error=None,
+                str_Result=None if result is None else json.dumps(result, separators=(',', ':')),
+                dte_Completed_Date=datetime.utcnow()
+            ))
+        return settled.rowcount == 1
+
+    @staticmethod
+    def fail(job_id: int, attempts: int, error: str, max_attempts: int,
+             backoff_base: float, backoff_max: float) -> str:
+        """Schedule a retry, or move the job to 'dead' after max_attempts. Returns the new status."""
+        status = 'dead' if attempts >= max_attempts else 'pending'
+        retry_at = datetime.utcnow() + timedelta(seconds=backoff_seconds(attempts, backoff_base, backoff_max))
+        with engine.begin() as conn:
+            conn.execute(_settle_stmt(
+                job_id, attempts, str_Status=status, str_Last_Error=error[:2000], dte_Run_After=retry_at
+            ))
+        return status
+
+    @staticmethod
+    def jobs_by_key_prefix(prefix: str) -> list:
+        """
+        Status and result of every job whose idempotency key starts with
+        `prefix` (a range scan on UX_Outbox_Idempotency_Key), by key.
+        """
+        key = tbl_Outbox.c.str_Idempotency_Key
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        with engine.connect() as conn:
+            rows = conn.execute(
+                select(key, tbl_Outbox.c.str_Status, tbl_Outbox.c.int_Attempts,
+                       tbl_Outbox.c.str_Last_Error, tbl_Outbox.c.str_Result)
+                .where(key >= prefix, key < upper)
+                .order_by(key)
+            ).all()
+        return [{
+            'str_Idempotency_Key': r.str_Idempotency_Key,
+            'str_Status':          r.str_Status,
+            'int_Attempts':        r.int_Attempts,
+            'str_Last_Error':      r.str_Last_Error,
+            'result':              json.loads(r.str_Result) if r.str_Result else None
+        } for r in rows]
+
+    @staticmethod
+    def stats() -> dict:
+        try:
+            with engine.connect() as conn:
+                counts = dict(conn.execute(
+                    select(tbl_Outbox.c.str_Status, func.count()).group_by(tbl_Outbox.c.str_Status)
+                ).all())
+            return {status: counts.get(status, 0) for status in JOB_STATUSES}
+        except Exception:
+            logging.exception('Outbox.stats')
+            return {}
+
+    @staticmethod
+    def requeue_dead(job_type: str = None) -> int:
+        """Give dead-lettered jobs a fresh set of attempts; returns how many."""
+        stmt = (
+            update(tbl_Outbox)
+            .where(tbl_Outbox.c.str_Status == 'dead')
+            .values(str_Status='pending', int_Attempts=0, dte_Run_After=datetime.utcnow())
+        )
+        if job_type:
+            stmt = stmt.where(tbl_Outbox.c.str_Job_Type == job_type)
+        with engine.begin() as conn:
+            return conn.execute(stmt).rowcount
+
+
+    @staticmethod
+    def prune_done(older_than_days: float) -> int:
+        """Delete finished jobs; their idempotency keys stop deduplicating after this."""
+        cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+        with engine.begin() as conn:
+            return conn.execute(delete(tbl_Outbox).where(
+                tbl_Outbox.c.str_Status == 'done',
+                tbl_Outbox.c.dte_Completed_Date < cutoff
+            )).rowcount
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Background job outbox.')
+    parser.add_argument('--stats', action='store_true', help='job counts by status')
+    parser.add_argument('--requeue-dead', action='store_true', help='retry dead-lettered jobs')
+    parser.add_argument('--job-type', help='limit --requeue-dead to one job type')
+    parser.add_argument('--prune-done', type=float, metavar='DAYS', help='delete jobs finished more than DAYS ago')
+    parser.add_argument('--run', action='store_true', help='run a worker in the foreground')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
+
+    if args.requeue_dead:
+        print(f"Requeued {Outbox.requeue_dead(args.job_type)} dead job(s)")
+    if args.prune_done is not None:
+        print(f"Deleted {Outbox.prune_done(args.prune_done)} finished job(s)")
+    if args.run:
+        from MODULE.JOBS.service.worker_service import build_job_worker
+        worker = build_job_worker()
+        worker.start()
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            worker.stop()
+    if args.stats or not (args.requeue_dead or args.run or args.prune_done is not None):
+        print(json.dumps(Outbox.stats()))
+
+
+if __name__ == '__main__':
+    main()
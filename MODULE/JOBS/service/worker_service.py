@@ -0,0 +1,139 @@
+# MODULE/JOBS/service/worker_service.py
+#
+# In-process job worker: a poller thread claims due tbl_Outbox jobs and a
+# small thread pool runs them. Every web worker process may run one; the
+# claim query keeps them from running the same job concurrently.
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from MODULE.COMMON.util.metrics_util import registry
+from MODULE.JOBS.service.outbox_service import Outbox, on_enqueue
+from MODULE.JOBS.util.mail_util import build_mailer, build_message
+
+
+class JobWorker:
+    """
+    handlers maps job type -> fn(payload, idempotency_key); what it returns
+    (JSON-serialisable or None) is stored as the job result. A handler that
+    raises is retried with exponential backoff and moved to the 'dead'
+    state after max_attempts. Delivery is at-least-once (a worker can die
+    after the side effect but before settling the job), so handlers
+    should use the idempotency key to make repeats harmless.
+    """
+
+    def __init__(self, handlers: dict, threads: int = 2, batch_size: int = 10, poll_seconds: float = 1.0,
+                 lease_seconds: float = 60.0, max_attempts: int = 8,
+                 backoff_base: float = 5.0, backoff_max: float = 3600.0):
+        self.handlers = handlers
+        self.threads = threads
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._inflight = 0
+        self._lock = threading.Lock()
+        self._executor = None
+        self._poller = None
+        self._jobs = registry.counter('jobs_total', 'Background jobs run, by outcome', ('job_type', 'outcome'))
+        self._latency = registry.histogram('job_seconds', 'Background job run time', ('job_type',))
+
+    def start(self):
+        if self._poller is not None:
+            return
+        self._stopping.clear()
+        self._executor = ThreadPoolExecutor(self.threads, thread_name_prefix='job')
+        self._poller = threading.Thread(target=self._poll, name='job-poller', daemon=True)
+        self._poller.start()
+        on_enqueue(self.wake)
+
+    def stop(self, timeout: float = 10.0):
+        """Stop claiming, let running jobs finish (unfinished ones are re-claimed after their lease)."""
+        if self._poller is None:
+            return
+        self._stopping.set()
+        self._wake.set()
+        self._poller.join(timeout)
+        self._executor.shutdown(wait=True)
+        self._poller = self._executor = None
+
+    def wake(self):
+        self._wake.set()
+
+    def _poll(self):
+        while not self._stopping.is_set():
+            self._wake.clear()   # before claiming, so a wake-up during the claim is not lost
+            with self._lock:
+                free = self.threads - self._inflight
+            claimed = []
+            if free > 0:
+                claimed = Outbox.claim(min(free, self.batch_size), self.lease_seconds)
+                for job in claimed:
+                    with self._lock:
+                        self._inflight += 1
+                    self._executor.submit(self._run, job)
+            # A full batch suggests more work is due: claim again straight away
+            if not claimed or len(claimed) < min(free, self.batch_size):
+                self._wake.wait(self.poll_seconds)
+
+    def _run(self, job: dict):
+        job_type = job['str_Job_Type']
+        started = time.perf_counter()
+        try:
+            handler = self.handlers.get(job_type)
+            if handler is None:
+                raise LookupError(f'No handler for job type {job_type!r}')
+            result = handler(job['payload'], job['str_Idempotency_Key'])
+            Outbox.complete(job['lng_Job_ID'], job['int_Attempts'], result)
+            self._jobs.labels(job_type, 'done').inc()
+        except Exception as e:
+            try:
+                status = Outbox.fail(job['lng_Job_ID'], job['int_Attempts'], f'{type(e).__name__}: {e}',
+                                     self.max_attempts, self.backoff_base, self.backoff_max)
+            except Exception:
+                logging.exception('JobWorker.fail')
+                status = 'unsettled'   # lease expiry will retry it
+            self._jobs.labels(job_type, 'dead' if status == 'dead' else 'retry').inc()
+            logging.warning(f"Job {job['lng_Job_ID']} ({job_type}) attempt {job['int_Attempts']} failed, "
+                            f"now {status}: {e}")
+        finally:
+            self._latency.labels(job_type).observe(time.perf_counter() - started)
+            with self._lock:
+                self._inflight -= 1
+            self._wake.set()
+
+
+def send_email_handler(mailer, sender: str):
+    """Job handler for 'send_email' payloads {to, subject, body}."""
+    def handle(payload: dict, idempotency_key: str):
+        mailer.send(build_message(sender, payload['to'], payload['subject'], payload['body'], idempotency_key))
+    return handle
+
+
+def bulk_import_handler(payload: dict, idempotency_key: str) -> dict:
+    """Job handler for one POST /users/bulk chunk; the report is the job result."""
+    from MODULE.USER.service.bulk_import_service import BulkImport
+    return BulkImport.run_chunk(payload)
+
+
+def build_job_worker(mailer=None) -> JobWorker:
+    mailer = mailer or build_mailer(Config.MAIL_BACKEND, Config)
+    return JobWorker(
+        {'send_email': send_email_handler(mailer, Config.MAIL_FROM),
+         'bulk_import': bulk_import_handler},
+        threads=Config.JOBS_WORKER_THREADS,
+        batch_size=Config.JOBS_BATCH_SIZE,
+        poll_seconds=Config.JOBS_POLL_SECONDS,
+        lease_seconds=Config.JOBS_LEASE_SECONDS,
+        max_attempts=Config.JOBS_MAX_ATTEMPTS,
+        backoff_base=Config.JOBS_BACKOFF_BASE_SECONDS,
+        backoff_max=Config.JOBS_BACKOFF_MAX_SECONDS
+    )
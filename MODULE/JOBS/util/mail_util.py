@@ -0,0 +1,82 @@
+import hashlib
+import os
+import smtplib
+import threading
+import time
+from email.message import EmailMessage
+from email.utils import formatdate
+
+
+def build_message(sender: str, to: str, subject: str, body: str, idempotency_key: str = None) -> EmailMessage:
+    """
+    Plain-text message. The Message-ID is derived from the job's idempotency
+    key, so a retried send of the same job is recognisably the same mail.
+    """
+    msg = EmailMessage()
+    msg['From'] = sender
+    msg['To'] = to
+    msg['Subject'] = subject
+    msg['Date'] = formatdate(usegmt=True)
+    if idempotency_key:
+        digest = hashlib.sha256(idempotency_key.encode('utf-8')).hexdigest()[:32]
+        msg['Message-ID'] = f'<{digest}@{sender.rsplit("@", 1)[-1].strip(">")}>'
+    msg.set_content(body)
+    return msg
+
+
+class SmtpMailer:
+    """Sends through an SMTP relay; one connection per message (jobs are infrequent)."""
+
+    def __init__(self, host: str, port: int = 587, username: str = None, password: str = None,
+                 starttls: bool = True, timeout: float = 10.0):
+        self.host, self.port = host, port
+        self.username, self.password = username, password
+        self.starttls = starttls
+        self.timeout = timeout
+
+    def send(self, msg: EmailMessage):
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as smtp:
+            if self.starttls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            smtp.send_message(msg)
+
+
+class FileMailer:
+    """Offline stand-in for SMTP: writes each message to <directory>/<Message-ID>.eml."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def send(self, msg: EmailMessage):
+        os.makedirs(self.directory, exist_ok=True)
+        name = (msg['Message-ID'] or formatdate()).strip('<>').replace('/', '_').replace(' ', '_')
+        with open(os.path.join(self.directory, f'{name}.eml'), 'wb') as f:
+            f.write(msg.as_bytes())
+
+
+class MemoryMailer:
+    """Keeps sent messages in a list (tests, benchmarks)."""
+
+    def __init__(self, delay: float = 0.0):
+        self.sent = []
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def send(self, msg: EmailMessage):
+        if self.delay:
+            time.sleep(self.delay)   # simulated relay latency
+        with self._lock:
+            self.sent.append(msg)
+
+
+def build_mailer(backend: str, config):
+    if backend == 'smtp':
+        return SmtpMailer(config.SMTP_HOST, config.SMTP_PORT, config.SMTP_USERNAME or None,
+                          config.SMTP_PASSWORD or None, config.SMTP_STARTTLS, config.SMTP_TIMEOUT)
+    if backend == 'file':
+        return FileMailer(config.MAIL_FILE_DIR)
+    if backend == 'memory':
+        return MemoryMailer()
+    raise ValueError(f'Unknown MAIL_BACKEND: {backend}')
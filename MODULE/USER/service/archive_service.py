@@ -0,0 +1,168 @@
+# MODULE/USER/service/archive_service.py
+#
+# Moves soft-deleted users older than the retention window from tbl_User to
+# tbl_User_Archive, a bounded batch per transaction. Each committed batch is
+# final, so a run that stops (time budget, crash, deploy) simply resumes
+# from the remaining rows next time. Run from cron / a scheduled job:
+#     python -m MODULE.USER.service.archive_service                 archive with the Config defaults
+#     python -m MODULE.USER.service.archive_service --dry-run       count what would move
+#     python -m MODULE.USER.service.archive_service --max-seconds 60 --pause 0.1
+
+import argparse
+import json
+import logging
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, insert, delete, literal, func
+
+from config import Config
+from DB_CONNECTION.config import engine
+from CREATE_DB_CODE.tables_creation import tbl_User, tbl_User_Archive
+from MODULE.USER.service.user_service import _invalidate_user
+
+
+def _archivable(cutoff: datetime):
+    """
+    Soft-deleted rows deleted before `cutoff`, via IX_User_Deleted_Date_ID.
+    The highest lng_User_ID always stays: SQLite would hand it out again
+    once deleted, and an id must never name two users.
+    """
+    return (
+        tbl_User.c.bln_IsDeleted == True,
+        tbl_User.c.dte_Deleted_Date < cutoff,
+        tbl_User.c.lng_User_ID < select(func.max(tbl_User.c.lng_User_ID)).scalar_subquery()
+    )
+
+
+def _batch_ids_stmt(cutoff: datetime, limit: int):
+    return (
+        select(tbl_User.c.lng_User_ID)
+        .where(*_archivable(cutoff))
+        .order_by(tbl_User.c.dte_Deleted_Date, tbl_User.c.lng_User_ID)
+        .limit(limit)
+        .with_for_update(skip_locked=True)    # PostgreSQL: concurrent runs take disjoint batches
+    )
+
+
+def _copy_stmt(user_ids: list, archived_at: datetime):
+    columns = [c.name for c in tbl_User.columns]
+    return insert(tbl_User_Archive).from_select(
+        columns + ['dte_Archived_Date'],
+        select(*tbl_User.columns, literal(archived_at)).where(tbl_User.c.lng_User_ID.in_(user_ids))
+    )
+
+
+def _remove_stmt(user_ids: list):
+    return delete(tbl_User).where(
+        tbl_User.c.lng_User_ID.in_(user_ids),
+        tbl_User.c.bln_IsDeleted == True
+    )
+
+
+class UserArchive:
+
+    @staticmethod
+    def archive_batch(cutoff: datetime, batch_size: int) -> int:
+        """
+        Copy and delete one batch in a single transaction; returns rows
+        moved (0 = nothing left). dte_Archived_Date moves the list/search
+        validator, and the moved ids are dropped from the user cache.
+        """
+        with engine.begin() as conn:
+            user_ids = conn.execute(_batch_ids_stmt(cutoff, batch_size)).scalars().all()
+            if not user_ids:
+                return 0
+            conn.execute(_copy_stmt(user_ids, datetime.utcnow()))
+            removed = conn.execute(_remove_stmt(user_ids)).rowcount
+            if removed != len(user_ids):
+                raise RuntimeError(f"Archived {len(user_ids)} users but removed {removed}")
+        for user_id in user_ids:
+            _invalidate_user(user_id)
+        return removed
+
+    @staticmethod
+    def archive_deleted_service(retention_days: float = None, batch_size: int = None,
+                                max_seconds: float = None, pause_seconds: float = 0) -> dict:
+        """
+        Archive batches until none are left or `max_seconds` is used up.
+        pause_seconds between batches leaves room for other writers (and
+        replicas to catch up). Deleted users keep reporting as deleted in
+        GET /users/changes until they are archived.
+        """
+        retention_days = Config.USER_ARCHIVE_RETENTION_DAYS if retention_days is None else retention_days
+        batch_size = batch_size or Config.USER_ARCHIVE_BATCH_SIZE
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+
+        moved, batches, complete, error = 0, 0, False, None
+        start = time.perf_counter()
+        try:
+            while True:
+                count = UserArchive.archive_batch(cutoff, batch_size)
+                if not count:
+                    complete = True
+                    break
+                moved += count
+                batches += 1
+                if max_seconds is not None and time.perf_counter() - start >= max_seconds:
+                    break
+                if pause_seconds:
+                    time.sleep(pause_seconds)
+        except Exception:
+            logging.exception('archive_deleted_service')
+            error = 'Archival stopped on a database error; completed batches are kept'
+
+        seconds = time.perf_counter() - start
+        return {
+            'ErrorCode':       9998 if error else 9999,
+            'Message':         error or ('Archive complete' if complete else 'Time budget used; run again to continue'),
+            'Archived':        moved,
+            'Batches':         batches,
+            'Complete':        complete,
+            'Seconds':         round(seconds, 3),
+            'Rows_Per_Second': round(moved / seconds, 1) if seconds > 0 else 0.0
+        }
+
+    @staticmethod
+    def pending_count(retention_days: float = None) -> int:
+        """Soft-deleted rows an archive run would move now."""
+        retention_days = Config.USER_ARCHIVE_RETENTION_DAYS if retention_days is None else retention_days
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        with engine.connect() as conn:
+            return conn.execute(select(func.count()).select_from(tbl_User).where(*_archivable(cutoff))).scalar()
+
+    @staticmethod
+    def stats() -> dict:
+        try:
+            with engine.connect() as conn:
+                return {
+                    'deleted':  conn.execute(select(func.count()).select_from(tbl_User)
+                                             .where(tbl_User.c.bln_IsDeleted == True)).scalar(),
+                    'archived': conn.execute(select(func.count()).select_from(tbl_User_Archive)).scalar()
+                }
+        except Exception:
+            logging.exception('UserArchive.stats')
+            return {}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Move old soft-deleted users to tbl_User_Archive.')
+    parser.add_argument('--retention-days', type=float, help='default USER_ARCHIVE_RETENTION_DAYS')
+    parser.add_argument('--batch-size', type=int, help='rows per transaction; default USER_ARCHIVE_BATCH_SIZE')
+    parser.add_argument('--max-seconds', type=float, help='stop after this long (the next run resumes)')
+    parser.add_argument('--pause', type=float, default=0, metavar='SECONDS', help='sleep between batches')
+    parser.add_argument('--dry-run', action='store_true', help='only count the rows that would move')
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s')
+
+    if args.dry_run:
+        print(json.dumps({'Pending': UserArchive.pending_count(args.retention_days), **UserArchive.stats()}))
+        return
+    result = UserArchive.archive_deleted_service(args.retention_days, args.batch_size, args.max_seconds, args.pause)
+    print(json.dumps(result))
+    if result['ErrorCode'] != 9999:
+        raise SystemExit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+# MODULE/USER/service/bulk_import_service.py
+#
+# POST /users/bulk runs in the background. Hashing is the cost (one scrypt
+# hash is ~50-70 ms of CPU), so a 10k upload takes minutes: far past any
+# request timeout. The request splits the upload into tbl_Outbox jobs of
+# BULK_JOB_ROWS rows and returns 202 with an import id; job workers run
+# User.bulk_save_users_service on each chunk, and GET /users/bulk/<id>
+# assembles the per-row report from the job results.
+
+import logging
+import uuid
+
+from config import Config
+from DB_CONNECTION.config import engine
+from MODULE.JOBS.service.outbox_service import Outbox, notify_enqueued
+from MODULE.USER.service.user_service import User
+
+JOB_TYPE = 'bulk_import'
+
+
+def _key_prefix(import_id: str) -> str:
+    return f'bulk-import:{import_id}:'
+
+
+def _chunk_key(import_id: str, offset: int, count: int) -> str:
+    # Offset and size live in the key, so a chunk that died can still be reported row by row
+    return f'{_key_prefix(import_id)}{offset:06d}:{count}'
+
+
+def _import_status(statuses: list) -> str:
+    if all(s == 'done' for s in statuses):
+        return 'done'
+    if all(s in ('done', 'dead') for s in statuses):
+        return 'failed'
+    return 'running' if any(s in ('running', 'done', 'dead') for s in statuses) else 'pending'
+
+
+class BulkImport:
+
+    @staticmethod
+    def enqueue_service(rows: list, created_by, chunk_rows: int = None) -> dict:
+        """Queue the upload as jobs of `chunk_rows` rows, all in one transaction."""
+        chunk_rows = chunk_rows or Config.BULK_JOB_ROWS
+        import_id = uuid.uuid4().hex
+        try:
+            with engine.begin() as conn:
+                for offset in range(0, len(rows), chunk_rows):
+                    chunk = rows[offset:offset + chunk_rows]
+                    queued = Outbox.enqueue(JOB_TYPE, {
+                        'offset':     offset,
+                        'created_by': created_by,
+                        'rows':       chunk
+                    }, _chunk_key(import_id, offset, len(chunk)), conn=conn)
+                    if queued['ErrorCode'] != 9999:
+                        raise RuntimeError(queued['Message'])
+            notify_enqueued()
+        except Exception:
+            logging.exception('BulkImport.enqueue_service')
+            return {'ErrorCode': 9998, 'Message': 'Could not queue the import'}
+
+        return {
+            'ErrorCode': 9999,
+            'Message':   'Import queued',
+            'Import_ID': import_id,
+            'Rows':      len(rows),
+            'Jobs':      -(-len(rows) // chunk_rows)
+        }
+
+    @staticmethod
+    def run_chunk(payload: dict) -> dict:
+        """
+        Import one chunk; rows are numbered within the whole upload. A rerun
+        after a crash reports already-inserted rows as 'Email already exists'.
+        """
+        result = User.bulk_save_users_service(payload['rows'], payload['created_by'], Config.BULK_INSERT_CHUNK_SIZE)
+        if result['ErrorCode'] != 9999:
+            raise RuntimeError(result['Message'])   # retried by the job worker
+        for row in result['Results']:
+            row['Row'] += payload['offset']
+        return {'Inserted': result['Inserted'], 'Failed': result['Failed'], 'Results': result['Results']}
+
+    @staticmethod
+    def status_service(import_id: str) -> dict:
+        """Progress of an import; 'Results' holds the rows of the chunks that have finished."""
+        try:
+            jobs = Outbox.jobs_by_key_prefix(_key_prefix(import_id))
+        except Exception:
+            logging.exception('BulkImport.status_service')
+            return {'ErrorCode': 9998, 'Message': 'Database error'}
+        if not jobs:
+            return {'ErrorCode': 9995, 'Message': 'Import not found'}
+
+        results, rows, done_jobs = [], 0, 0
+        for job in jobs:
+            offset, count = (int(part) for part in job['str_Idempotency_Key'].rsplit(':', 2)[1:])
+            rows += count
+            if job['str_Status'] == 'done':
+                done_jobs += 1
+                results.extend(job['result']['Results'])
+            elif job['str_Status'] == 'dead':
+                message = f"Import job failed: {job['str_Last_Error'] or 'unknown error'}"
+                results.extend({'Row': i, 'ErrorCode': 9998, 'Message': message}
+                               for i in range(offset, offset + count))
+
+        inserted = sum(1 for r in results if r['ErrorCode'] == 9999)
+        return {
+            'ErrorCode':    9999,
+            'Import_ID':    import_id,
+            'Status':       _import_status([job['str_Status'] for job in jobs]),
+            'Rows':         rows,
+            'Jobs':         len(jobs),
+            'Jobs_Done':    done_jobs,
+            'Inserted':     inserted,
+            'Failed':       len(results) - inserted,
+            'Results':      results
+        }
@@ -0,0 +1,104 @@
+# MODULE/USER/service/export_service.py
+#
+# Streaming export of tbl_User as NDJSON or CSV, shared by GET /users/export
+# and the command line:
+#     python -m MODULE.USER.service.export_service --format csv --gzip -o users.csv.gz
+#     python -m MODULE.USER.service.export_service --columns lng_User_ID,str_Email --since 2025-01-01
+
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime
+from sqlalchemy import select
+
+from DB_CONNECTION.config import read_router
+from CREATE_DB_CODE.tables_creation import tbl_User
+from MODULE.USER.service.user_service import _rows_as_dicts
+from MODULE.USER.util.stream_util import ndjson_stream, csv_stream, gzip_stream
+
+# Everything except the password hash
+EXPORT_COLUMNS = [c.name for c in tbl_User.columns if c.name != 'str_Password_hash']
+
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv':    'text/csv',
+}
+
+
+def parse_columns(value: str = None) -> list:
+    """Comma-separated column list -> validated list (all columns when empty)."""
+    if not value:
+        return list(EXPORT_COLUMNS)
+    columns = [c.strip() for c in value.split(',') if c.strip()]
+    unknown = [c for c in columns if c not in EXPORT_COLUMNS]
+    if unknown:
+        raise ValueError(f'Unknown columns: {unknown}')
+    return columns
+
+
+def iter_export_rows(columns: list, modified_since: datetime = None,
+                     include_deleted: bool = False, chunk_size: int = 1000):
+    """
+    Yield lists of row dicts from a server-side cursor, in lng_User_ID order.
+    Errors propagate so an interrupted export never ends as a complete file.
+    """
+    stmt = select(*(tbl_User.c[c] for c in columns)).order_by(tbl_User.c.lng_User_ID)
+    if not include_deleted:
+        stmt = stmt.where(tbl_User.c.bln_IsDeleted == False)
+    if modified_since is not None:
+        # Set by every insert/update/delete; a range on IX_User_Changed_Date_ID
+        stmt = stmt.where(tbl_User.c.dte_Changed_Date >= modified_since)
+
+    try:
+        with read_router.reader() as conn:
+            result = conn.execution_options(stream_results=True, yield_per=chunk_size).execute(stmt)
+            keys = result.keys()
+            for partition in result.partitions():
+                yield _rows_as_dicts(keys, partition)
+    except Exception:
+        logging.exception('iter_export_rows')
+        raise
+
+
+def export_users(fmt: str, columns: list, modified_since: datetime = None,
+                 include_deleted: bool = False, gzip: bool = False, chunk_size: int = 1000):
+    """Encoded export stream: str pieces, or bytes when gzip=True."""
+    chunks = iter_export_rows(columns, modified_since, include_deleted, chunk_size)
+    pieces = csv_stream(chunks, columns) if fmt == 'csv' else ndjson_stream(chunks)
+    return gzip_stream(pieces) if gzip else pieces
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Export tbl_User as NDJSON or CSV.')
+    parser.add_argument('--format', choices=sorted(EXPORT_FORMATS), default='ndjson')
+    parser.add_argument('--columns', help=f'comma-separated subset of: {",".join(EXPORT_COLUMNS)}')
+    parser.add_argument('--since', type=datetime.fromisoformat, help='only rows created/modified/deleted at or after this ISO timestamp')
+    parser.add_argument('--include-deleted', action='store_true')
+    parser.add_argument('--gzip', action='store_true')
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('-o', '--output', help='output file (default: stdout)')
+    args = parser.parse_args(argv)
+
+    try:
+        columns = parse_columns(args.columns)
+    except ValueError as e:
+        parser.error(str(e))
+
+    stream = export_users(args.format, columns, args.since, args.include_deleted, args.gzip, args.chunk_size)
+    out = open(args.output, 'wb') if args.output else sys.stdout.buffer
+    try:
+        for piece in stream:
+            out.write(piece if isinstance(piece, bytes) else piece.encode('utf-8'))
+    except BaseException:
+        # Leave no complete-looking partial file behind
+        if args.output:
+            out.close()
+            os.remove(args.output)
+        raise
+    if args.output:
+        out.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,257 @@
+# MODULE/USER/service/user_async_service.py
+#
+# Async counterparts of the User service methods for the ASGI mode. They
+# build the same statements and return the same dicts; only the waiting
+# differs: the async engine for SQL, the DNS cache awaited instead of
+# blocked on, and password hashing and user-cache calls (a Redis round
+# trip with the shared backend) in a worker thread.
+#
+# There is one async engine, on the primary: reads here never go to a
+# replica, so there is no read-your-writes window to honour. Writes still
+# call read_router.note_write like the sync service, so sync readers in
+# the same process (the Flask fallthrough routes) read them from the primary.
+
+import asyncio
+import logging
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from DB_CONNECTION.async_config import get_async_engine
+from DB_CONNECTION.config import read_router
+from MODULE.USER.service.user_service import (
+    REQUIRED_USER_FIELDS,
+    user_cache,
+    _invalidate_user,
+    _email_key,
+    _insert_active_user_stmt,
+    _list_users_stmt,
+    _users_validator_stmt,
+    _users_validator,
+    _rows_as_dicts,
+    _user_details_stmt,
+    _split_details_row,
+    _active_user_exists_stmt,
+    _new_user_record,
+    _profile_update_values,
+    _update_user_stmt,
+    _delete_user_stmt,
+    _login_user_stmt,
+    _rehash_password_stmt
+)
+from MODULE.USER.util.user_util import (
+    validate_email_domain_async,
+    validate_password,
+    password_hasher,
+    hash_password,
+    verify_password
+)
+
+
+# CPU-bound: keep hashing off the event loop
+
+async def hash_password_async(password: str):
+    return await asyncio.to_thread(hash_password, password)
+
+
+async def verify_password_async(password: str, stored: str) -> bool:
+    return await asyncio.to_thread(verify_password, password, stored)
+
+
+class AsyncUser:
+
+    @staticmethod
+    async def save_user_service(data: dict) -> dict:
+        try:
+            missing = [f for f in REQUIRED_USER_FIELDS if not data.get(f)]
+            if missing:
+                return {'ErrorCode': 9997, 'Message': f'Missing fields: {missing}'}
+
+            if not await validate_email_domain_async(data['str_Email']):
+                return {'ErrorCode': 9991, 'Message': 'Invalid or unreachable email domain.'}
+            pwd_ok, pwd_msg = validate_password(data['str_Password'])
+            if not pwd_ok:
+                return {'ErrorCode': 9991, 'Message': pwd_msg}
+
+            encrypted = await hash_password_async(data['str_Password'])
+            if not encrypted:
+                return {'ErrorCode': 9992, 'Message': 'Password encryption failed.'}
+
+            async with get_async_engine().connect() as conn:
+                new_id = (await conn.execute(
+                    _insert_active_user_stmt(_new_user_record(data, encrypted, data['User_ID']))
+                )).scalar()
+                await conn.commit()
+
+            if new_id is None:
+                return {'ErrorCode': 9997, 'Message': 'Email already exists'}
+            read_router.note_write(new_id, _email_key(data['str_Email']))
+            return {'ErrorCode': 9999, 'Message': 'User saved successfully'}
+
+        except IntegrityError:
+            return {'ErrorCode': 9997, 'Message': 'Email already exists'}
+        except SQLAlchemyError:
+            logging.exception('AsyncUser.save_user_service')
+            return {'ErrorCode': 9998, 'Message': 'Database error'}
+        except Exception:
+            logging.exception('AsyncUser.save_user_service')
+            return {'ErrorCode': 9998, 'Message': 'Internal error'}
+
+
+    @staticmethod
+    async def get_user_details(user_id: int) -> dict:
+        return (await AsyncUser.get_user_entry(user_id))[0]
+
+
+    @staticmethod
+    async def get_user_entry(user_id: int) -> tuple:
+        try:
+            token = None
+            if user_cache is not None:
+                entry, token = await asyncio.to_thread(user_cache.get, user_id)
+                if isinstance(entry, tuple):
+                    details, changed = entry
+                    return {'ErrorCode': 9999, 'User Details': dict(details)}, changed
+
+            async with get_async_engine().connect() as conn:
+                row = (await conn.execute(_user_details_stmt(user_id))).fetchone()
+
+            if not row:
+                return {'ErrorCode': 9995, 'Message': 'User not found'}, None
+
+            details, changed = _split_details_row(row)
+            if user_cache is not None:
+                await asyncio.to_thread(user_cache.set, user_id, (details, changed), token)
+            return {'ErrorCode': 9999, 'User Details': dict(details)}, changed
+
+        except SQLAlchemyError:
+            logging.exception('AsyncUser.get_user_details')
+            return {'ErrorCode': 9998, 'Message': 'Database error'}, None
+        except Exception:
+            logging.exception('AsyncUser.get_user_details')
+            return {'ErrorCode': 9998, 'Message': 'Internal error'}, None
+
+
+    @staticmethod
+    async def users_validator():
+        """User.users_validator: (token, last-modified) for list pages, or None on error."""
+        try:
+            async with get_async_engine().connect() as conn:
+                return _users_validator((await conn.execute(_users_validator_stmt())).one())
+        except Exception:
+            logging.exception('AsyncUser.users_validator')
+            return None
+
+
+    @staticmethod
+    async def list_users_service(limit: int = 100, after: int = None) -> dict:
+        try:
+            async with get_async_engine().connect() as conn:
+                result = await conn.execute(_list_users_stmt(after).limit(limit + 1))
+                keys, rows = result.keys(), result.fetchall()
+
+            users = _rows_as_dicts(keys, rows[:limit])
+            next_cursor = users[-1]['lng_User_ID'] if len(rows) > limit else None
+            return {'ErrorCode': 9999, 'Users': users, 'Next_Cursor': next_cursor}
+
+        except SQLAlchemyError:
+            logging.exception('AsyncUser.list_users_service')
+            return {'ErrorCode': 9998, 'Message': 'Database error'}
+        except Exception:
+            logging.exception('AsyncUser.list_users_service')
+            return {'ErrorCode': 9998, 'Message': 'Internal error'}
+
+
+    @staticmethod
+    async def authenticate_user(email: str, password: str):
+        """User.authenticate_user: lng_User_ID for valid credentials, else None."""
+        async with get_async_engine().connect() as conn:
+            row = (await conn.execute(_login_user_stmt(email))).fetchone()
+
+        if not row:
+            await asyncio.to_thread(password_hasher.dummy_verify, password)
+            return None
+        if not await verify_password_async(password, row.str_Password_hash):
+            return None
+
+        if password_hasher.needs_rehash(row.str_Password_hash):
+            try:
+                new_hash = await hash_password_async(password)
+                if new_hash:
+                    async with get_async_engine().connect() as conn:
+                        await conn.execute(_rehash_password_stmt(row.lng_User_ID, row.str_Password_hash, new_hash))
+                        await conn.commit()
+            except SQLAlchemyError:
+                logging.exception('AsyncUser.authenticate_user rehash')
+        return row.lng_User_ID
+
+
+    @staticmethod
+    async def update_user_service(data: dict) -> dict:
+        try:
+            if 'User_ID' not in data or 'lng_User_ID' not in data:
+                return {'ErrorCode': 9997, 'Message': 'Missing User_ID or target ID'}
+
+            values, errors = _profile_update_values(data), {}
+
+            if data.get('str_Email'):
+                if not await validate_email_domain_async(data['str_Email']):
+                    errors['str_Email'] = 'Invalid or unreachable domain'
+                else:
+                    values['str_Email'] = data['str_Email']
+
+            if data.get('str_Password'):
+                valid, msg = validate_password(data['str_Password'])
+                if not valid:
+                    errors['str_Password'] = msg
+                else:
+                    encrypted = await hash_password_async(data['str_Password'])
+                    if encrypted:
+                        values['str_Password_hash'] = encrypted
+
+            if errors:
+                return {'ErrorCode': 9991, 'Message': f'Invalid fields: {errors}'}
+            if not values:
+                return {'ErrorCode': 9998, 'Message': 'No changes detected'}
+
+            async with get_async_engine().connect() as conn:
+                res = await conn.execute(_update_user_stmt(data['lng_User_ID'], data['User_ID'], values))
+                await conn.commit()
+                await asyncio.to_thread(_invalidate_user, data['lng_User_ID'])
+                if 'str_Email' in values:
+                    read_router.note_write(_email_key(values['str_Email']))
+
+                if res.rowcount == 0:
+                    exists = (await conn.execute(_active_user_exists_stmt(data['lng_User_ID']))).fetchone()
+                    if not exists:
+                        return {'ErrorCode': 9996, 'Message': 'User not found'}
+                    return {'ErrorCode': 9998, 'Message': 'No changes detected'}
+
+            return {'ErrorCode': 9999, 'Message': 'User updated successfully'}
+
+        except IntegrityError:
+            return {'ErrorCode': 9997, 'Message': 'Email already exists'}
+        except SQLAlchemyError:
+            logging.exception('AsyncUser.update_user_service')
+            return {'ErrorCode': 9998, 'Message': 'Database error'}
+        except Exception:
+            logging.exception('AsyncUser.update_user_service')
+            return {'ErrorCode': 9998, 'Message': 'Internal error'}
+
+
+    @staticmethod
+    async def delete_user_service(user_id: int) -> dict:
+        try:
+            async with get_async_engine().connect() as conn:
+                res = await conn.execute(_delete_user_stmt(user_id))
+                await conn.commit()
+            await asyncio.to_thread(_invalidate_user, user_id)
+
+            if res.rowcount == 0:
+                return {'ErrorCode': 9996, 'Message': 'User not found or already deleted'}
+            return {'ErrorCode': 9999, 'Message': 'User deleted successfully'}
+
+        except SQLAlchemyError:
+            logging.exception('AsyncUser.delete_user_service')
+            return {'ErrorCode': 9998, 'Message': 'Database error'}
+        except Exception:
+            logging.exception('AsyncUser.delete_user_service')
+            return {'ErrorCode': 9998, 'Message': 'Internal error'}
@@ -1,27 +1,410 @@
 # MODULE/USER/service/user_service.py
 
 import logging
-from datetime import datetime
-from sqlalchemy import insert, update, select
-from sqlalchemy.exc import SQLAlchemyError
-
-from DB_CONNECTION.config import engine
-from CREATE_DB_CODE.tables_creation import tbl_User
+import string
+from datetime import datetime, timedelta
+from sqlalchemy import insert, update, select, literal, func, and_, or_, tuple_, union_all, String
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from config import Config
+from DB_CONNECTION.config import engine, read_router
+from CREATE_DB_CODE.tables_creation import tbl_User, tbl_User_Archive, search_key
+from MODULE.COMMON.util.cache_util import build_cache_backend
+from MODULE.COMMON.util.cursor_util import encode_cursor, decode_cursor
+from MODULE.USER.util.dns_util import domain_cache
 from MODULE.USER.util.user_util import (
+    email_domain,
     validate_email_domain,
     validate_password,
-    check_unique_value,
-    encrypt_password
+    password_hasher,
+    hash_password,
+    hash_passwords,
+    verify_password
+)
+
+REQUIRED_USER_FIELDS = ['str_Email', 'str_First_Name', 'str_Last_Name', 'str_Location', 'str_Password']
+
+def _user_cache_ttl(config=Config) -> float:
+    # A memory entry outlives writes made by other workers until it expires
+    if config.USER_CACHE_BACKEND == 'memory' and config.WEB_CONCURRENCY > 1:
+        return min(config.USER_CACHE_TTL, config.USER_CACHE_MEMORY_MAX_TTL)
+    return config.USER_CACHE_TTL
+
+
+# get_user_details cache: lng_User_ID -> 'User Details' dict (None when disabled)
+user_cache = build_cache_backend(
+    Config.USER_CACHE_BACKEND, Config.USER_CACHE_SIZE, _user_cache_ttl(),
+    Config.USER_CACHE_REDIS_URL, prefix='user'
+) if Config.USER_CACHE_ENABLED else None
+
+
+def _invalidate_user(user_id):
+    # Called after every write to a user: drop the cached copy and, for the
+    # read-your-writes window, read this user from the primary
+    read_router.note_write(int(user_id))
+    if user_cache is not None:
+        user_cache.invalidate(int(user_id))
+
+
+def _email_key(email: str) -> str:
+    # read_router key for login lookups by email
+    return f'email:{email.lower()}'
+
+
+_UPSERT_INSERTS = {'postgresql': postgresql.insert, 'sqlite': sqlite.insert}
+
+
+def _insert_active_user_stmt(values: dict):
+    """
+    INSERT that skips (instead of failing on) a clash with the
+    UX_User_Email_Active partial unique index; returns the new id or no row.
+    """
+    dialect_insert = _UPSERT_INSERTS.get(engine.dialect.name)
+    if dialect_insert is None:
+        # Other dialects: a clash surfaces as IntegrityError
+        return insert(tbl_User).values(values).returning(tbl_User.c.lng_User_ID)
+    return (
+        dialect_insert(tbl_User).values(values)
+        .on_conflict_do_nothing(
+            index_elements=[tbl_User.c.str_Email],
+            index_where=tbl_User.c.bln_IsDeleted == False
+        )
+        .returning(tbl_User.c.lng_User_ID)
+    )
+
+def _list_users_stmt(after: int = None):
+    stmt = (
+        select(
+            tbl_User.c.lng_User_ID,
+            tbl_User.c.str_First_Name,
+            tbl_User.c.str_Last_Name,
+            tbl_User.c.str_Email,
+            tbl_User.c.str_Location
+        )
+        .where(tbl_User.c.bln_IsDeleted == False)
+        .order_by(tbl_User.c.lng_User_ID)
+    )
+    if after is not None:
+        stmt = stmt.where(tbl_User.c.lng_User_ID > after)
+    return stmt
+
+
+
+SEARCH_STATUSES = ('active', 'deleted', 'all')
+
+SEARCH_COLUMNS = (
+    tbl_User.c.lng_User_ID,
+    tbl_User.c.str_First_Name,
+    tbl_User.c.str_Last_Name,
+    tbl_User.c.str_Full_Name,
+    tbl_User.c.str_Email,
+    tbl_User.c.str_Location,
+    tbl_User.c.bln_IsActive,
+    tbl_User.c.bln_IsDeleted
 )
 
+
+# search_key folds case with the database's lower(); the prefix must be
+# folded the same way. SQLite's lower() only folds ASCII, so there
+# "Élodie" matches "Élodie" but not "élodie".
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+_SEARCH_FOLDS = {'sqlite': lambda s: s.translate(_ASCII_LOWER)}
+
+
+def _prefix_range(key, prefix: str, floor: str = None):
+    """
+    key starts with prefix (case-insensitive), as an index range:
+    low <= key < high. `floor` (a cursor's key) raises the lower bound so
+    the seek starts at the cursor rather than at the top of the prefix.
+    """
+    low = _SEARCH_FOLDS.get(engine.dialect.name, str.lower)(prefix)
+    high = low[:-1] + chr(ord(low[-1]) + 1)
+    return and_(key >= max(low, floor or low), key < high)
+
+
+def _search_users_stmt(name: str = None, email: str = None, location: str = None,
+                       status: str = 'active', cursor: list = None):
+    """
+    Rows come in (name key, id) order when searching by name, (email key,
+    id) when only by email, else id order; each has a matching index, so a
+    page reads ~limit index entries. `cursor` is the decoded Next_Cursor.
+    """
+    if name:
+        mode, key = 'name', search_key(tbl_User.c.str_Full_Name)
+    elif email:
+        mode, key = 'email', search_key(tbl_User.c.str_Email)
+    else:
+        mode, key = 'id', None
+
+    floor = None
+    if cursor is not None:
+        if not cursor or cursor[0] != mode or len(cursor) != (2 if key is None else 3):
+            raise ValueError('Cursor does not match these search parameters')
+        floor = None if key is None else str(cursor[1])
+
+    stmt = select(*SEARCH_COLUMNS)
+    if key is not None:
+        stmt = stmt.add_columns(key.label('search_key')).order_by(key, tbl_User.c.lng_User_ID)
+    else:
+        stmt = stmt.order_by(tbl_User.c.lng_User_ID)
+
+    if name:
+        stmt = stmt.where(_prefix_range(key, name, floor))
+    if email:
+        email_key = search_key(tbl_User.c.str_Email)
+        stmt = stmt.where(_prefix_range(email_key, email, floor if mode == 'email' else None))
+    if location:
+        stmt = stmt.where(tbl_User.c.str_Location == location)
+
+    if status != 'all':
+        stmt = stmt.where(tbl_User.c.bln_IsDeleted == (status == 'deleted'))
+    elif key is not None or location:
+        # Both values, but still a seekable leading column for the search indexes
+        stmt = stmt.where(tbl_User.c.bln_IsDeleted.in_([False, True]))
+
+    if cursor is not None:
+        if key is None:
+            stmt = stmt.where(tbl_User.c.lng_User_ID > int(cursor[1]))
+        else:
+            stmt = stmt.where(tuple_(key, tbl_User.c.lng_User_ID) > tuple_(literal(floor), int(cursor[2])))
+    return stmt, mode
+
+
+# Column projection of GET /users/<id>
+USER_DETAIL_COLUMNS = (
+    tbl_User.c.lng_User_ID,
+    tbl_User.c.str_First_Name,
+    tbl_User.c.str_Last_Name,
+    tbl_User.c.str_Email,
+    tbl_User.c.str_Full_Name,
+    tbl_User.c.str_Location,
+    tbl_User.c.dte_Created_Date,
+    tbl_User.c.bln_IsActive
+)
+
+
+# When an active row last changed (its HTTP Last-Modified / ETag validator)
+_LAST_CHANGED = func.coalesce(tbl_User.c.dte_Modified_Date, tbl_User.c.dte_Created_Date).label('dte_Last_Changed')
+
+
+def _user_details_stmt(user_id: int):
+    return select(*USER_DETAIL_COLUMNS, _LAST_CHANGED).where(
+        tbl_User.c.lng_User_ID == user_id,
+        tbl_User.c.bln_IsDeleted == False
+    )
+
+
+def _users_details_stmt(user_ids: list):
+    # One IN (...) probe of the primary key for the whole batch
+    return select(*USER_DETAIL_COLUMNS, _LAST_CHANGED).where(
+        tbl_User.c.lng_User_ID.in_(user_ids),
+        tbl_User.c.bln_IsDeleted == False
+    )
+
+
+def _split_details_row(row) -> tuple:
+    """Details row -> (details dict, last-changed datetime)."""
+    details = dict(row._mapping)
+    return details, details.pop('dte_Last_Changed')
+
+
+def _users_validator_stmt():
+    """
+    Index-only aggregates that move on every insert, update and delete of
+    tbl_User: max id (and its created date), max modified, max deleted, and
+    the archive watermark (archival removes deleted rows without touching
+    the others, but status=deleted/all searches change).
+    """
+    newest = select(tbl_User.c.dte_Created_Date).order_by(tbl_User.c.lng_User_ID.desc()).limit(1)
+    return select(
+        select(func.max(tbl_User.c.lng_User_ID)).scalar_subquery(),
+        newest.scalar_subquery(),
+        select(func.max(tbl_User.c.dte_Modified_Date)).scalar_subquery(),
+        select(func.max(tbl_User.c.dte_Deleted_Date)).scalar_subquery(),
+        select(func.max(tbl_User_Archive.c.dte_Archived_Date)).scalar_subquery()
+    )
+
+
+def _users_validator(row) -> tuple:
+    """_users_validator_stmt row -> (token, last-modified)."""
+    max_id, newest_created, max_modified, max_deleted, max_archived = row
+    changed = [d for d in (newest_created, max_modified, max_deleted, max_archived) if d is not None]
+    token = ':'.join([str(max_id)] + [d.isoformat() if d else 'None' for d in (max_modified, max_deleted, max_archived)])
+    return token, max(changed) if changed else None
+
+
+CHANGE_COLUMNS = (
+    tbl_User.c.lng_User_ID,
+    tbl_User.c.str_First_Name,
+    tbl_User.c.str_Last_Name,
+    tbl_User.c.str_Email,
+    tbl_User.c.str_Location,
+    tbl_User.c.bln_IsActive,
+    tbl_User.c.bln_IsDeleted,
+    tbl_User.c.dte_Created_Date,
+    tbl_User.c.dte_Modified_Date,
+    tbl_User.c.dte_Deleted_Date,
+    tbl_User.c.dte_Changed_Date
+)
+# A deleted user is reported by id only; its profile stays out of mirrors
+_DELETED_CHANGE_KEYS = ('lng_User_ID', 'bln_IsDeleted', 'dte_Deleted_Date', 'dte_Changed_Date')
+
+
+def _changes_stmt(horizon: datetime, limit: int, cursor: list = None):
+    """
+    Up to `limit` rows changed after the (dte_Changed_Date, id) cursor and no
+    later than `horizon`, in feed order. The cursor predicate is two index
+    seeks (rest of the cursor's timestamp by id, then later timestamps)
+    rather than a row-value comparison, which SQLite only seeks on its first
+    column: a bulk import shares one timestamp across thousands of rows.
+    """
+    order = (tbl_User.c.dte_Changed_Date, tbl_User.c.lng_User_ID)
+    later = select(*CHANGE_COLUMNS).where(tbl_User.c.dte_Changed_Date <= horizon)
+    if cursor is None:
+        return later.order_by(*order).limit(limit)
+    if len(cursor) != 3 or cursor[0] != 'chg':
+        raise ValueError('Invalid cursor')
+    changed, last_id = datetime.fromisoformat(cursor[1]), int(cursor[2])
+
+    same = (
+        select(*CHANGE_COLUMNS)
+        .where(tbl_User.c.dte_Changed_Date == changed, tbl_User.c.lng_User_ID > last_id)
+        .order_by(tbl_User.c.lng_User_ID).limit(limit).subquery()
+    )
+    later = later.where(tbl_User.c.dte_Changed_Date > changed).order_by(*order).limit(limit).subquery()
+    both = union_all(select(same), select(later)).subquery()
+    return select(both).order_by(both.c.dte_Changed_Date, both.c.lng_User_ID).limit(limit)
+
+
+def _change_entry(row: dict) -> dict:
+    if row['bln_IsDeleted']:
+        return {'str_Change': 'deleted', **{k: row[k] for k in _DELETED_CHANGE_KEYS}}
+    return {'str_Change': 'modified' if row['dte_Modified_Date'] else 'created', **row}
+
+
+def _rows_as_dicts(keys, rows) -> list:
+    # ~5x cheaper than dict(row._mapping) per row on large pages
+    return [dict(zip(keys, r)) for r in rows]
+
+
+def _active_user_exists_stmt(user_id: int):
+    return select(tbl_User.c.lng_User_ID).where(
+        tbl_User.c.lng_User_ID == user_id,
+        tbl_User.c.bln_IsDeleted == False
+    )
+
+
+def _new_user_record(data: dict, encrypted: str, created_by, now: datetime = None) -> dict:
+    now = now or datetime.utcnow()
+    return {
+        'str_First_Name':    data['str_First_Name'],
+        'str_Last_Name':     data['str_Last_Name'],
+        'str_Full_Name':     f"{data['str_First_Name']} {data['str_Last_Name']}",
+        'str_Location':      data['str_Location'],
+        'str_Email':         data['str_Email'],
+        'str_Password_hash': encrypted,
+        'dte_Created_Date':  now,
+        'dte_Changed_Date':  now,
+        'lng_Created_By':    created_by,
+        'bln_IsActive':      True,
+        'bln_IsDeleted':     False
+    }
+
+
+def _profile_update_values(data: dict) -> dict:
+    """Name/location changes from an update request (email/password are validated separately)."""
+    return {col: data[col] for col in ('str_First_Name', 'str_Last_Name', 'str_Location') if data.get(col)}
+
+
+def _update_user_stmt(user_id: int, modified_by, values: dict):
+    """
+    One conditional UPDATE: matches only an active row where some value
+    differs. str_Full_Name is rebuilt in SQL from whichever half is kept.
+    """
+    changed = or_(*(tbl_User.c[col].is_distinct_from(val) for col, val in values.items()))
+    now = datetime.utcnow()
+    stmt = (
+        update(tbl_User)
+        .where(
+            tbl_User.c.lng_User_ID == user_id,
+            tbl_User.c.bln_IsDeleted == False,
+            changed
+        )
+        .values(
+            **values,
+            lng_Modified_By=modified_by,
+            dte_Modified_Date=now,
+            dte_Changed_Date=now
+        )
+    )
+    if 'str_First_Name' in values or 'str_Last_Name' in values:
+        first = literal(values['str_First_Name'], String) if 'str_First_Name' in values else tbl_User.c.str_First_Name
+        last = literal(values['str_Last_Name'], String) if 'str_Last_Name' in values else tbl_User.c.str_Last_Name
+        stmt = stmt.values(str_Full_Name=first + ' ' + last)
+    return stmt
+
+
+def _delete_user_stmt(user_id: int):
+    now = datetime.utcnow()
+    return (
+        update(tbl_User)
+        .where(
+            tbl_User.c.lng_User_ID == user_id,
+            tbl_User.c.bln_IsDeleted == False
+        )
+        .values(
+            bln_IsDeleted=True,
+            dte_Deleted_Date=now,
+            dte_Changed_Date=now,
+            lng_Deleted_By=user_id
+        )
+    )
+
+
+def _login_user_stmt(email: str):
+    return select(tbl_User.c.lng_User_ID, tbl_User.c.str_Password_hash).where(
+        tbl_User.c.str_Email == email,
+        tbl_User.c.bln_IsDeleted == False
+    )
+
+
+def _rehash_password_stmt(user_id: int, old_hash: str, new_hash: str):
+    # Only if the hash is still the one we verified (no racing reset/update)
+    return (
+        update(tbl_User)
+        .where(
+            tbl_User.c.lng_User_ID == user_id,
+            tbl_User.c.str_Password_hash == old_hash
+        )
+        .values(str_Password_hash=new_hash)
+    )
+
+
+def _reset_password_stmt(email: str, new_hash: str):
+    now = datetime.utcnow()
+    return (
+        update(tbl_User)
+        .where(
+            tbl_User.c.str_Email == email,
+            tbl_User.c.bln_IsDeleted == False
+        )
+        .values(
+            str_Password_hash=new_hash,
+            dte_Modified_Date=now,
+            dte_Changed_Date=now
+        )
+        .returning(tbl_User.c.lng_User_ID)
+    )
+
+
 class User:
 
     @staticmethod
     def save_user_service(data: dict) -> dict:
         try:
             # 1) Required fields
-            required = ['str_Email', 'str_First_Name', 'str_Last_Name', 'str_Location', 'str_Password']
-            missing = [f for f in required if not data.get(f)]
+            missing = [f for f in REQUIRED_USER_FIELDS if not data.get(f)]
             if missing:
                 return {'ErrorCode': 9997, 'Message': f'Missing fields: {missing}'}
 
@@ -32,34 +415,24 @@ class User:
             if not pwd_ok:
                 return {'ErrorCode': 9991, 'Message': pwd_msg}
 
-            with engine.connect() as conn:
-                # 3) Check uniqueness
-                if check_unique_value(tbl_User, 'str_Email', data['str_Email'], conn):
-                    return {'ErrorCode': 9997, 'Message': 'Email already exists'}
+            # 3) Encrypt password
+            encrypted = hash_password(data['str_Password'])
+            if not encrypted:
+                return {'ErrorCode': 9992, 'Message': 'Password encryption failed.'}
 
-                # 4) Encrypt password
-                encrypted = encrypt_password(data['str_Password'])
-                if not encrypted:
-                    return {'ErrorCode': 9992, 'Message': 'Password encryption failed.'}
-
-                # 5) Insert record
-                user_rec = {
-                    'str_First_Name':    data['str_First_Name'],
-                    'str_Last_Name':     data['str_Last_Name'],
-                    'str_Full_Name':     f"{data['str_First_Name']} {data['str_Last_Name']}",
-                    'str_Location':      data['str_Location'],
-                    'str_Email':         data['str_Email'],
-                    'str_Password_hash': encrypted,
-                    'dte_Created_Date':  datetime.utcnow(),
-                    'lng_Created_By':    data['User_ID'],
-                    'bln_IsActive':      True,
-                    'bln_IsDeleted':     False
-                }
-                conn.execute(insert(tbl_User).values(user_rec))
+            # 4) Insert record; uniqueness is enforced by the same statement
+            user_rec = _new_user_record(data, encrypted, data['User_ID'])
+            with engine.connect() as conn:
+                new_id = conn.execute(_insert_active_user_stmt(user_rec)).scalar()
                 conn.commit()
 
+            if new_id is None:
+                return {'ErrorCode': 9997, 'Message': 'Email already exists'}
+            read_router.note_write(new_id, _email_key(data['str_Email']))
             return {'ErrorCode': 9999, 'Message': 'User saved successfully'}
 
+        except IntegrityError:
+            return {'ErrorCode': 9997, 'Message': 'Email already exists'}
         except SQLAlchemyError:
             logging.exception('save_user_service')
             return {'ErrorCode': 9998, 'Message': 'Database error'}
@@ -69,58 +442,218 @@ class User:
 
 
     @staticmethod
-    def get_user_details(user_id: int) -> dict:
+    def bulk_save_users_service(rows: list, created_by, chunk_size: int = 1000) -> dict:
+        """
+        Import many users at once. Validation is batched: one uniqueness
+        query for the whole upload, one DNS lookup per distinct domain, and
+        passwords hashed in a process pool; inserts go in executemany chunks,
+        one transaction each. Returns a per-row report.
+        """
         try:
+            results = [None] * len(rows)
+
+            def fail(i, code, msg):
+                results[i] = {'Row': i, 'ErrorCode': code, 'Message': msg}
+
+            # 1) Per-row checks that need no I/O
+            candidates, seen = [], set()
+            for i, data in enumerate(rows):
+                if not isinstance(data, dict):
+                    fail(i, 9997, 'Row must be an object')
+                    continue
+                missing = [f for f in REQUIRED_USER_FIELDS if not data.get(f)]
+                if missing:
+                    fail(i, 9997, f'Missing fields: {missing}')
+                    continue
+                if email_domain(data['str_Email']) is None:
+                    fail(i, 9991, 'Invalid or unreachable email domain.')
+                    continue
+                pwd_ok, pwd_msg = validate_password(data['str_Password'])
+                if not pwd_ok:
+                    fail(i, 9991, pwd_msg)
+                    continue
+                if data['str_Email'] in seen:
+                    fail(i, 9997, 'Duplicate email in upload')
+                    continue
+                seen.add(data['str_Email'])
+                candidates.append(i)
+
+            # 2) Each distinct domain resolved once, concurrently
+            resolvable = domain_cache.resolve_many(email_domain(rows[i]['str_Email']) for i in candidates)
+            for i in [i for i in candidates if not resolvable[email_domain(rows[i]['str_Email'])]]:
+                fail(i, 9991, 'Invalid or unreachable email domain.')
+            candidates = [i for i in candidates if results[i] is None]
+
+            # 3) Set-based uniqueness check against active users
+            emails = [rows[i]['str_Email'] for i in candidates]
+            taken = set()
             with engine.connect() as conn:
-                stmt = (
-                    select(
-                        tbl_User.c.lng_User_ID,
-                        tbl_User.c.str_First_Name,
-                        tbl_User.c.str_Last_Name,
-                        tbl_User.c.str_Email,
-                        tbl_User.c.str_Full_Name,
-                        tbl_User.c.str_Location,
-                        tbl_User.c.dte_Created_Date,
-                        tbl_User.c.bln_IsActive
-                    )
-                    .where(
-                        tbl_User.c.lng_User_ID == user_id,
-                        tbl_User.c.bln_IsDeleted == False
-                    )
-                )
-                row = conn.execute(stmt).fetchone()
+                for start in range(0, len(emails), 10000):
+                    taken.update(conn.execute(
+                        select(tbl_User.c.str_Email).where(
+                            tbl_User.c.str_Email.in_(emails[start:start + 10000]),
+                            tbl_User.c.bln_IsDeleted == False
+                        )
+                    ).scalars())
+            for i in [i for i in candidates if rows[i]['str_Email'] in taken]:
+                fail(i, 9997, 'Email already exists')
+            candidates = [i for i in candidates if results[i] is None]
+
+            # 4) Hash passwords off the request thread
+            hashes = hash_passwords([rows[i]['str_Password'] for i in candidates])
+
+            now = datetime.utcnow()
+            records = []
+            for i, encrypted in zip(candidates, hashes):
+                if not encrypted:
+                    fail(i, 9992, 'Password encryption failed.')
+                    continue
+                records.append((i, _new_user_record(rows[i], encrypted, created_by, now)))
+
+            # 5) Chunked executemany inserts, one transaction per chunk
+            with engine.connect() as conn:
+                for start in range(0, len(records), chunk_size):
+                    chunk = records[start:start + chunk_size]
+                    try:
+                        conn.execute(insert(tbl_User), [rec for _, rec in chunk])
+                        conn.commit()
+                        for i, _ in chunk:
+                            results[i] = {'Row': i, 'ErrorCode': 9999, 'Message': 'User saved successfully'}
+                    except IntegrityError:
+                        # A concurrent signup took one of these emails; retry row by row
+                        conn.rollback()
+                        for i, rec in chunk:
+                            new_id = conn.execute(_insert_active_user_stmt(rec)).scalar()
+                            conn.commit()
+                            if new_id is None:
+                                fail(i, 9997, 'Email already exists')
+                            else:
+                                results[i] = {'Row': i, 'ErrorCode': 9999, 'Message': 'User saved successfully'}
+
+            inserted = sum(1 for r in results if r['ErrorCode'] == 9999)
+            return {
+                'ErrorCode': 9999,
+                'Inserted':  inserted,
+                'Failed':    len(results) - inserted,
+                'Results':   results
+            }
+
+        except SQLAlchemyError:
+            logging.exception('bulk_save_users_service')
+            return {'ErrorCode': 9998, 'Message': 'Database error'}
+        except Exception:
+            logging.exception('bulk_save_users_service')
+            return {'ErrorCode': 9998, 'Message': 'Internal error'}
+
+
+    @staticmethod
+    def get_user_details(user_id: int) -> dict:
+        return User.get_user_entry(user_id)[0]
+
+
+    @staticmethod
+    def get_user_entry(user_id: int) -> tuple:
+        """
+        (get_user_details result, last-changed datetime). The timestamp is
+        None unless the user was found; it is cached alongside the details.
+        """
+        try:
+            token = None
+            if user_cache is not None:
+                entry, token = user_cache.get(user_id)
+                if isinstance(entry, tuple):
+                    details, changed = entry
+                    return {'ErrorCode': 9999, 'User Details': dict(details)}, changed
+
+            # A version token means the user was written recently: skip the replicas
+            with read_router.reader(user_id, primary=bool(token)) as conn:
+                row = conn.execute(_user_details_stmt(user_id)).fetchone()
 
             if not row:
-                return {'ErrorCode': 9995, 'Message': 'User not found'}
+                return {'ErrorCode': 9995, 'Message': 'User not found'}, None
 
-            return {'ErrorCode': 9999, 'User Details': dict(row._mapping)}
+            details, changed = _split_details_row(row)
+            if user_cache is not None:
+                # Skipped if a write invalidated this id since `token` was read
+                user_cache.set(user_id, (details, changed), token)
+            return {'ErrorCode': 9999, 'User Details': dict(details)}, changed
 
         except SQLAlchemyError:
             logging.exception('get_user_details')
-            return {'ErrorCode': 9998, 'Message': 'Database error'}
+            return {'ErrorCode': 9998, 'Message': 'Database error'}, None
         except Exception:
             logging.exception('get_user_details')
-            return {'ErrorCode': 9998, 'Message': 'Internal error'}
+            return {'ErrorCode': 9998, 'Message': 'Internal error'}, None
 
 
     @staticmethod
-    def list_users_service() -> dict:
+    def get_user_entries(user_ids: list) -> tuple:
+        """
+        Batch form of get_user_entry: (result, {id: last-changed}) where
+        result['Users'] holds the found users' details in the requested
+        order (duplicates collapsed) and result['Missing_IDs'] the ids
+        that do not exist or are deleted. Cached users come from one cache
+        round trip; the rest from one query.
+        """
         try:
-            with engine.connect() as conn:
-                stmt = (
-                    select(
-                        tbl_User.c.lng_User_ID,
-                        tbl_User.c.str_First_Name,
-                        tbl_User.c.str_Last_Name,
-                        tbl_User.c.str_Email,
-                        tbl_User.c.str_Location
-                    )
-                    .where(tbl_User.c.bln_IsDeleted == False)
-                )
-                rows = conn.execute(stmt).fetchall()
+            ids = list(dict.fromkeys(int(i) for i in user_ids))
+            found, tokens = {}, {}
+            if user_cache is not None:
+                for user_id, (entry, token) in user_cache.get_many(ids).items():
+                    if isinstance(entry, tuple):
+                        found[user_id] = entry
+                    else:
+                        tokens[user_id] = token
+            misses = [i for i in ids if i not in found]
+
+            if misses:
+                with read_router.reader(*misses, primary=any(tokens.values())) as conn:
+                    rows = conn.execute(_users_details_stmt(misses)).fetchall()
+                fetched = {row.lng_User_ID: _split_details_row(row) for row in rows}
+                found.update(fetched)
+                if user_cache is not None and fetched:
+                    user_cache.set_many({i: (entry, tokens.get(i)) for i, entry in fetched.items()})
+
+            return {
+                'ErrorCode':   9999,
+                'Users':       [dict(found[i][0]) for i in ids if i in found],
+                'Missing_IDs': [i for i in ids if i not in found]
+            }, {i: found[i][1] for i in ids if i in found}
+
+        except SQLAlchemyError:
+            logging.exception('get_user_entries')
+            return {'ErrorCode': 9998, 'Message': 'Database error'}, {}
+        except Exception:
+            logging.exception('get_user_entries')
+            return {'ErrorCode': 9998, 'Message': 'Internal error'}, {}
 
-            users = [dict(r._mapping) for r in rows]
-            return {'ErrorCode': 9999, 'Users': users}
+
+    @staticmethod
+    def users_validator():
+        """
+        (token, last-modified) describing the current state of tbl_User for
+        conditional GETs on list/search pages, or None on error. Assumes
+        app servers' clocks are in sync (dates come from utcnow()).
+        """
+        try:
+            with read_router.reader() as conn:
+                return _users_validator(conn.execute(_users_validator_stmt()).one())
+        except Exception:
+            logging.exception('users_validator')
+            return None
+
+
+    @staticmethod
+    def list_users_service(limit: int = 100, after: int = None) -> dict:
+        try:
+            with read_router.reader() as conn:
+                # Keyset page: one row past the limit tells us if there is a next page
+                result = conn.execute(_list_users_stmt(after).limit(limit + 1))
+                keys, rows = result.keys(), result.fetchall()
+
+            users = _rows_as_dicts(keys, rows[:limit])
+            next_cursor = users[-1]['lng_User_ID'] if len(rows) > limit else None
+            return {'ErrorCode': 9999, 'Users': users, 'Next_Cursor': next_cursor}
 
         except SQLAlchemyError:
             logging.exception('list_users_service')
@@ -130,6 +663,106 @@ class User:
             return {'ErrorCode': 9998, 'Message': 'Internal error'}
 
 
+    @staticmethod
+    def search_users_service(name: str = None, email: str = None, location: str = None,
+                             status: str = 'active', limit: int = 100, after: str = None) -> dict:
+        try:
+            if status not in SEARCH_STATUSES:
+                return {'ErrorCode': 9997, 'Message': f'status must be one of {list(SEARCH_STATUSES)}'}
+            try:
+                stmt, mode = _search_users_stmt(name, email, location, status,
+                                                decode_cursor(after) if after else None)
+            except (ValueError, TypeError, IndexError):
+                return {'ErrorCode': 9997, 'Message': 'Invalid cursor'}
+
+            with read_router.reader() as conn:
+                result = conn.execute(stmt.limit(limit + 1))
+                keys, rows = result.keys(), result.fetchall()
+
+            users = _rows_as_dicts(keys, rows[:limit])
+            next_cursor = None
+            if len(rows) > limit:
+                last = users[-1]
+                next_cursor = encode_cursor(
+                    [mode, last['lng_User_ID']] if mode == 'id'
+                    else [mode, last['search_key'], last['lng_User_ID']]
+                )
+            for user in users:
+                user.pop('search_key', None)
+            return {'ErrorCode': 9999, 'Users': users, 'Next_Cursor': next_cursor}
+
+        except SQLAlchemyError:
+            logging.exception('search_users_service')
+            return {'ErrorCode': 9998, 'Message': 'Database error'}
+        except Exception:
+            logging.exception('search_users_service')
+            return {'ErrorCode': 9998, 'Message': 'Internal error'}
+
+
+    @staticmethod
+    def user_changes_service(limit: int = 100, since: str = None, settle_seconds: float = 5.0) -> dict:
+        """
+        Users created, modified or soft-deleted after the `since` cursor,
+        oldest change first. Changes younger than settle_seconds are held
+        back: write timestamps come from each worker's clock before commit,
+        so a slower transaction can commit an older timestamp after a newer
+        one, and the cursor must not move past it. Next_Cursor is always
+        returned (pass it as ?since= on the next poll); Has_More says
+        whether to fetch again straight away.
+        """
+        try:
+            try:
+                cursor = decode_cursor(since) if since else None
+                stmt = _changes_stmt(datetime.utcnow() - timedelta(seconds=settle_seconds), limit + 1, cursor)
+            except (ValueError, TypeError):
+                return {'ErrorCode': 9997, 'Message': 'Invalid cursor'}
+
+            with read_router.reader() as conn:
+                result = conn.execute(stmt)
+                keys, rows = result.keys(), result.fetchall()
+
+            page = _rows_as_dicts(keys, rows[:limit])
+            if page:
+                last = page[-1]
+                next_cursor = encode_cursor(['chg', last['dte_Changed_Date'].isoformat(), last['lng_User_ID']])
+            else:
+                next_cursor = since
+            return {
+                'ErrorCode':   9999,
+                'Changes':     [_change_entry(row) for row in page],
+                'Next_Cursor': next_cursor,
+                'Has_More':    len(rows) > limit
+            }
+
+        except SQLAlchemyError:
+            logging.exception('user_changes_service')
+            return {'ErrorCode': 9998, 'Message': 'Database error'}
+        except Exception:
+            logging.exception('user_changes_service')
+            return {'ErrorCode': 9998, 'Message': 'Internal error'}
+
+
+    @staticmethod
+    def iter_users_service(chunk_size: int = 1000, after: int = None):
+        """
+        Yield active users as lists of dicts, at most chunk_size per list,
+        read from a server-side cursor so memory stays flat. Errors are
+        re-raised: the headers are already sent, so the server must abort
+        the chunked response rather than end it cleanly.
+        """
+        try:
+            with read_router.reader() as conn:
+                result = conn.execution_options(
+                    stream_results=True, yield_per=chunk_size
+                ).execute(_list_users_stmt(after))
+                keys = result.keys()
+                for partition in result.partitions():
+                    yield _rows_as_dicts(keys, partition)
+        except Exception:
+            logging.exception('iter_users_service')
+            raise
+
+
     @staticmethod
     def update_user_service(data: dict) -> dict:
         try:
@@ -137,72 +770,51 @@ class User:
             if 'User_ID' not in data or 'lng_User_ID' not in data:
                 return {'ErrorCode': 9997, 'Message': 'Missing User_ID or target ID'}
 
-            with engine.connect() as conn:
-                existing = conn.execute(
-                    select(tbl_User).where(tbl_User.c.lng_User_ID == data['lng_User_ID'])
-                ).fetchone()
-
-                if not existing or existing.bln_IsDeleted:
-                    return {'ErrorCode': 9996, 'Message': 'User not found'}
-
-                updates, errors = {}, {}
-
-                # First/Last name
-                if data.get('str_First_Name') and data['str_First_Name'] != existing.str_First_Name:
-                    updates['str_First_Name'] = data['str_First_Name']
-                if data.get('str_Last_Name') and data['str_Last_Name'] != existing.str_Last_Name:
-                    updates['str_Last_Name'] = data['str_Last_Name']
-                if 'str_First_Name' in updates or 'str_Last_Name' in updates:
-                    updates['str_Full_Name'] = (
-                        f"{updates.get('str_First_Name', existing.str_First_Name)} "
-                        f"{updates.get('str_Last_Name', existing.str_Last_Name)}"
-                    )
-
-                # Location
-                if data.get('str_Location') and data['str_Location'] != existing.str_Location:
-                    updates['str_Location'] = data['str_Location']
-
-                # Email
-                if data.get('str_Email') and data['str_Email'] != existing.str_Email:
-                    if not validate_email_domain(data['str_Email']):
-                        errors['str_Email'] = 'Invalid or unreachable domain'
-                    elif check_unique_value(tbl_User, 'str_Email', data['str_Email'], conn):
-                        return {'ErrorCode': 9997, 'Message': 'Email already exists'}
-                    else:
-                        updates['str_Email'] = data['str_Email']
-
-                # Password
-                if data.get('str_Password'):
-                    valid, msg = validate_password(data['str_Password'])
-                    if not valid:
-                        errors['str_Password'] = msg
-                    else:
-                        encrypted = encrypt_password(data['str_Password'])
-                        if encrypted and encrypted != existing.str_Password_hash:
-                            updates['str_Password_hash'] = encrypted
-
-                if errors:
-                    return {'ErrorCode': 9991, 'Message': f'Invalid fields: {errors}'}
-                if not updates:
-                    return {'ErrorCode': 9998, 'Message': 'No changes detected'}
-
-                updates.update({
-                    'lng_Modified_By':   data['User_ID'],
-                    'dte_Modified_Date': datetime.utcnow()
-                })
+            values, errors = _profile_update_values(data), {}
+
+            # Email
+            if data.get('str_Email'):
+                if not validate_email_domain(data['str_Email']):
+                    errors['str_Email'] = 'Invalid or unreachable domain'
+                else:
+                    values['str_Email'] = data['str_Email']
+
+            # Password
+            if data.get('str_Password'):
+                valid, msg = validate_password(data['str_Password'])
+                if not valid:
+                    errors['str_Password'] = msg
+                else:
+                    encrypted = hash_password(data['str_Password'])
+                    if encrypted:
+                        values['str_Password_hash'] = encrypted
+
+            if errors:
+                return {'ErrorCode': 9991, 'Message': f'Invalid fields: {errors}'}
+            if not values:
+                return {'ErrorCode': 9998, 'Message': 'No changes detected'}
+
+            # 2) One conditional UPDATE
+            stmt = _update_user_stmt(data['lng_User_ID'], data['User_ID'], values)
 
-                res = conn.execute(
-                    update(tbl_User)
-                    .where(tbl_User.c.lng_User_ID == data['lng_User_ID'])
-                    .values(**updates)
-                )
+            with engine.connect() as conn:
+                res = conn.execute(stmt)
                 conn.commit()
-
-            if res.rowcount == 0:
-                return {'ErrorCode': 9996, 'Message': 'User not found or already deleted'}
+                _invalidate_user(data['lng_User_ID'])
+                if 'str_Email' in values:
+                    read_router.note_write(_email_key(values['str_Email']))
+
+                if res.rowcount == 0:
+                    # Slow path only: tell "no such user" from "nothing changed"
+                    exists = conn.execute(_active_user_exists_stmt(data['lng_User_ID'])).fetchone()
+                    if not exists:
+                        return {'ErrorCode': 9996, 'Message': 'User not found'}
+                    return {'ErrorCode': 9998, 'Message': 'No changes detected'}
 
             return {'ErrorCode': 9999, 'Message': 'User updated successfully'}
 
+        except IntegrityError:
+            return {'ErrorCode': 9997, 'Message': 'Email already exists'}
         except SQLAlchemyError:
             logging.exception('update_user_service')
             return {'ErrorCode': 9998, 'Message': 'Database error'}
@@ -215,19 +827,9 @@ class User:
     def delete_user_service(user_id: int) -> dict:
         try:
             with engine.connect() as conn:
-                res = conn.execute(
-                    update(tbl_User)
-                    .where(
-                        tbl_User.c.lng_User_ID == user_id,
-                        tbl_User.c.bln_IsDeleted == False
-                    )
-                    .values(
-                        bln_IsDeleted=True,
-                        dte_Deleted_Date=datetime.utcnow(),
-                        lng_Deleted_By=user_id
-                    )
-                )
+                res = conn.execute(_delete_user_stmt(user_id))
                 conn.commit()
+            _invalidate_user(user_id)
 
             if res.rowcount == 0:
                 return {'ErrorCode': 9996, 'Message': 'User not found or already deleted'}
@@ -240,3 +842,61 @@ class User:
         except Exception:
             logging.exception('delete_user_service')
             return {'ErrorCode': 9998, 'Message': 'Internal error'}
+
+
+    @staticmethod
+    def authenticate_user(email: str, password: str):
+        """
+        lng_User_ID for valid credentials, else None. A hash made with an
+        older scheme or cost is replaced by a current one (best effort).
+        Database errors propagate to the caller.
+        """
+        with read_router.reader(_email_key(email)) as conn:
+            row = conn.execute(_login_user_stmt(email)).fetchone()
+
+        if not row:
+            password_hasher.dummy_verify(password)
+            return None
+        if not verify_password(password, row.str_Password_hash):
+            return None
+
+        if password_hasher.needs_rehash(row.str_Password_hash):
+            try:
+                new_hash = hash_password(password)
+                if new_hash:
+                    with engine.connect() as conn:
+                        conn.execute(_rehash_password_stmt(row.lng_User_ID, row.str_Password_hash, new_hash))
+                        conn.commit()
+            except SQLAlchemyError:
+                logging.exception('authenticate_user rehash')
+        return row.lng_User_ID
+
+
+    @staticmethod
+    def reset_password_service(email: str, password: str) -> dict:
+        try:
+            valid, msg = validate_password(password)
+            if not valid:
+                return {'ErrorCode': 9991, 'Message': msg}
+
+            hashed = hash_password(password)
+            if not hashed:
+                return {'ErrorCode': 9992, 'Message': 'Password encryption failed.'}
+
+            with engine.connect() as conn:
+                rows = conn.execute(_reset_password_stmt(email, hashed)).fetchall()
+                conn.commit()
+            for row in rows:
+                _invalidate_user(row.lng_User_ID)
+            read_router.note_write(_email_key(email))
+
+            if not rows:
+                return {'ErrorCode': 9996, 'Message': 'User not found'}
+            return {'ErrorCode': 9999, 'Message': 'Password reset successfully'}
+
+        except SQLAlchemyError:
+            logging.exception('reset_password_service')
+            return {'ErrorCode': 9998, 'Message': 'Database error'}
+        except Exception:
+            logging.exception('reset_password_service')
+            return {'ErrorCode': 9998, 'Message': 'Internal error'}
@@ -0,0 +1,168 @@
+# MODULE/USER/util/blocklist_util.py
+#
+# Breached-password blocklist: truncated SHA-1 digests, sorted, in one flat
+# file that every worker memory-maps read-only (the pages live once in the
+# OS page cache, not per process). Build it from a plaintext list or a
+# Have I Been Pwned "SHA1:count" dump:
+#     python -m MODULE.USER.util.blocklist_util passwords.txt -o breached.bin
+#     python -m MODULE.USER.util.blocklist_util pwned-passwords-sha1.txt --input-format sha1 -o breached.bin
+#
+# Layout: header (magic, digest width, count), a 256-entry fan-out table of
+# cumulative counts by first digest byte, then `count` sorted digests.
+
+import argparse
+import bisect
+import hashlib
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+
+MAGIC = b'SSBL\x00\x01'
+_HEADER = struct.Struct('<6sHQ')        # magic, digest width, count
+_FANOUT = struct.Struct('<256Q')        # entries with first byte <= i
+_DATA_OFFSET = _HEADER.size + _FANOUT.size
+DEFAULT_WIDTH = 8                       # 64-bit prefix: false positives ~ count / 2**64
+
+
+def password_digest(password: str) -> bytes:
+    return hashlib.sha1(password.encode('utf-8')).digest()
+
+
+class _Digests:
+    """Sequence view of the sorted records, for bisect."""
+
+    def __init__(self, buf, width: int):
+        self._buf = buf
+        self._width = width
+
+    def __getitem__(self, i: int) -> bytes:
+        start = _DATA_OFFSET + i * self._width
+        return self._buf[start:start + self._width]
+
+
+class PasswordBlocklist:
+    """
+    Read-only, memory-mapped blocklist. `password in blocklist` is a binary
+    search inside one fan-out bucket: O(log n), ~log2(n / 256) page reads.
+    """
+
+    def __init__(self, path: str):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.width, self.count = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            self._mm.close()
+            raise ValueError(f'{path} is not a password blocklist file')
+        if len(self._mm) != _DATA_OFFSET + self.count * self.width:
+            self._mm.close()
+            raise ValueError(f'{path} is truncated or corrupt')
+        self._fanout = _FANOUT.unpack_from(self._mm, _HEADER.size)
+        self._digests = _Digests(self._mm, self.width)
+        self.path = path
+
+    def contains_digest(self, digest: bytes) -> bool:
+        key = digest[:self.width]
+        first = key[0]
+        lo = self._fanout[first - 1] if first else 0
+        hi = self._fanout[first]
+        i = bisect.bisect_left(self._digests, key, lo, hi)
+        return i < hi and self._digests[i] == key
+
+    def __contains__(self, password: str) -> bool:
+        return self.contains_digest(password_digest(password))
+
+    def __len__(self) -> int:
+        return self.count
+
+    def close(self):
+        self._mm.close()
+
+
+def _parse_sha1_line(line: str):
+    # HIBP format "HEX40[:count]"; other lines are skipped
+    hex_digest = line.split(':', 1)[0].strip()
+    if len(hex_digest) != 40:
+        return None
+    try:
+        return bytes.fromhex(hex_digest)
+    except ValueError:
+        return None
+
+
+def build_blocklist(lines, out_path: str, input_format: str = 'plain', width: int = DEFAULT_WIDTH) -> int:
+    """
+    Compile passwords (or SHA-1 hex lines) into the blocklist format and
+    return the number of distinct entries. Digests are spilled into 256
+    bucket files by first byte, so only one bucket is sorted in memory at
+    a time; the output is written to a temp file and renamed into place.
+    """
+    if not 1 <= width <= 20:
+        raise ValueError('width must be between 1 and 20 bytes')
+    if input_format not in ('plain', 'sha1'):
+        raise ValueError(f'Unknown input format: {input_format}')
+
+    out_dir = os.path.dirname(os.path.abspath(out_path))
+    work_dir = tempfile.mkdtemp(prefix='blocklist-', dir=out_dir)
+    try:
+        buckets = [open(os.path.join(work_dir, f'{b:02x}'), 'wb', buffering=1 << 16) for b in range(256)]
+        try:
+            for line in lines:
+                if input_format == 'plain':
+                    password = line.rstrip('\r\n')
+                    if not password:
+                        continue
+                    # surrogateescape: hash undecodable lines as their original bytes
+                    digest = hashlib.sha1(password.encode('utf-8', 'surrogateescape')).digest()
+                else:
+                    digest = _parse_sha1_line(line)
+                    if digest is None:
+                        continue
+                buckets[digest[0]].write(digest[:width])
+        finally:
+            for f in buckets:
+                f.close()
+
+        fanout, total = [], 0
+        tmp_out = os.path.join(work_dir, 'out')
+        with open(tmp_out, 'wb') as out:
+            out.write(b'\x00' * _DATA_OFFSET)
+            for b in range(256):
+                with open(os.path.join(work_dir, f'{b:02x}'), 'rb') as f:
+                    raw = f.read()
+                records = sorted({raw[i:i + width] for i in range(0, len(raw), width)})
+                out.write(b''.join(records))
+                total += len(records)
+                fanout.append(total)
+            out.seek(0)
+            out.write(_HEADER.pack(MAGIC, width, total))
+            out.write(_FANOUT.pack(*fanout))
+        os.replace(tmp_out, out_path)
+        return total
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compile a breached-password list into a blocklist file.')
+    parser.add_argument('input', help="one password per line, or '-' for stdin")
+    parser.add_argument('-o', '--output', required=True)
+    parser.add_argument('--input-format', choices=('plain', 'sha1'), default='plain',
+                        help='plain passwords, or SHA-1 hex lines ("HEX[:count]", as in HIBP dumps)')
+    parser.add_argument('--width', type=int, default=DEFAULT_WIDTH, help='stored digest bytes (default 8)')
+    args = parser.parse_args(argv)
+
+    if args.input == '-':
+        source = open(sys.stdin.fileno(), encoding='utf-8', errors='surrogateescape', closefd=False)
+    else:
+        source = open(args.input, encoding='utf-8', errors='surrogateescape')
+    with source:
+        count = build_blocklist(source, args.output, args.input_format, args.width)
+    size = os.path.getsize(args.output)
+    print(f"Wrote {count} entries to {args.output} ({size / 1e6:.1f} MB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,182 @@
+import asyncio
+import logging
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from config import Config
+from MODULE.COMMON.util.cache_util import TTLCache
+
+
+class TransientLookupError(Exception):
+    """The resolver could not answer (timeout, SERVFAIL): says nothing about the domain."""
+
+
+# getaddrinfo errors that mean the domain really has no address (NXDOMAIN / NODATA)
+_DEFINITE_EAI = {getattr(socket, name) for name in ('EAI_NONAME', 'EAI_NODATA', 'EAI_ADDRFAMILY')
+                 if hasattr(socket, name)}
+
+
+class SocketResolver:
+    """
+    Resolves through the system resolver (getaddrinfo). True/False are
+    definite answers; resolver trouble raises TransientLookupError.
+    """
+
+    def resolve(self, domain: str) -> bool:
+        try:
+            socket.getaddrinfo(domain, None)
+            return True
+        except socket.gaierror as e:
+            if e.errno in _DEFINITE_EAI:
+                return False
+            raise TransientLookupError(f'{domain}: {e}') from e
+
+
+class StaticResolver:
+    """
+    Offline stand-in for tests and benchmarks: `domains` resolve, anything
+    else does not. With domains=None every domain resolves. `delay` simulates
+    resolver latency; `failing` domains raise TransientLookupError (SERVFAIL).
+    """
+
+    def __init__(self, domains=None, delay: float = 0.0, failing=()):
+        self.domains = None if domains is None else {d.lower() for d in domains}
+        self.delay = delay
+        self.failing = {d.lower() for d in failing}
+
+    def resolve(self, domain: str) -> bool:
+        if self.delay:
+            time.sleep(self.delay)
+        if domain in self.failing:
+            raise TransientLookupError(f'{domain}: SERVFAIL')
+        return self.domains is None or domain in self.domains
+
+
+class DomainResolutionCache:
+    """
+    Caches domain -> resolvable with separate positive/negative TTLs and an
+    LRU size bound. Each lookup gets a hard deadline; concurrent lookups of
+    the same domain share one resolver call. Only definite answers get the
+    negative TTL: a timeout or resolver error fails this lookup but is kept
+    for at most error_ttl seconds (0 = not cached).
+    """
+
+    def __init__(self, resolver=None, maxsize: int = 4096, positive_ttl: float = 3600.0,
+                 negative_ttl: float = 60.0, timeout: float = 2.0, max_workers: int = 4,
+                 error_ttl: float = 5.0):
+        self.resolver = resolver or SocketResolver()
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.error_ttl = error_ttl
+        self.timeout = timeout
+        self.timeouts = 0
+        self._cache = TTLCache(maxsize=maxsize, ttl=positive_ttl)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='dns')
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def is_resolvable(self, domain: str) -> bool:
+        cached = self._cache.get(domain)
+        if cached is not None:
+            return cached
+        return self._finish(domain, self._submit(domain), self.timeout)
+
+    async def is_resolvable_async(self, domain: str) -> bool:
+        """is_resolvable for the event loop: awaits the resolver thread instead of blocking."""
+        cached = self._cache.get(domain)
+        if cached is not None:
+            return cached
+        future = asyncio.wrap_future(self._submit(domain))
+        try:
+            ok = bool(await asyncio.wait_for(asyncio.shield(future), self.timeout))
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logging.warning(f"DNS lookup for {domain} exceeded {self.timeout}s")
+            return self._store_error(domain)
+        except TransientLookupError as e:
+            logging.warning(f"DNS lookup failed: {e}")
+            return self._store_error(domain)
+        except Exception:
+            logging.exception(f"DNS lookup for {domain} failed")
+            return self._store_error(domain)
+        return self._store(domain, ok)
+
+    def resolve_many(self, domains) -> dict:
+        """
+        Resolve distinct domains concurrently; the whole batch shares one
+        deadline. Returns {domain: resolvable}.
+        """
+        results, pending = {}, {}
+        for domain in set(domains):
+            cached = self._cache.get(domain)
+            if cached is not None:
+                results[domain] = cached
+            else:
+                pending[domain] = self._submit(domain)
+
+        deadline = time.monotonic() + self.timeout
+        for domain, future in pending.items():
+            results[domain] = self._finish(domain, future, max(0.0, deadline - time.monotonic()))
+        return results
+
+    def _submit(self, domain: str):
+        with self._lock:
+            future = self._inflight.get(domain)
+            if future is None:
+                future = self._executor.submit(self.resolver.resolve, domain)
+                self._inflight[domain] = future
+                future.add_done_callback(lambda _f, d=domain: self._inflight.pop(d, None))
+            return future
+
+    def _finish(self, domain: str, future, timeout: float) -> bool:
+        try:
+            ok = bool(future.result(timeout=timeout))
+        except FutureTimeout:
+            # The resolver thread is left to finish on its own; we just stop waiting
+            self.timeouts += 1
+            logging.warning(f"DNS lookup for {domain} exceeded {self.timeout}s")
+            return self._store_error(domain)
+        except TransientLookupError as e:
+            logging.warning(f"DNS lookup failed: {e}")
+            return self._store_error(domain)
+        except Exception:
+            logging.exception(f"DNS lookup for {domain} failed")
+            return self._store_error(domain)
+        return self._store(domain, ok)
+
+    def _store(self, domain: str, ok: bool) -> bool:
+        self._cache.set(domain, ok, ttl=self.positive_ttl if ok else self.negative_ttl)
+        return ok
+
+    def _store_error(self, domain: str) -> bool:
+        # Fails this lookup only; a short TTL keeps a struggling resolver from being hammered
+        if self.error_ttl > 0:
+            self._cache.set(domain, False, ttl=self.error_ttl)
+        return False
+
+    def set_resolver(self, resolver):
+        self.resolver = resolver
+        self._cache.clear()
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self) -> dict:
+        return {**self._cache.stats(), 'timeouts': self.timeouts}
+
+
+domain_cache = DomainResolutionCache(
+    maxsize=Config.DNS_CACHE_SIZE,
+    positive_ttl=Config.DNS_POSITIVE_TTL,
+    negative_ttl=Config.DNS_NEGATIVE_TTL,
+    timeout=Config.DNS_LOOKUP_TIMEOUT,
+    max_workers=Config.DNS_MAX_WORKERS,
+    error_ttl=Config.DNS_ERROR_TTL,
+)
+
+
+def set_resolver(resolver):
+    """Swap the resolver used by validate_email_domain (clears the cache)."""
+    domain_cache.set_resolver(resolver)
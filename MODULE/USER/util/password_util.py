@@ -0,0 +1,114 @@
+import base64
+import binascii
+import hashlib
+import hmac
+import logging
+import os
+
+import pyaes  # type: ignore
+from DB_CONNECTION.helper_file import keypass, iv
+
+# Stored format: $<algorithm>$<k=v,...>$<salt b64>$<hash b64>
+# Values without a leading "$" are legacy AES-CTR hex (verified, then rehashed on login).
+
+
+def _b64(raw: bytes) -> str:
+    return base64.b64encode(raw).decode('ascii').rstrip('=')
+
+
+def _unb64(text: str) -> bytes:
+    return base64.b64decode(text + '=' * (-len(text) % 4))
+
+
+class ScryptHasher:
+    """hashlib.scrypt (OpenSSL). Cost is N * r * 128 bytes of memory per hash."""
+
+    algorithm = 'scrypt'
+
+    def __init__(self, n: int = 2 ** 14, r: int = 8, p: int = 1, dklen: int = 32):
+        self.params = {'n': n, 'r': r, 'p': p}
+        self.dklen = dklen
+
+    def derive(self, password: str, salt: bytes, params: dict, dklen: int) -> bytes:
+        n, r, p = params['n'], params['r'], params['p']
+        return hashlib.scrypt(password.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+                              maxmem=256 * n * r + 1024 * 1024, dklen=dklen)
+
+
+class Pbkdf2Hasher:
+    """hashlib.pbkdf2_hmac with SHA-256 (OpenSSL)."""
+
+    algorithm = 'pbkdf2-sha256'
+
+    def __init__(self, iterations: int = 600000, dklen: int = 32):
+        self.params = {'i': iterations}
+        self.dklen = dklen
+
+    def derive(self, password: str, salt: bytes, params: dict, dklen: int) -> bytes:
+        return hashlib.pbkdf2_hmac('sha256', password.encode('utf-8'), salt, params['i'], dklen)
+
+
+def legacy_ctr_hex(password: str) -> str:
+    """The original encrypt_password value: AES-CTR with the fixed key/iv, hex encoded."""
+    aes = pyaes.AESModeOfOperationCTR(keypass, pyaes.Counter(iv))
+    return binascii.hexlify(aes.encrypt(password)).decode('utf-8')
+
+
+class PasswordHasher:
+    """
+    Hashes with `default`; verifies anything produced by `backends` or the
+    legacy CTR scheme. needs_rehash() is true for values not made with the
+    default backend at its current cost.
+    """
+
+    def __init__(self, default, backends=()):
+        self.default = default
+        self.backends = {b.algorithm: b for b in (default, *backends)}
+        self._dummy = None
+
+    def hash(self, password: str) -> str:
+        salt = os.urandom(16)
+        params = self.default.params
+        digest = self.default.derive(password, salt, params, self.default.dklen)
+        encoded = ','.join(f'{k}={v}' for k, v in params.items())
+        return f'${self.default.algorithm}${encoded}${_b64(salt)}${_b64(digest)}'
+
+    def verify(self, password: str, stored: str) -> bool:
+        if not stored:
+            return False
+        if not stored.startswith('$'):
+            # A CTR check takes microseconds; pay the default cost too so the
+            # login time does not tell which accounts still hold legacy values
+            self.dummy_verify(password)
+            return hmac.compare_digest(legacy_ctr_hex(password), stored)
+        try:
+            _, algorithm, encoded, salt, digest = stored.split('$')
+            backend = self.backends[algorithm]
+            params = {k: int(v) for k, v in (kv.split('=') for kv in encoded.split(','))}
+            expected = _unb64(digest)
+            actual = backend.derive(password, _unb64(salt), params, len(expected))
+        except (ValueError, KeyError):
+            logging.warning('PasswordHasher.verify: unrecognised hash format')
+            return False
+        return hmac.compare_digest(actual, expected)
+
+    def needs_rehash(self, stored: str) -> bool:
+        prefix = f'${self.default.algorithm}$' + ','.join(f'{k}={v}' for k, v in self.default.params.items()) + '$'
+        return not (stored or '').startswith(prefix)
+
+    def dummy_verify(self, password: str):
+        """Spend the same time as a real verify (unknown email, legacy value)."""
+        if self._dummy is None:
+            self._dummy = self.hash('dummy-password')
+        self.verify(password, self._dummy)
+
+
+def build_password_hasher(algorithm: str = 'scrypt', scrypt_n: int = 2 ** 14, scrypt_r: int = 8,
+                          scrypt_p: int = 1, pbkdf2_iterations: int = 600000) -> PasswordHasher:
+    scrypt = ScryptHasher(scrypt_n, scrypt_r, scrypt_p)
+    pbkdf2 = Pbkdf2Hasher(pbkdf2_iterations)
+    if algorithm == 'scrypt':
+        return PasswordHasher(scrypt, (pbkdf2,))
+    if algorithm == 'pbkdf2-sha256':
+        return PasswordHasher(pbkdf2, (scrypt,))
+    raise ValueError(f'Unknown PASSWORD_HASH_ALGORITHM: {algorithm}')
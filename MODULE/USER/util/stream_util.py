@@ -0,0 +1,83 @@
+import csv
+import io
+import json
+import zlib
+from datetime import date, datetime
+
+# format -> mimetype for streamed user listings
+STREAM_FORMATS = {
+    'json':   'application/json',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def _dumps(obj) -> str:
+    return json.dumps(obj, default=_json_default, separators=(',', ':'))
+
+
+def json_array_stream(chunks):
+    """
+    Encode chunks of dicts as one JSON array, one write per chunk. The
+    closing bracket is only written once `chunks` is exhausted: an error
+    propagates and leaves the array (and the chunked response) unterminated.
+    """
+    yield '['
+    first = True
+    for chunk in chunks:
+        if not chunk:
+            continue
+        body = ','.join(_dumps(row) for row in chunk)
+        yield body if first else ',' + body
+        first = False
+    yield ']'
+
+
+def ndjson_stream(chunks):
+    """Encode chunks of dicts as newline-delimited JSON, one write per chunk."""
+    for chunk in chunks:
+        if chunk:
+            yield ''.join(_dumps(row) + '\n' for row in chunk)
+
+
+def csv_stream(chunks, columns: list):
+    """Encode chunks of dicts as CSV with a header row, one write per chunk."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(columns)
+    yield buf.getvalue()
+    for chunk in chunks:
+        if not chunk:
+            continue
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows(
+            [v.isoformat() if isinstance(v, (datetime, date)) else v for v in (row[c] for c in columns)]
+            for row in chunk
+        )
+        yield buf.getvalue()
+
+
+def gzip_stream(pieces, level: int = 6):
+    """
+    Gzip a stream of str/bytes pieces incrementally. The trailer (CRC and
+    length) is only written after the last piece, so an error in `pieces`
+    leaves a gzip stream that fails to decompress.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)   # wbits 31 -> gzip container
+    for piece in pieces:
+        data = compressor.compress(piece.encode('utf-8') if isinstance(piece, str) else piece)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def encode_stream(chunks, fmt: str):
+    if fmt == 'ndjson':
+        return ndjson_stream(chunks)
+    return json_array_stream(chunks)
@@ -1,10 +1,22 @@
 import re
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from sqlalchemy import select
-import pyaes  # type: ignore
-import binascii
-from DB_CONNECTION.helper_file import keypass, iv
-import socket
+from config import Config
+from MODULE.USER.util.dns_util import domain_cache
+from MODULE.USER.util.password_util import build_password_hasher
+from MODULE.USER.util.blocklist_util import PasswordBlocklist
+
+password_hasher = build_password_hasher(
+    Config.PASSWORD_HASH_ALGORITHM,
+    scrypt_n=Config.PASSWORD_SCRYPT_N,
+    scrypt_r=Config.PASSWORD_SCRYPT_R,
+    scrypt_p=Config.PASSWORD_SCRYPT_P,
+    pbkdf2_iterations=Config.PASSWORD_PBKDF2_ITERATIONS
+)
+
+# Memory-mapped, so forked workers share one copy through the page cache
+password_blocklist = PasswordBlocklist(Config.PASSWORD_BLOCKLIST_PATH) if Config.PASSWORD_BLOCKLIST_PATH else None
 
 RESERVED_DOMAINS = {
     'example.com', 'example.net', 'example.org', 'localhost', 'test', 'invalid'
@@ -18,23 +30,37 @@ def validate_email_format(email):
         logging.exception(f"validate_email_format error: {e}")
         return False
 
+def email_domain(email: str):
+    """Lower-cased domain of a well-formed, non-reserved email, else None."""
+    if not isinstance(email, str) or not re.match(r"^[^@]+@[^@]+\.[^@]+$", email):
+        return None
+    domain = email.split('@')[-1].lower()
+    if domain in RESERVED_DOMAINS:
+        return None
+    return domain
+
 def validate_email_domain(email: str) -> bool:
     try:
-        # Validate email format first
-        if not re.match(r"^[^@]+@[^@]+\.[^@]+$", email):
+        domain = email_domain(email)
+        if domain is None:
             return False
 
-        domain = email.split('@')[-1].lower()
-        if domain in RESERVED_DOMAINS:
-            return False
-
-        # Check domain DNS resolution
-        socket.gethostbyname(domain)
-        return True
+        # Check domain DNS resolution (cached, time-bounded)
+        return domain_cache.is_resolvable(domain)
     except Exception as e:
         logging.exception(f"validate_email_domain error: {e}")
         return False
 
+async def validate_email_domain_async(email: str) -> bool:
+    try:
+        domain = email_domain(email)
+        if domain is None:
+            return False
+        return await domain_cache.is_resolvable_async(domain)
+    except Exception as e:
+        logging.exception(f"validate_email_domain_async error: {e}")
+        return False
+
 
 COMMON_WEAK_PASSWORDS = {
     "password", "123456", "12345678", "qwerty", "abc123",
@@ -49,6 +75,9 @@ def validate_password(password: str) -> tuple[bool, str]:
         if password.lower() in COMMON_WEAK_PASSWORDS:
             return False, "Password is too common. Choose a stronger password."
         
+        if password_blocklist is not None and password in password_blocklist:
+            return False, "Password has appeared in a data breach. Choose a different password."
+        
         if not re.search(r"[A-Z]", password):
             return False, "Password must include at least one uppercase letter."
         
@@ -72,7 +101,7 @@ def check_unique_value(table, column: str, value, connection):
             select(table.c[column])
             .where(
                 (table.c[column] == value) &
-                (table.c.bln_IsDeleted != True)
+                (table.c.bln_IsDeleted == False)
             )
         )
         name_check_data = connection.execute(name_check_stmt).fetchone()
@@ -81,13 +110,32 @@ def check_unique_value(table, column: str, value, connection):
         logging.exception(f"check_unique_value error: {e}")
         return False
 
-def encrypt_password(password: str):
+def hash_password(password: str):
     try:
-        plaintext = password
-        aes = pyaes.AESModeOfOperationCTR(keypass, pyaes.Counter(iv))
-        ciphertext = aes.encrypt(plaintext)
-        encrypted = binascii.hexlify(ciphertext).decode("utf-8")
-        return encrypted
+        return password_hasher.hash(password)
     except Exception as e:
-        logging.exception(f"encrypt_password error: {e}")
+        logging.exception(f"hash_password error: {e}")
         return None
+
+def verify_password(password: str, stored: str) -> bool:
+    try:
+        return password_hasher.verify(password, stored)
+    except Exception as e:
+        logging.exception(f"verify_password error: {e}")
+        return False
+
+
+_hash_pool = None
+
+def hash_passwords(passwords: list) -> list:
+    """
+    hash_password over a batch, spread across BULK_HASH_WORKERS processes
+    (the pool is created on first use, i.e. after the server has forked).
+    """
+    global _hash_pool
+    if Config.BULK_HASH_WORKERS <= 1 or len(passwords) < 2 * Config.BULK_HASH_WORKERS:
+        return [hash_password(p) for p in passwords]
+    if _hash_pool is None:
+        _hash_pool = ProcessPoolExecutor(max_workers=Config.BULK_HASH_WORKERS)
+    chunksize = max(1, len(passwords) // (4 * Config.BULK_HASH_WORKERS))
+    return list(_hash_pool.map(hash_password, passwords, chunksize=chunksize))
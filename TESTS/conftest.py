@@ -0,0 +1,56 @@
+# TESTS/conftest.py
+#
+# Runs the suite against a throwaway SQLite file with offline stand-ins for
+# DNS and mail. The environment is set before anything imports config.py.
+#     python -m pytest -q
+
+import os
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix='signspell-tests-')
+os.environ.update({
+    'DATABASE_URL':         f'sqlite:///{_tmp}/test.db',
+    'SECRET_KEY':           'test-secret-key-' + 'x' * 32,
+    'MAIL_BACKEND':         'memory',
+    'RATE_LIMIT_ENABLED':   'false',
+    'JOBS_WORKER_ENABLED':  'false',
+})
+
+import itertools
+
+import pytest
+
+from CREATE_DB_CODE.migrations import run_migrations
+from MODULE.USER.util.dns_util import set_resolver, StaticResolver
+
+PASSWORD = 'Str0ng!Passw0rd#x'
+_emails = itertools.count(1)
+
+
+@pytest.fixture(scope='session', autouse=True)
+def database():
+    run_migrations()
+    set_resolver(StaticResolver())
+
+
+@pytest.fixture(autouse=True)
+def empty_user_cache():
+    from MODULE.USER.service.user_service import user_cache
+    if user_cache is not None:
+        user_cache.clear()
+
+
+@pytest.fixture
+def make_user():
+    """Signs up a new user; returns (user id, email)."""
+    from MODULE.USER.service.user_service import User, _login_user_stmt
+    from DB_CONNECTION.config import engine
+
+    def make(**fields):
+        email = fields.pop('str_Email', f'user{next(_emails)}@signspell.io')
+        data = {'str_First_Name': 'Test', 'str_Last_Name': 'User', 'str_Location': 'Chennai',
+                'str_Email': email, 'str_Password': PASSWORD, 'User_ID': 0, **fields}
+        assert User.save_user_service(data)['ErrorCode'] == 9999
+        with engine.connect() as conn:
+            return conn.execute(_login_user_stmt(email)).fetchone().lng_User_ID, email
+    return make
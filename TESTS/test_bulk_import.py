@@ -0,0 +1,103 @@
+# POST /users/bulk queues outbox jobs; GET /users/bulk/<id> reports them.
+
+import time
+
+import pytest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import delete
+
+from app import create_app
+from config import Config
+from CREATE_DB_CODE.tables_creation import tbl_Outbox
+from DB_CONNECTION.config import engine
+from DB_CONNECTION.query_counter import count_queries
+from MODULE.JOBS.service.worker_service import build_job_worker
+from MODULE.JOBS.util.mail_util import MemoryMailer
+from MODULE.USER.service.user_service import User
+from conftest import PASSWORD
+
+
+@pytest.fixture
+def client(monkeypatch):
+    with engine.begin() as conn:
+        conn.execute(delete(tbl_Outbox))
+    monkeypatch.setattr(Config, 'BULK_JOB_ROWS', 2)
+    app = create_app(start_jobs=False)
+    with app.app_context():
+        token = create_access_token(identity='1')
+    client = app.test_client()
+    client.environ_base['HTTP_AUTHORIZATION'] = f'Bearer {token}'
+    return client
+
+
+def _rows(prefix: str, n: int) -> list:
+    return [{'str_First_Name': 'Bulk', 'str_Last_Name': f'Row{i}', 'str_Location': 'Chennai',
+             'str_Email': f'{prefix}{i}@signspell.io', 'str_Password': PASSWORD} for i in range(n)]
+
+
+def _wait_for_status(client, url, status, timeout: float = 10.0) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        body = client.get(url).get_json()
+        if body['Status'] == status:
+            return body
+        assert time.monotonic() < deadline, body
+        time.sleep(0.05)
+
+
+def test_upload_is_queued_then_imported(client, make_user):
+    _, taken = make_user()
+    rows = _rows('bulk-job', 4) + [{**_rows('x', 1)[0], 'str_Email': taken}, {'str_Email': 'missing@signspell.io'}]
+
+    response = client.post('/users/bulk', json=rows)
+    assert response.status_code == 202
+    queued = response.get_json()
+    assert queued['Jobs'] == 3 and queued['Rows'] == 6
+    assert response.headers['Location'] == queued['Status_URL']
+    assert client.get(queued['Status_URL']).get_json()['Status'] == 'pending'
+
+    worker = build_job_worker(MemoryMailer())
+    worker.poll_seconds = 0.05
+    worker.start()
+    try:
+        report = _wait_for_status(client, queued['Status_URL'], 'done')
+    finally:
+        worker.stop()
+    assert report['Jobs_Done'] == 3
+    assert (report['Inserted'], report['Failed']) == (4, 2)
+    assert [r['Row'] for r in report['Results']] == list(range(6))
+    assert [r['ErrorCode'] for r in report['Results']] == [9999] * 4 + [9997, 9997]
+
+
+def test_dead_chunk_is_reported_per_row(client):
+    queued = client.post('/users/bulk', json=_rows('bulk-dead', 3)).get_json()
+
+    def broken(payload, idempotency_key):
+        raise ConnectionError('database went away')
+    worker = build_job_worker(MemoryMailer())
+    worker.handlers['bulk_import'] = broken
+    worker.poll_seconds, worker.max_attempts = 0.05, 1
+    worker.start()
+    try:
+        report = _wait_for_status(client, queued['Status_URL'], 'failed')
+    finally:
+        worker.stop()
+    assert [r['Row'] for r in report['Results']] == [0, 1, 2]
+    assert all('database went away' in r['Message'] for r in report['Results'])
+
+
+def test_unknown_import_and_oversized_upload(client, monkeypatch):
+    assert client.get('/users/bulk/0123456789abcdef').status_code == 404
+    monkeypatch.setattr(Config, 'BULK_IMPORT_MAX_ROWS', 2)
+    assert client.post('/users/bulk', json=_rows('bulk-big', 3)).status_code == 400
+
+
+def test_chunk_queries_do_not_grow_per_row(make_user):
+    _, taken = make_user()
+    rows = _rows('bulk-queries', 4) + [{**_rows('bulk-taken', 1)[0], 'str_Email': taken}]
+    with count_queries() as q:
+        result = User.bulk_save_users_service(rows, created_by=0)
+    codes = [row['ErrorCode'] for row in result['Results']]
+    assert codes == [9999] * 4 + [9997]
+    # One uniqueness query for the chunk, one executemany insert
+    assert q.count == 2
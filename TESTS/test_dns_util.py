@@ -0,0 +1,122 @@
+# DomainResolutionCache with the offline StaticResolver.
+
+import asyncio
+import socket
+import time
+
+import pytest
+
+from MODULE.USER.util.dns_util import (
+    DomainResolutionCache, SocketResolver, StaticResolver, TransientLookupError
+)
+
+
+class CountingResolver(StaticResolver):
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.calls = []
+
+    def resolve(self, domain: str) -> bool:
+        self.calls.append(domain)
+        return super().resolve(domain)
+
+
+def _cache(resolver, **kwargs):
+    return DomainResolutionCache(resolver, **{'timeout': 0.5, 'error_ttl': 0, **kwargs})
+
+
+def test_answers_are_cached():
+    resolver = CountingResolver(['signspell.io'])
+    cache = _cache(resolver)
+    assert [cache.is_resolvable('signspell.io') for _ in range(3)] == [True] * 3
+    assert [cache.is_resolvable('no-such-domain.io') for _ in range(3)] == [False] * 3
+    assert resolver.calls == ['signspell.io', 'no-such-domain.io']
+    assert cache.stats()['hits'] == 4
+
+
+def test_negative_answers_expire():
+    resolver = CountingResolver([])
+    cache = _cache(resolver, negative_ttl=0.05)
+    assert not cache.is_resolvable('late.io')
+    resolver.domains.add('late.io')
+    assert not cache.is_resolvable('late.io')
+    time.sleep(0.1)
+    assert cache.is_resolvable('late.io')
+
+
+def test_resolver_failure_is_not_negative_cached():
+    resolver = CountingResolver(['flaky.io'], failing=['flaky.io'])
+    cache = _cache(resolver)
+    assert not cache.is_resolvable('flaky.io')
+    resolver.failing.clear()
+    assert cache.is_resolvable('flaky.io')
+    assert resolver.calls == ['flaky.io', 'flaky.io']
+
+
+def test_resolver_failure_cached_for_error_ttl_only():
+    resolver = CountingResolver(['flaky.io'], failing=['flaky.io'])
+    cache = _cache(resolver, error_ttl=0.05)
+    assert not cache.is_resolvable('flaky.io')
+    resolver.failing.clear()
+    assert not cache.is_resolvable('flaky.io')
+    time.sleep(0.1)
+    assert cache.is_resolvable('flaky.io')
+
+
+def test_timeout_is_not_negative_cached():
+    resolver = CountingResolver(delay=0.3)
+    cache = _cache(resolver, timeout=0.05)
+    started = time.perf_counter()
+    assert not cache.is_resolvable('slow.io')
+    assert time.perf_counter() - started < 0.25
+    assert cache.stats()['timeouts'] == 1
+    time.sleep(0.35)
+    resolver.delay = 0
+    assert cache.is_resolvable('slow.io')
+
+
+def test_resolve_many_looks_each_domain_up_once():
+    resolver = CountingResolver(['a.io', 'b.io'], delay=0.05)
+    cache = _cache(resolver)
+    result = cache.resolve_many(['a.io', 'b.io', 'a.io', 'c.io'])
+    assert result == {'a.io': True, 'b.io': True, 'c.io': False}
+    assert sorted(resolver.calls) == ['a.io', 'b.io', 'c.io']
+
+
+def test_size_bound_evicts_least_recently_used():
+    resolver = CountingResolver()
+    cache = _cache(resolver, maxsize=2)
+    for domain in ('a.io', 'b.io', 'a.io', 'c.io', 'a.io', 'b.io'):
+        cache.is_resolvable(domain)
+    assert resolver.calls == ['a.io', 'b.io', 'c.io', 'b.io']
+    assert cache.stats()['evictions'] == 2
+
+
+def test_async_lookup_shares_the_cache():
+    resolver = CountingResolver(['signspell.io'], failing=['flaky.io'])
+    cache = _cache(resolver)
+
+    async def lookups():
+        return [await cache.is_resolvable_async(d) for d in ('signspell.io', 'signspell.io', 'flaky.io')]
+
+    assert asyncio.run(lookups()) == [True, True, False]
+    assert cache.is_resolvable('signspell.io')
+    assert resolver.calls == ['signspell.io', 'flaky.io']
+
+
+@pytest.mark.parametrize('code, answer', [
+    (socket.EAI_NONAME, False),
+    (socket.EAI_AGAIN, TransientLookupError),
+    (socket.EAI_FAIL, TransientLookupError),
+])
+def test_socket_resolver_tells_nxdomain_from_failure(monkeypatch, code, answer):
+    def getaddrinfo(*_args):
+        raise socket.gaierror(code, 'lookup failed')
+    monkeypatch.setattr(socket, 'getaddrinfo', getaddrinfo)
+
+    if answer is False:
+        assert SocketResolver().resolve('example.invalid') is False
+    else:
+        with pytest.raises(answer):
+            SocketResolver().resolve('example.invalid')
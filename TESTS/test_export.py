@@ -0,0 +1,27 @@
+# GET /users/export filters.
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from CREATE_DB_CODE.tables_creation import tbl_User
+from DB_CONNECTION.config import engine
+from MODULE.USER.service.export_service import iter_export_rows
+
+
+def _set_changed(user_id, when):
+    with engine.begin() as conn:
+        conn.execute(update(tbl_User).where(tbl_User.c.lng_User_ID == user_id).values(dte_Changed_Date=when))
+
+
+def test_modified_since_uses_the_change_time(make_user):
+    old_id, _ = make_user()
+    new_id, _ = make_user()
+    since = datetime.now() - timedelta(days=1)
+    _set_changed(old_id, since - timedelta(days=30))
+    _set_changed(new_id, since + timedelta(hours=1))
+
+    ids = {row['lng_User_ID'] for chunk in iter_export_rows(['lng_User_ID'], since) for row in chunk}
+    assert new_id in ids
+    assert old_id not in ids
+
@@ -0,0 +1,39 @@
+# Request/SQL metrics and access to GET /metrics.
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from config import Config
+from DB_CONNECTION.config import engine
+
+
+def _client(**settings):
+    config = type('TestConfig', (Config,), {'METRICS_ENABLED': True, **settings})
+    return create_app(config, start_jobs=False).test_client()
+
+
+def test_metrics_needs_the_token():
+    client = _client(METRICS_TOKEN='scrape-secret')
+    assert client.get('/metrics').status_code == 401
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 401
+    response = client.get('/metrics', headers={'Authorization': 'Bearer scrape-secret'})
+    assert response.status_code == 200
+    assert b'http_requests_total' in response.data
+
+
+def test_metrics_hidden_without_a_token():
+    assert _client(METRICS_TOKEN='').get('/metrics').status_code == 404
+    assert _client(METRICS_TOKEN='', METRICS_PUBLIC=True).get('/metrics').status_code == 200
+
+
+def test_failed_statement_leaves_no_timer_behind():
+    _client()
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text('SELECT * FROM "no_such_table"'))
+            conn.rollback()
+        conn.execute(text('SELECT 1'))
+        assert conn.info.get('query_start') == []
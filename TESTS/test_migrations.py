@@ -0,0 +1,45 @@
+# Migration runner on fresh SQLite files.
+
+from sqlalchemy import create_engine, inspect, text
+
+from CREATE_DB_CODE.migrations import MIGRATIONS, run_migrations, _m001_baseline
+from DB_CONNECTION.config import metadata
+
+
+def _schema(bind, ddl: bool = False) -> dict:
+    """
+    table -> (column names, index names, or with ddl=True index DDL);
+    sqlite_master also lists expression indexes.
+    """
+    inspector = inspect(bind)
+    with bind.connect() as conn:
+        indexes = conn.execute(text(
+            "SELECT tbl_name, name, replace(sql, ' IF NOT EXISTS', '') FROM sqlite_master "
+            "WHERE type = 'index' AND sql IS NOT NULL"
+        )).all()
+    return {
+        table: ({c['name'] for c in inspector.get_columns(table)},
+                {sql if ddl else name for tbl, name, sql in indexes if tbl == table})
+        for table in inspector.get_table_names() if table != 'tbl_Schema_Version'
+    }
+
+
+def test_baseline_is_the_original_schema(tmp_path):
+    bind = create_engine(f'sqlite:///{tmp_path}/baseline.db')
+    with bind.begin() as conn:
+        _m001_baseline(conn)
+    schema = _schema(bind)
+    assert set(schema) == {'tbl_User', 'tbl_Revoked_Token'}
+    assert 'dte_Changed_Date' not in schema['tbl_User'][0]
+    assert schema['tbl_User'][1] == set()
+    assert schema['tbl_Revoked_Token'][1] == {'IX_Revoked_Token_Expires'}
+
+
+def test_fresh_database_matches_the_models(tmp_path):
+    migrated = create_engine(f'sqlite:///{tmp_path}/migrated.db')
+    assert run_migrations(migrated) == [version for version, _, _ in MIGRATIONS]
+    assert run_migrations(migrated) == []
+
+    expected = create_engine(f'sqlite:///{tmp_path}/expected.db')
+    metadata.create_all(expected)
+    assert _schema(migrated, ddl=True) == _schema(expected, ddl=True)
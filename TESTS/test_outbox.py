@@ -0,0 +1,82 @@
+# Outbox + JobWorker delivering to the offline MemoryMailer.
+
+import time
+
+import pytest
+from sqlalchemy import delete
+
+from CREATE_DB_CODE.tables_creation import tbl_Outbox
+from DB_CONNECTION.config import engine
+from MODULE.JOBS.service.outbox_service import Outbox
+from MODULE.JOBS.service.worker_service import JobWorker, build_job_worker
+from MODULE.JOBS.util.mail_util import MemoryMailer
+
+
+@pytest.fixture(autouse=True)
+def empty_outbox():
+    with engine.begin() as conn:
+        conn.execute(delete(tbl_Outbox))
+
+
+@pytest.fixture
+def run_worker():
+    workers = []
+
+    def run(worker):
+        workers.append(worker)
+        worker.start()
+        return worker
+    yield run
+    for worker in workers:
+        worker.stop()
+
+
+def _wait_for(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.02)
+
+
+def test_enqueue_is_idempotent():
+    first = Outbox.enqueue('send_email', {'to': 'a@signspell.io'}, 'key-1')
+    again = Outbox.enqueue('send_email', {'to': 'a@signspell.io'}, 'key-1')
+    assert first['ErrorCode'] == again['ErrorCode'] == 9999
+    assert not first['Duplicate'] and again['Duplicate']
+    assert Outbox.stats()['pending'] == 1
+
+
+def test_forgot_password_mail_is_delivered(make_user, run_worker):
+    from app import create_app
+    _, email = make_user()
+    mailer = MemoryMailer()
+    run_worker(build_job_worker(mailer))
+
+    client = create_app(start_jobs=False).test_client()
+    response = client.post('/auth/forgot', json={'str_Email': email})
+    assert response.status_code == 200
+
+    _wait_for(lambda: mailer.sent)
+    msg = mailer.sent[0]
+    assert msg['To'] == email
+    assert '/auth/reset/' in msg.get_content()
+    _wait_for(lambda: Outbox.stats()['done'] == 1)
+
+
+def test_failing_job_is_retried_then_dead_lettered(run_worker):
+    calls = []
+
+    def flaky(payload, idempotency_key):
+        calls.append(idempotency_key)
+        raise ConnectionError('relay down')
+
+    worker = run_worker(JobWorker({'flaky': flaky}, threads=1, poll_seconds=0.05,
+                                  max_attempts=3, backoff_base=0.01, backoff_max=0.05))
+    Outbox.enqueue('flaky', {}, 'flaky-1')
+    _wait_for(lambda: Outbox.stats()['dead'] == 1)
+    assert calls == ['flaky-1'] * 3
+
+    worker.handlers['flaky'] = lambda payload, idempotency_key: None
+    assert Outbox.requeue_dead('flaky') == 1
+    worker.wake()
+    _wait_for(lambda: Outbox.stats()['done'] == 1)
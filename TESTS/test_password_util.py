@@ -0,0 +1,33 @@
+# PasswordHasher: formats, rehash detection and the legacy CTR path.
+
+from MODULE.USER.util.password_util import build_password_hasher, legacy_ctr_hex
+
+
+def test_hash_and_verify():
+    hasher = build_password_hasher(scrypt_n=2 ** 10)
+    stored = hasher.hash('Str0ng!Passw0rd#x')
+    assert stored.startswith('$scrypt$n=1024,r=8,p=1$')
+    assert hasher.verify('Str0ng!Passw0rd#x', stored)
+    assert not hasher.verify('wrong', stored)
+    assert not hasher.needs_rehash(stored)
+    assert build_password_hasher(scrypt_n=2 ** 11).needs_rehash(stored)
+
+
+def test_other_backend_verifies_and_needs_rehash():
+    stored = build_password_hasher('pbkdf2-sha256', pbkdf2_iterations=1000).hash('secret')
+    hasher = build_password_hasher(scrypt_n=2 ** 10)
+    assert hasher.verify('secret', stored)
+    assert hasher.needs_rehash(stored)
+
+
+def test_legacy_value_costs_a_full_verify(monkeypatch):
+    hasher = build_password_hasher(scrypt_n=2 ** 10)
+    dummies = []
+    original = hasher.dummy_verify
+    monkeypatch.setattr(hasher, 'dummy_verify', lambda password: dummies.append(original(password)))
+
+    stored = legacy_ctr_hex('Str0ng!Passw0rd#x')
+    assert hasher.verify('Str0ng!Passw0rd#x', stored)
+    assert not hasher.verify('wrong', stored)
+    assert len(dummies) == 2
+    assert hasher.needs_rehash(stored)
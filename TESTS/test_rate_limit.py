@@ -0,0 +1,45 @@
+# Per-IP auth rate limits behind a proxy.
+
+import logging
+
+import pytest
+
+import routes.auth
+from app import create_app
+from config import Config
+from MODULE.AUTH.util import rate_limit_util
+from MODULE.AUTH.util.rate_limit_util import AuthRateLimiter, client_ip
+
+
+def test_client_ip_takes_the_entry_added_by_the_trusted_proxy():
+    assert client_ip('10.0.0.1', 'spoofed, 203.0.113.7', 1) == '203.0.113.7'
+    assert client_ip('10.0.0.1', 'spoofed, 203.0.113.7, 10.0.0.2', 2) == '203.0.113.7'
+    assert client_ip('10.0.0.1', None, 1) == '10.0.0.1'
+    assert client_ip('10.0.0.1', '203.0.113.7', 0) == '10.0.0.1'
+
+
+def test_forwarded_header_without_trusted_proxies_warns_once(monkeypatch, caplog):
+    monkeypatch.setattr(rate_limit_util, '_warned_untrusted_forwarding', False)
+    with caplog.at_level(logging.WARNING):
+        client_ip('10.0.0.1', '203.0.113.7', 0)
+        client_ip('10.0.0.1', '203.0.113.8', 0)
+    warnings = [r for r in caplog.records if 'TRUSTED_PROXY_COUNT=0' in r.getMessage()]
+    assert len(warnings) == 1
+
+
+@pytest.fixture
+def proxied_client(monkeypatch):
+    monkeypatch.setattr(routes.auth, 'AUTH_LIMITER', AuthRateLimiter({'login': {'ip': '2/minute'}}))
+    monkeypatch.setattr(Config, 'TRUSTED_PROXY_COUNT', 1)
+    return create_app(start_jobs=False).test_client()
+
+
+def test_forwarded_clients_get_separate_buckets(proxied_client):
+    def login(forwarded_for):
+        return proxied_client.post('/auth/login', environ_base={'REMOTE_ADDR': '10.0.0.1'},
+                                   headers={'X-Forwarded-For': forwarded_for},
+                                   json={'str_Email': 'nobody@signspell.io', 'str_Password': 'wrong'})
+
+    assert [login('203.0.113.7').status_code for _ in range(3)][-1] == 429
+    assert login('203.0.113.8').status_code != 429
+    assert login('spoofed, 203.0.113.7').status_code == 429
@@ -0,0 +1,128 @@
+# Read routing with two local SQLite files: the test database as primary
+# and a snapshot of it as the replica.
+
+import sqlite3
+
+import pytest
+from flask import Flask
+from sqlalchemy import create_engine, update
+
+from CREATE_DB_CODE.tables_creation import tbl_User
+from DB_CONNECTION.config import engine
+from DB_CONNECTION.query_counter import count_queries
+from config import Config
+from DB_CONNECTION.replica import ReplicaRouter, init_replica_routing, RYW_COOKIE, RYW_HEADER
+from MODULE.USER.service import user_service
+from MODULE.USER.service.user_service import User, user_cache
+from conftest import PASSWORD
+
+
+def _snapshot(path) -> str:
+    src, dst = sqlite3.connect(engine.url.database), sqlite3.connect(path)
+    try:
+        src.backup(dst)
+    finally:
+        src.close()
+        dst.close()
+    return f'sqlite:///{path}'
+
+
+@pytest.fixture
+def use_replica(tmp_path, monkeypatch):
+    """Routes user_service reads to a snapshot of the test database taken now."""
+    engines = []
+
+    def use(**kwargs):
+        replica = create_engine(_snapshot(tmp_path / f'replica{len(engines)}.db'))
+        engines.append(replica)
+        router = ReplicaRouter(engine, [replica], **kwargs)
+        monkeypatch.setattr(user_service, 'read_router', router)
+        return router
+    yield use
+    for replica in engines:
+        replica.dispose()
+
+
+def _set_location(user_id, location):
+    with engine.begin() as conn:
+        conn.execute(update(tbl_User).where(tbl_User.c.lng_User_ID == user_id).values(str_Location=location))
+
+
+def test_reads_go_to_the_replica(make_user, use_replica):
+    user_id, _ = make_user(str_Location='Before')
+    router = use_replica()
+    _set_location(user_id, 'Primary only')
+
+    with count_queries(router.replicas[0]) as on_replica, count_queries(engine) as on_primary:
+        details = User.get_user_details(user_id)
+        page = User.list_users_service(limit=1000)
+    assert details['User Details']['str_Location'] == 'Before'
+    assert user_id in {u['lng_User_ID'] for u in page['Users']}
+    assert (on_replica.count, on_primary.count) == (2, 0)
+    assert router.stats()['reads_replica'] == 2
+
+
+def test_new_user_can_log_in_before_the_replica_has_them(use_replica, make_user):
+    use_replica(read_your_writes_seconds=60)
+    user_id, email = make_user()
+    assert User.authenticate_user(email, PASSWORD) == user_id
+    assert User.get_user_details(user_id)['ErrorCode'] == 9999
+
+
+def test_update_pins_the_user_to_the_primary(make_user, use_replica):
+    user_id, _ = make_user(str_Location='Before')
+    other_id, _ = make_user(str_Location='Before')
+    router = use_replica(read_your_writes_seconds=60)
+
+    User.update_user_service({'User_ID': user_id, 'lng_User_ID': user_id, 'str_Location': 'After'})
+    _set_location(other_id, 'After')
+    user_cache.clear()
+    assert User.get_user_details(user_id)['User Details']['str_Location'] == 'After'
+    assert User.get_user_details(other_id)['User Details']['str_Location'] == 'Before'
+    assert router.stats()['reads_pinned'] == 1
+
+
+def test_unreachable_replica_falls_back_to_the_primary(make_user, tmp_path, monkeypatch):
+    user_id, _ = make_user()
+    missing = create_engine(f'sqlite:///{tmp_path}/no-such-dir/replica.db')
+    router = ReplicaRouter(engine, [missing], retry_seconds=60)
+    monkeypatch.setattr(user_service, 'read_router', router)
+
+    assert User.get_user_details(user_id)['ErrorCode'] == 9999
+    assert User.list_users_service(limit=1)['ErrorCode'] == 9999
+    stats = router.stats()
+    assert stats['replicas_down'] == 1
+    assert stats['reads_fallback'] == 2
+    assert router.check()[0]['up'] is False
+
+
+def _worker(router):
+    """A minimal app standing in for one gunicorn worker with its own router."""
+    app = Flask(__name__)
+    app.config['SECRET_KEY'] = Config.SECRET_KEY
+    init_replica_routing(app, router)
+
+    @app.post('/write')
+    def write():
+        router.note_write('user:1')
+        return {}
+
+    @app.get('/read')
+    def read():
+        with router.reader('user:1') as conn:
+            return {'primary': conn.engine is router.primary}
+    return app.test_client()
+
+
+def test_write_pins_the_client_on_another_worker(use_replica):
+    worker_a = _worker(use_replica(read_your_writes_seconds=60))
+    worker_b = _worker(use_replica(read_your_writes_seconds=60))
+
+    token = worker_a.post('/write').headers[RYW_HEADER]
+    assert worker_b.get('/read').json == {'primary': False}
+    assert worker_b.get('/read', headers={RYW_HEADER: token}).json == {'primary': True}
+
+    worker_b.set_cookie(RYW_COOKIE, token)
+    assert worker_b.get('/read').json == {'primary': True}
+    worker_b.set_cookie(RYW_COOKIE, token + 'x')
+    assert worker_b.get('/read').json == {'primary': False}
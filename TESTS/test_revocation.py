@@ -0,0 +1,93 @@
+# DatabaseRevocationStore: Bloom filter refresh and its failure mode.
+
+import threading
+import time
+import uuid
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+
+from CREATE_DB_CODE.tables_creation import tbl_Revoked_Token
+from DB_CONNECTION.config import engine
+
+from MODULE.AUTH.util import revocation_util
+from MODULE.AUTH.util.revocation_util import DatabaseRevocationStore
+
+
+def _jti() -> str:
+    return uuid.uuid4().hex
+
+
+def _exp() -> int:
+    return int(time.time()) + 3600
+
+
+def _wait_for(predicate, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.01)
+
+
+def test_revocation_is_shared_between_stores():
+    here, there = DatabaseRevocationStore(), DatabaseRevocationStore()
+    here.refresh()
+    there.refresh()
+    jti = _jti()
+    there.revoke(jti, _exp())
+    assert there.is_revoked(jti)
+    # A filter hit or not, `here` has to agree after its next refresh
+    here.refresh()
+    assert here.is_revoked(jti)
+    assert not here.is_revoked(_jti())
+
+
+def test_incremental_refresh_reads_recent_revocations_only():
+    store = DatabaseRevocationStore()
+    store.refresh()
+    recent, old = _jti(), _jti()
+    DatabaseRevocationStore().revoke(recent, _exp())
+    with engine.begin() as conn:
+        conn.execute(insert(tbl_Revoked_Token).values(
+            str_Jti=old, dte_Expires=datetime.utcnow() + timedelta(hours=1),
+            dte_Revoked_Date=datetime.utcnow() - timedelta(hours=1)))
+
+    store.refresh()
+    assert recent in store._filter and old not in store._filter
+    store._next_rebuild = 0.0
+    store.refresh()
+    assert old in store._filter
+
+
+def test_refresh_runs_off_the_request_thread(monkeypatch):
+    store = DatabaseRevocationStore(refresh_interval=0.05)
+    threads = []
+    monkeypatch.setattr(store, 'refresh', lambda: threads.append(threading.current_thread()))
+    store.is_revoked(_jti())
+    _wait_for(lambda: threads)
+    assert threads[0] is not threading.current_thread()
+
+
+def test_failed_refresh_falls_back_to_the_database(monkeypatch):
+    store = DatabaseRevocationStore(refresh_interval=0.01, max_staleness=0.05)
+    store.refresh()
+    jti = _jti()
+    DatabaseRevocationStore().revoke(jti, _exp())   # another worker
+
+    # refresh() logs and keeps the old filter when the database is unavailable
+    monkeypatch.setattr(store, 'refresh', lambda: None)
+    time.sleep(0.06)
+    assert store.is_revoked(jti)
+
+
+def test_database_error_fails_closed(monkeypatch):
+    store = DatabaseRevocationStore()
+
+    class Down:
+        def connect(self):
+            raise OperationalError('SELECT 1', {}, Exception('connection refused'))
+    monkeypatch.setattr(revocation_util, 'engine', Down())
+    monkeypatch.setattr(store, '_start_refresh', lambda: None)
+    assert store.is_revoked(_jti())
@@ -0,0 +1,54 @@
+# AsyncUser (ASGI mode) against the same database as the sync service.
+
+import asyncio
+import threading
+
+import pytest
+
+from conftest import PASSWORD
+from DB_CONNECTION.async_config import dispose_async_engine
+from DB_CONNECTION.config import read_router
+from MODULE.USER.service import user_async_service
+from MODULE.USER.service.user_async_service import AsyncUser
+
+
+def _run(coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await dispose_async_engine()
+    return asyncio.run(main())
+
+
+def test_user_cache_is_called_off_the_event_loop(make_user, monkeypatch):
+    cache = user_async_service.user_cache
+    if cache is None:
+        pytest.skip('user cache disabled')
+    user_id, _ = make_user()
+    loop_thread, calls = threading.get_ident(), []
+
+    def recording(method):
+        def call(*args):
+            calls.append((method.__name__, threading.get_ident()))
+            return method(*args)
+        return call
+    monkeypatch.setattr(cache, 'get', recording(cache.get))
+    monkeypatch.setattr(cache, 'set', recording(cache.set))
+
+    async def read_twice():
+        await AsyncUser.get_user_details(user_id)
+        return await AsyncUser.get_user_details(user_id)
+
+    assert _run(read_twice())['ErrorCode'] == 9999
+    assert [name for name, _ in calls] == ['get', 'set', 'get']
+    assert all(thread != loop_thread for _, thread in calls)
+
+
+def test_async_signup_pins_the_new_user_for_sync_readers():
+    email = 'async-signup@signspell.io'
+    data = {'str_First_Name': 'Async', 'str_Last_Name': 'User', 'str_Location': 'Chennai',
+            'str_Email': email, 'str_Password': PASSWORD, 'User_ID': 0}
+
+    assert _run(AsyncUser.save_user_service(data))['ErrorCode'] == 9999
+    assert read_router.pinned(f'email:{email}')
@@ -0,0 +1,19 @@
+# Batch lookup of many users by id (GET /users/batch).
+
+from DB_CONNECTION.query_counter import count_queries
+from MODULE.USER.service.user_service import User
+
+
+def test_batch_lookup_is_one_query_for_any_size(make_user):
+    user_ids = [make_user()[0] for _ in range(5)]
+    with count_queries() as q:
+        result, changed = User.get_user_entries(user_ids + [user_ids[0], 10 ** 9])
+    assert [u['lng_User_ID'] for u in result['Users']] == user_ids
+    assert result['Missing_IDs'] == [10 ** 9]
+    assert set(changed) == set(user_ids)
+    assert q.count == 1
+
+    # Now all cached
+    with count_queries() as q:
+        User.get_user_entries(user_ids)
+    assert q.count == 0
@@ -0,0 +1,45 @@
+# get_user_details cache backend and its TTL.
+
+from config import Config
+from DB_CONNECTION.query_counter import count_queries
+from MODULE.COMMON.util.cache_util import MemoryCacheBackend
+from MODULE.USER.service.user_service import User, _user_cache_ttl
+
+
+def _config(**settings):
+    return type('TestConfig', (Config,), {'USER_CACHE_TTL': 300.0, 'USER_CACHE_MEMORY_MAX_TTL': 5.0, **settings})
+
+
+def test_memory_ttl_is_capped_with_several_workers():
+    assert _user_cache_ttl(_config(USER_CACHE_BACKEND='memory', WEB_CONCURRENCY=4)) == 5.0
+    assert _user_cache_ttl(_config(USER_CACHE_BACKEND='memory', WEB_CONCURRENCY=1)) == 300.0
+    assert _user_cache_ttl(_config(USER_CACHE_BACKEND='redis', WEB_CONCURRENCY=4)) == 300.0
+
+
+def test_reader_that_raced_a_write_does_not_store():
+    cache = MemoryCacheBackend()
+    _, token = cache.get(1)
+    cache.invalidate(1)             # a write lands while the reader is querying
+    cache.set(1, 'old row', token)
+    assert cache.get(1)[0] is None
+
+    _, token = cache.get(1)
+    cache.set(1, 'new row', token)
+    assert cache.get(1)[0] == 'new row'
+
+
+def test_get_user_details_is_cached(make_user):
+    user_id, email = make_user()
+    with count_queries() as q:
+        first = User.get_user_details(user_id)
+        second = User.get_user_details(user_id)
+    assert first == second
+    assert first['User Details']['str_Email'] == email
+    assert q.count == 1
+
+
+def test_update_invalidates_cached_details(make_user):
+    user_id, _ = make_user()
+    User.get_user_details(user_id)
+    User.update_user_service({'User_ID': user_id, 'lng_User_ID': user_id, 'str_Location': 'Salem'})
+    assert User.get_user_details(user_id)['User Details']['str_Location'] == 'Salem'
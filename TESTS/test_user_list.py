@@ -0,0 +1,19 @@
+# Keyset-paginated GET /users.
+
+from DB_CONNECTION.query_counter import count_queries
+from MODULE.USER.service.user_service import User
+
+
+def test_list_page_is_one_query(make_user):
+    for _ in range(3):
+        make_user()
+    with count_queries() as q:
+        page = User.list_users_service(limit=2)
+    assert page['ErrorCode'] == 9999
+    assert len(page['Users']) == 2 and page['Next_Cursor'] is not None
+    assert q.count == 1
+
+    with count_queries() as q:
+        rest = User.list_users_service(limit=1000, after=page['Next_Cursor'])
+    assert page['Users'][-1]['lng_User_ID'] < rest['Users'][0]['lng_User_ID']
+    assert q.count == 1
@@ -0,0 +1,14 @@
+# Login lookup by email (UX_User_Email_Active).
+
+from DB_CONNECTION.query_counter import count_queries
+from MODULE.USER.service.user_service import User
+from conftest import PASSWORD
+
+
+def test_login_is_one_query(make_user):
+    user_id, email = make_user()
+    with count_queries() as q:
+        assert User.authenticate_user(email, PASSWORD) == user_id
+    assert q.count == 1
+    assert User.authenticate_user(email, 'wrong-' + PASSWORD) is None
+    assert User.authenticate_user('nobody@signspell.io', PASSWORD) is None
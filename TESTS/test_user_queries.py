@@ -0,0 +1,49 @@
+# Round-trips per service call, counted with DB_CONNECTION.query_counter.
+
+from DB_CONNECTION.query_counter import count_queries
+from MODULE.USER.service.user_service import User
+from conftest import PASSWORD
+
+
+def _signup(email):
+    return {'str_First_Name': 'New', 'str_Last_Name': 'User', 'str_Location': 'Madurai',
+            'str_Email': email, 'str_Password': PASSWORD, 'User_ID': 0}
+
+
+def test_signup_is_one_statement():
+    with count_queries() as q:
+        result = User.save_user_service(_signup('signup-once@signspell.io'))
+    assert result['ErrorCode'] == 9999
+    assert q.count == 1
+
+
+def test_duplicate_signup_is_one_statement():
+    User.save_user_service(_signup('signup-twice@signspell.io'))
+    with count_queries() as q:
+        result = User.save_user_service(_signup('signup-twice@signspell.io'))
+    assert result == {'ErrorCode': 9997, 'Message': 'Email already exists'}
+    assert q.count == 1
+
+
+def test_update_is_one_statement(make_user):
+    user_id, _ = make_user()
+    with count_queries() as q:
+        result = User.update_user_service({'User_ID': user_id, 'lng_User_ID': user_id, 'str_Location': 'Trichy'})
+    assert result['ErrorCode'] == 9999
+    assert q.count == 1
+
+
+def test_update_to_taken_email_is_rejected(make_user):
+    user_id, _ = make_user()
+    _, taken = make_user()
+    result = User.update_user_service({'User_ID': user_id, 'lng_User_ID': user_id, 'str_Email': taken})
+    assert result['ErrorCode'] == 9997
+
+
+def test_delete_is_one_statement(make_user):
+    user_id, _ = make_user()
+    with count_queries() as q:
+        assert User.delete_user_service(user_id)['ErrorCode'] == 9999
+    assert q.count == 1
+    assert User.delete_user_service(user_id)['ErrorCode'] == 9996
+
@@ -0,0 +1,23 @@
+# GET /users/search prefix matching.
+
+from MODULE.USER.service.user_service import User
+
+
+def _found(user_id, **params) -> bool:
+    result = User.search_users_service(**params)
+    assert result['ErrorCode'] == 9999
+    return user_id in {u['lng_User_ID'] for u in result['Users']}
+
+
+def test_name_prefix_is_case_insensitive(make_user):
+    user_id, _ = make_user(str_First_Name='Marguerite')
+    assert _found(user_id, name='marg')
+    assert _found(user_id, name='MARGUERITE U')
+    assert not _found(user_id, name='margot')
+
+
+def test_non_ascii_name_prefix(make_user):
+    user_id, _ = make_user(str_First_Name='Élodie')
+    assert _found(user_id, name='Élodie')
+    assert _found(user_id, name='ÉLODIE')
+    assert _found(user_id, name='Élo')
@@ -1,60 +1,144 @@
 # app.py
+#
+# create_app() builds the Flask app without touching the database: schema
+# work is the one-shot bootstrap command (python -m CREATE_DB_CODE.migrations,
+# the Procfile release step), and background threads start per process.
+#     gunicorn app:app                                  (module attribute, built on first access)
+#     gunicorn -c gunicorn.conf.py "app:create_app(start_jobs=False)"   (preload + post-fork hooks)
 
 import os
 import logging
-from flask import Flask
+import threading
+from flask import Flask, redirect
 from flask_jwt_extended import JWTManager
 from dotenv import load_dotenv
 from flask_cors import CORS
 
-# 1) Load .env (for local dev) and Render env vars automatically
+# Load .env (for local dev) and Render env vars automatically
 load_dotenv()
 
-# 2) Create the Flask app
-app = Flask(__name__)
-CORS(app, supports_credentials=True)
-
-# 3) Load config from Config class (reads SECRET_KEY, JWT settings, etc.)
 from config import Config
-app.config.from_object(Config)
 
-# 4) Initialize your database (creates tables if they don't exist)
-from CREATE_DB_CODE.tables_creation import init_db
-init_db()
+_job_worker = None
+_job_worker_pid = None
+_job_worker_lock = threading.Lock()
+
+
+def start_job_worker():
+    """
+    Start this process's background job worker (tbl_Outbox) once. Threads
+    do not survive fork, so under gunicorn preload this runs in each worker
+    (post_worker_init), never in the master.
+    """
+    global _job_worker, _job_worker_pid
+    with _job_worker_lock:
+        if _job_worker is not None and _job_worker_pid == os.getpid():
+            return _job_worker
+        import atexit
+        from MODULE.JOBS.service.worker_service import build_job_worker
+        _job_worker = build_job_worker()
+        _job_worker_pid = os.getpid()
+        _job_worker.start()
+        atexit.register(_job_worker.stop)
+        return _job_worker
+
+
+def create_app(config=Config, start_jobs: bool = None) -> Flask:
+    """
+    Build the app. No DDL, no network I/O; swagger.yaml is only parsed for
+    request validation (and by flasgger on the first /apidocs hit when
+    SWAGGER_MODE=lazy). start_jobs defaults to config.JOBS_WORKER_ENABLED;
+    pass False when a server hook starts the worker after fork.
+    """
+    # 1) Create the Flask app
+    app = Flask(__name__)
+    CORS(app, supports_credentials=True)
+
+    # 2) Load config from Config class (reads SECRET_KEY, JWT settings, etc.)
+    app.config.from_object(config)
+
+    # 3) JSON encoding (orjson when installed, see JSON_PROVIDER)
+    from MODULE.COMMON.util.json_util import init_json
+    init_json(app, config.JSON_PROVIDER, config.JSON_DATETIME_FORMAT)
+
+    # 4) Register your Blueprints
+    from routes.auth import auth_bp, JWT_BLOCKLIST
+    from routes.users import user_bp
+    from routes.ops import ops_bp
+
+    app.register_blueprint(auth_bp, url_prefix='/auth')
+    app.register_blueprint(user_bp, url_prefix='/users')
+    app.register_blueprint(ops_bp, url_prefix='/ops')
+
+    # 4b) Read replicas: one replica per request (see DATABASE_REPLICA_URLS)
+    from DB_CONNECTION.config import read_router
+    from DB_CONNECTION.replica import init_replica_routing
+    init_replica_routing(app, read_router)
+
+    # 5) Setup JWT
+    jwt = JWTManager(app)
+
+    @jwt.token_in_blocklist_loader
+    def check_revoked(_, payload):
+        return JWT_BLOCKLIST.is_revoked(payload['jti'])
+
+    # 6) Swagger UI at /apidocs/ (SWAGGER_MODE: lazy, eager or off)
+    from swagger import init_swagger
+    init_swagger(app, config.SWAGGER_MODE)
+
+    @app.route('/')
+    def home():
+        return redirect('/apidocs', code=302)
 
-# 5) Setup JWT
-jwt = JWTManager(app)
+    # 7) Metrics (/metrics, per-endpoint latency, SQL per request)
+    if config.METRICS_ENABLED:
+        from MODULE.COMMON.util.metrics_util import registry
+        from MODULE.COMMON.util.request_metrics_util import init_metrics
+        from MODULE.USER.service.user_service import user_cache
+        from MODULE.USER.util.dns_util import domain_cache
+        from MODULE.JOBS.service.outbox_service import Outbox
 
-@jwt.token_in_blocklist_loader
-def check_revoked(_, payload):
-    return payload['jti'] in JWT_BLOCKLIST
+        init_metrics(app, read_router.named_engines(), config.SLOW_REQUEST_MS,
+                     config.METRICS_TOKEN, config.METRICS_PUBLIC)
+        if user_cache is not None:
+            registry.gauge('user_cache', 'get_user_details cache', user_cache.stats)
+        registry.gauge('dns_cache', 'Email domain DNS cache', domain_cache.stats)
+        registry.gauge('outbox_jobs', 'Background jobs by status', Outbox.stats)
+        registry.gauge('db_reads', 'Read routing (replica / primary / pinned / fallback)', read_router.stats)
 
-# 6) Swagger UI (for testing only—automatically at /apidocs/)
-from swagger import init_swagger
-init_swagger(app)
+    # 8) gzip/deflate for large buffered responses. Registered last so it runs
+    # first among the after_request hooks and its time is in the metrics.
+    if config.COMPRESSION_ENABLED:
+        from MODULE.COMMON.util.compression_util import init_compression
+        init_compression(app, config.COMPRESSION_MIN_SIZE, config.COMPRESSION_LEVEL)
 
-# 7) Register your Blueprints
-from routes.auth import auth_bp, JWT_BLOCKLIST
-from routes.users import user_bp
+    # 9) Background job worker. Started last so its queries never race the
+    # SQL metrics listeners being installed.
+    if config.JOBS_WORKER_ENABLED if start_jobs is None else start_jobs:
+        start_job_worker()
 
-app.register_blueprint(auth_bp, url_prefix='/auth')
-app.register_blueprint(user_bp, url_prefix='/users')
+    return app
 
-from flask import redirect
 
-@app.route('/')
-def home():
-    return redirect('/apidocs', code=302)
+def __getattr__(name):
+    # `from app import app` / `gunicorn app:app` build the default app on
+    # first access, so importing this module (e.g. for create_app) is cheap.
+    if name == 'app':
+        app = globals()['app'] = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-# 8) Entry point
+# Entry point (local development: brings the schema up to date first)
 if __name__ == '__main__':
     # Configure logging
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s %(levelname)s: %(message)s'
     )
+    from CREATE_DB_CODE.migrations import run_migrations
+    run_migrations()
 
     # Use PORT from env (Render sets this), default to 5000
     port = int(os.environ.get('PORT', 5000))
-    app.run(host='0.0.0.0', port=port, debug=False)
+    create_app().run(host='0.0.0.0', port=port, debug=False)
@@ -0,0 +1,413 @@
+# asgi.py
+#
+# Optional ASGI deployment mode. The hot endpoints (signup, login, refresh,
+# logout and /users CRUD) are served by AsyncUser on an event loop; every
+# other route (forgot/reset, bulk, export, ops, metrics, apidocs, CORS
+# preflight) falls through to the regular Flask app in a worker thread.
+# Request/response bodies, status codes and JWTs are the same as the WSGI app.
+#
+# Optional dependencies (requirements-asgi.txt): uvicorn, plus asyncpg
+# (PostgreSQL) or aiosqlite (SQLite). AsyncUser reads from the primary only;
+# DATABASE_REPLICA_URLS is used by the Flask fallthrough routes.
+#     uvicorn asgi:app --workers 2
+#     gunicorn asgi:app -k uvicorn.workers.UvicornWorker
+
+import asyncio
+import re
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+import jwt as pyjwt
+from werkzeug.http import http_date
+
+from app import app as flask_app
+from config import Config
+from routes.auth import JWT_BLOCKLIST, AUTH_LIMITER
+from MODULE.AUTH.util.rate_limit_util import client_ip
+from MODULE.COMMON.util.http_cache_util import make_etag, is_modified
+from MODULE.COMMON.util.compression_util import compress_body
+from MODULE.COMMON.util.schema_util import body_validator
+from DB_CONNECTION.async_config import dispose_async_engine
+from MODULE.USER.service.user_async_service import AsyncUser
+
+_config = flask_app.config
+_JWT_ALGORITHM = _config.get('JWT_ALGORITHM', 'HS256')
+
+
+# ---- JWT (claims compatible with flask_jwt_extended) ----
+
+def create_token(identity: str, token_type: str, fresh: bool = False) -> str:
+    now = datetime.now(timezone.utc)
+    expires = _config['JWT_ACCESS_TOKEN_EXPIRES'] if token_type == 'access' else _config['JWT_REFRESH_TOKEN_EXPIRES']
+    claims = {
+        'fresh': fresh,
+        'iat':   now,
+        'jti':   str(uuid.uuid4()),
+        'type':  token_type,
+        'sub':   identity,
+        'nbf':   now,
+        'exp':   now + expires,
+    }
+    return pyjwt.encode(claims, _config['JWT_SECRET_KEY'], algorithm=_JWT_ALGORITHM)
+
+
+class AuthError(Exception):
+    def __init__(self, status: int, msg: str):
+        self.status = status
+        self.msg = msg
+
+
+async def require_jwt(headers: dict, token_type: str) -> dict:
+    auth = headers.get('authorization', '')
+    if not auth:
+        raise AuthError(401, 'Missing Authorization Header')
+    parts = auth.split()
+    if len(parts) != 2 or parts[0] != 'Bearer':
+        raise AuthError(422, "Bad Authorization header. Expected 'Authorization: Bearer <JWT>'")
+    try:
+        claims = pyjwt.decode(parts[1], _config['JWT_SECRET_KEY'], algorithms=[_JWT_ALGORITHM])
+    except pyjwt.ExpiredSignatureError:
+        raise AuthError(401, 'Token has expired')
+    except pyjwt.InvalidTokenError as e:
+        raise AuthError(422, str(e))
+
+    if token_type == 'access' and claims.get('type') == 'refresh':
+        raise AuthError(422, 'Only non-refresh tokens are allowed')
+    if token_type == 'refresh' and claims.get('type') != 'refresh':
+        raise AuthError(422, 'Only refresh tokens are allowed')
+    # The revocation store may touch the database; keep it off the loop
+    if await asyncio.to_thread(JWT_BLOCKLIST.is_revoked, claims['jti']):
+        raise AuthError(401, 'Token has been revoked')
+    return claims
+
+
+class NotModified(Exception):
+    def __init__(self, headers: list):
+        self.headers = headers
+
+
+class RateLimited(Exception):
+    def __init__(self, retry_after: int):
+        self.retry_after = retry_after
+
+
+def throttle(req, endpoint: str, data: dict):
+    """Same limits (and storage) as the Flask routes' @rate_limited."""
+    if AUTH_LIMITER is None:
+        return
+    client = (req.scope.get('client') or (None, 0))[0]
+    ip = client_ip(client, req.headers.get('x-forwarded-for'), Config.TRUSTED_PROXY_COUNT)
+    retry_after = AUTH_LIMITER.check(endpoint, ip, data.get('str_Email'))
+    if retry_after:
+        raise RateLimited(retry_after)
+
+
+# ---- Handlers: (request) -> (body, status[, extra headers]) ----
+
+# Same compiled swagger.yaml validators (and messages) as the Flask views
+SIGNUP_BODY = body_validator('/auth/signup', message='All fields required')
+LOGIN_BODY = body_validator('/auth/login', message='Email & Password required')
+CREATE_USER_BODY = body_validator('/users')
+UPDATE_USER_BODY = body_validator('/users/{lng_User_ID}', 'put')
+
+async def signup(req):
+    data = req.json()
+    throttle(req, 'signup', data)
+    error = SIGNUP_BODY.validate(data)
+    if error is not None:
+        return error, 400
+    result = await AsyncUser.save_user_service({**data, 'User_ID': 0})
+    return result, 201 if result.get('ErrorCode') == 9999 else 400
+
+
+async def login(req):
+    data = req.json()
+    throttle(req, 'login', data)
+    error = LOGIN_BODY.validate(data)
+    if error is not None:
+        return error, 400
+    email, pwd = data['str_Email'], data['str_Password']
+    try:
+        user_id = await AsyncUser.authenticate_user(email, pwd)
+        if user_id is None:
+            return {'ErrorCode': 9996, 'Message': 'Invalid credentials'}, 401
+        uid = str(user_id)
+        return {
+            'ErrorCode': '9999',
+            'Message': 'Login Successful',
+            'lng_User_ID': uid,
+            'access_token':  create_token(uid, 'access', fresh=True),
+            'refresh_token': create_token(uid, 'refresh')
+        }, 200
+    except Exception:
+        flask_app.logger.exception('login')
+        return {'ErrorCode': 9998, 'Message': 'Internal error'}, 500
+
+
+async def refresh(req):
+    return {'ErrorCode': '9999', 'access_token': create_token(req.claims['sub'], 'access')}, 200
+
+
+async def logout(req):
+    await asyncio.to_thread(JWT_BLOCKLIST.revoke, req.claims['jti'], req.claims['exp'])
+    return {'ErrorCode': '9999', 'Message': 'Logged out'}, 200
+
+
+async def list_users(req):
+    # Paged mode only; ?stream= goes to the Flask app (see route table)
+    after = req.query.get('after')
+    limit = req.query.get('limit')
+    try:
+        after = int(after) if after is not None else None
+    except ValueError:
+        return {'ErrorCode': 9997, 'Message': 'after must be an integer'}, 400
+    try:
+        limit = int(limit) if limit is not None else _config['USERS_PAGE_DEFAULT_LIMIT']
+        if limit < 1:
+            raise ValueError
+    except ValueError:
+        return {'ErrorCode': 9997, 'Message': 'limit must be a positive integer'}, 400
+    limit = min(limit, _config['USERS_PAGE_MAX_LIMIT'])
+
+    # Same table-wide validator as the Flask route (_conditional_page)
+    validator = await AsyncUser.users_validator()
+    if validator is None:
+        return await AsyncUser.list_users_service(limit, after), 200
+    token, changed = validator
+    full_path = f"{req.scope['path']}?{req.scope.get('query_string', b'').decode()}"
+    etag = make_etag('users', token, full_path)
+    headers = [(b'etag', f'W/"{etag}"'.encode())]
+    if changed is not None:
+        headers.append((b'last-modified', http_date(changed).encode()))
+    headers.append((b'cache-control', b'private, no-cache'))
+    if not is_modified(req.headers.get('if-none-match'), req.headers.get('if-modified-since'), etag, changed):
+        raise NotModified(headers)
+    result = await AsyncUser.list_users_service(limit, after)
+    if result.get('ErrorCode') != 9999:
+        return result, 200
+    return result, 200, headers
+
+
+async def create_user(req):
+    data = req.json()
+    error = CREATE_USER_BODY.validate(data)
+    if error is not None:
+        return error, 400
+    data['User_ID'] = req.claims['sub']
+    return await AsyncUser.save_user_service(data), 201
+
+
+async def get_user(req, user_id):
+    # Same validators as the Flask route (conditional_json)
+    result, changed = await AsyncUser.get_user_entry(int(user_id))
+    if changed is None:
+        return result, 200
+    etag = make_etag('user', int(user_id), changed.isoformat())
+    headers = [(b'etag', f'W/"{etag}"'.encode()),
+               (b'last-modified', http_date(changed).encode()),
+               (b'cache-control', b'private, no-cache')]
+    if not is_modified(req.headers.get('if-none-match'), req.headers.get('if-modified-since'), etag, changed):
+        raise NotModified(headers)
+    return result, 200, headers
+
+
+async def update_user(req, user_id):
+    data = req.json()
+    error = UPDATE_USER_BODY.validate(data)
+    if error is not None:
+        return error, 400
+    data.update({'User_ID': req.claims['sub'], 'lng_User_ID': int(user_id)})
+    return await AsyncUser.update_user_service(data), 200
+
+
+async def delete_user(req, user_id):
+    return await AsyncUser.delete_user_service(int(user_id)), 200
+
+
+# (method, path regex, handler, jwt token type or None)
+ROUTES = [
+    ('POST',   re.compile(r'^/auth/signup$'),         signup,      None),
+    ('POST',   re.compile(r'^/auth/login$'),          login,       None),
+    ('POST',   re.compile(r'^/auth/refresh$'),        refresh,     'refresh'),
+    ('POST',   re.compile(r'^/auth/logout$'),         logout,      'access'),
+    ('GET',    re.compile(r'^/users$'),               list_users,  'access'),
+    ('POST',   re.compile(r'^/users$'),               create_user, 'access'),
+    ('GET',    re.compile(r'^/users/(\d+)$'),         get_user,    'access'),
+    ('PUT',    re.compile(r'^/users/(\d+)$'),         update_user, 'access'),
+    ('DELETE', re.compile(r'^/users/(\d+)$'),         delete_user, 'access'),
+]
+
+
+class Request:
+    def __init__(self, scope, body: bytes):
+        self.scope = scope
+        self.body = body
+        self.headers = {k.decode('latin-1').lower(): v.decode('latin-1') for k, v in scope['headers']}
+        self.query = {}
+        for pair in scope.get('query_string', b'').decode('latin-1').split('&'):
+            if pair:
+                k, _, v = pair.partition('=')
+                self.query.setdefault(k, v)
+        self.claims = None
+
+    def json(self) -> dict:
+        # Same as Flask's `request.get_json() or {}` for well-formed bodies
+        if not self.body:
+            return {}
+        data = flask_app.json.loads(self.body)
+        return data if isinstance(data, dict) else {}
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+def _encode_json(payload) -> bytes:
+    # Same provider as the Flask app; orjson encodes straight to bytes
+    dumps_bytes = getattr(flask_app.json, 'dumps_bytes', None)
+    if dumps_bytes is not None:
+        return dumps_bytes(payload)
+    return (flask_app.json.dumps(payload) + '\n').encode('utf-8')
+
+
+async def _send(send, status: int, body: bytes, headers: list):
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def _cors_headers(req) -> list:
+    origin = req.headers.get('origin')
+    if not origin:
+        return []
+    return [(b'access-control-allow-origin', origin.encode('latin-1')),
+            (b'access-control-allow-credentials', b'true'),
+            (b'vary', b'Origin')]
+
+
+# ---- Fallback: run the Flask WSGI app in a thread ----
+
+def _wsgi_environ(scope, body: bytes) -> dict:
+    import io
+    import sys
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD':    scope['method'],
+        'SCRIPT_NAME':       scope.get('root_path', ''),
+        'PATH_INFO':         scope['path'],
+        'QUERY_STRING':      scope.get('query_string', b'').decode('latin-1'),
+        'SERVER_NAME':       server[0],
+        'SERVER_PORT':       str(server[1]),
+        'SERVER_PROTOCOL':   f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR':       (scope.get('client') or ('', 0))[0],
+        'wsgi.version':      (1, 0),
+        'wsgi.url_scheme':   scope.get('scheme', 'http'),
+        'wsgi.input':        io.BytesIO(body),
+        'wsgi.errors':       sys.stderr,
+        'wsgi.multithread':  True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once':     False,
+    }
+    for k, v in scope['headers']:
+        name = k.decode('latin-1').upper().replace('-', '_')
+        value = v.decode('latin-1')
+        if name in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            environ[name] = value
+        else:
+            key = f'HTTP_{name}'
+            environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+async def _run_wsgi(send, environ):
+    """
+    Run the Flask app and send its body chunk by chunk as the WSGI iterator
+    yields it, so streamed listings and exports keep bounded memory. One
+    thread per request runs the app and every next() (a SQLite connection
+    must stay on its thread). An error mid-body propagates, so the server
+    aborts the response instead of ending it cleanly.
+    """
+    status_headers = {}
+
+    def start_response(status, headers, exc_info=None):
+        status_headers['status'] = int(status.split(' ', 1)[0])
+        status_headers['headers'] = headers
+
+    loop = asyncio.get_running_loop()
+    done = object()
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='wsgi') as thread:
+        result = await loop.run_in_executor(thread, flask_app, environ, start_response)
+        try:
+            chunks = iter(result)
+            chunk = await loop.run_in_executor(thread, next, chunks, done)
+            headers = [(k.lower().encode('latin-1'), v.encode('latin-1')) for k, v in status_headers['headers']]
+            await send({'type': 'http.response.start', 'status': status_headers['status'], 'headers': headers})
+            while chunk is not done:
+                if chunk:
+                    await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+                chunk = await loop.run_in_executor(thread, next, chunks, done)
+            await send({'type': 'http.response.body', 'body': b''})
+        finally:
+            if hasattr(result, 'close'):
+                await loop.run_in_executor(thread, result.close)
+
+
+async def app(scope, receive, send):
+    if scope['type'] == 'lifespan':
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await dispose_async_engine()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+    if scope['type'] != 'http':
+        return
+
+    body = await _read_body(receive)
+    req = Request(scope, body)
+
+    for method, pattern, handler, token_type in ROUTES:
+        match = pattern.match(scope['path'])
+        if not match or method != scope['method']:
+            continue
+        if handler is list_users and 'stream' in req.query:
+            break   # streamed listing stays on the Flask path
+        ctype = req.headers.get('content-type', '')
+        if method in ('POST', 'PUT') and handler not in (refresh, logout) and 'json' not in ctype:
+            break   # let Flask produce its usual 415
+        extra = []
+        try:
+            if token_type:
+                req.claims = await require_jwt(req.headers, token_type)
+            payload, status, *more = await handler(req, *match.groups())
+            extra = more[0] if more else []
+        except NotModified as e:
+            await _send(send, 304, b'', e.headers + _cors_headers(req))
+            return
+        except AuthError as e:
+            payload, status = {'msg': e.msg}, e.status
+        except RateLimited as e:
+            payload, status = {'ErrorCode': 9994, 'Message': 'Too many requests, try again later'}, 429
+            extra = [(b'retry-after', str(e.retry_after).encode())]
+        except ValueError:
+            payload, status = {'ErrorCode': 9997, 'Message': 'Invalid JSON body'}, 400
+        accept_encoding = req.headers.get('accept-encoding') if Config.COMPRESSION_ENABLED else None
+        out, encoding = compress_body(_encode_json(payload), 'application/json', accept_encoding,
+                                      Config.COMPRESSION_MIN_SIZE, Config.COMPRESSION_LEVEL)
+        headers = [(b'content-type', b'application/json'),
+                   (b'content-length', str(len(out)).encode())] + extra + _cors_headers(req)
+        if Config.COMPRESSION_ENABLED:
+            headers.append((b'vary', b'Accept-Encoding'))
+        if encoding:
+            headers.append((b'content-encoding', encoding.encode()))
+        await _send(send, status, out, headers)
+        return
+
+    await _run_wsgi(send, _wsgi_environ(scope, body))
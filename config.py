@@ -11,6 +11,160 @@ class Config:
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=12)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
 
+    # Revoked-token store: "database" (shared across workers) or "memory".
+    # The database store's Bloom filter is refreshed in the background every
+    # JWT_REVOCATION_REFRESH_SECONDS; a logout elsewhere shows up within that.
+    JWT_REVOCATION_BACKEND = os.getenv("JWT_REVOCATION_BACKEND", "database")
+    JWT_REVOCATION_REFRESH_SECONDS = float(os.getenv("JWT_REVOCATION_REFRESH_SECONDS", 5))
+
+    # Auth endpoint throttling ("<n>/<second|minute|hour|day>", empty = off),
+    # per client IP and per email. Storage "memory://" is per process; a
+    # `limits` URI such as "redis://host:6379" shares the counts.
+    # TRUSTED_PROXY_COUNT: proxies in front of the app whose X-Forwarded-For
+    # entries are trusted for the client IP. Behind a load balancer (Render,
+    # Heroku) this must be 1, which the Procfile sets; 0 = direct clients only.
+    RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_STORAGE_URI = os.getenv("RATE_LIMIT_STORAGE_URI", "memory://")
+    RATE_LIMIT_LOGIN_IP = os.getenv("RATE_LIMIT_LOGIN_IP", "30/minute")
+    RATE_LIMIT_LOGIN_EMAIL = os.getenv("RATE_LIMIT_LOGIN_EMAIL", "10/minute")
+    RATE_LIMIT_FORGOT_IP = os.getenv("RATE_LIMIT_FORGOT_IP", "10/minute")
+    RATE_LIMIT_FORGOT_EMAIL = os.getenv("RATE_LIMIT_FORGOT_EMAIL", "3/hour")
+    RATE_LIMIT_SIGNUP_IP = os.getenv("RATE_LIMIT_SIGNUP_IP", "20/hour")
+    RATE_LIMIT_SIGNUP_EMAIL = os.getenv("RATE_LIMIT_SIGNUP_EMAIL", "5/hour")
+    TRUSTED_PROXY_COUNT = int(os.getenv("TRUSTED_PROXY_COUNT", 0))
+
+    # Database pool, per worker process. DB_PRE_PING: "always" (every
+    # checkout), "idle" (only after DB_PRE_PING_IDLE_SECONDS in the pool) or "never"
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_PRE_PING = os.getenv("DB_PRE_PING", "idle")
+    DB_PRE_PING_IDLE_SECONDS = float(os.getenv("DB_PRE_PING_IDLE_SECONDS", 30))
+
+    # Read replicas (comma-separated URLs, empty = all reads on the primary).
+    # Read-only User queries go round-robin to healthy replicas; one that
+    # fails is skipped for DB_REPLICA_RETRY_SECONDS. For READ_YOUR_WRITES_SECONDS
+    # after a write, reads about that user go to the primary, and so do that
+    # client's reads on any worker (signed "ryw" cookie / X-Read-Your-Writes).
+    # The ASGI mode's async endpoints (asgi.py) always read from the primary.
+    DATABASE_REPLICA_URLS = [u.strip() for u in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if u.strip()]
+    DB_REPLICA_RETRY_SECONDS = float(os.getenv("DB_REPLICA_RETRY_SECONDS", 30))
+    READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", 10))
+
+    # Password hashing: "scrypt" or "pbkdf2-sha256". Raising a cost only
+    # affects new hashes; existing ones are upgraded on the next login.
+    # Size it with `python -m BENCHMARK.password_hash_bench`.
+    PASSWORD_HASH_ALGORITHM = os.getenv("PASSWORD_HASH_ALGORITHM", "scrypt")
+    PASSWORD_SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", 2 ** 14))
+    PASSWORD_SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", 8))
+    PASSWORD_SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", 1))
+    PASSWORD_PBKDF2_ITERATIONS = int(os.getenv("PASSWORD_PBKDF2_ITERATIONS", 600000))
+
+    # Breached-password blocklist built with `python -m MODULE.USER.util.blocklist_util`
+    # (empty = only the built-in common-password list)
+    PASSWORD_BLOCKLIST_PATH = os.getenv("PASSWORD_BLOCKLIST_PATH", "")
+
+    # GET /users paging / streaming
+    USERS_PAGE_DEFAULT_LIMIT = int(os.getenv("USERS_PAGE_DEFAULT_LIMIT", 100))
+    USERS_PAGE_MAX_LIMIT = int(os.getenv("USERS_PAGE_MAX_LIMIT", 1000))
+    USERS_STREAM_CHUNK_SIZE = int(os.getenv("USERS_STREAM_CHUNK_SIZE", 1000))
+    # GET /users/changes holds back changes younger than this, so a write
+    # still committing (or a worker clock slightly behind) is not skipped
+    USERS_CHANGES_SETTLE_SECONDS = float(os.getenv("USERS_CHANGES_SETTLE_SECONDS", 5))
+    # Most ids one GET/POST /users/batch request may ask for
+    USERS_BATCH_MAX_IDS = int(os.getenv("USERS_BATCH_MAX_IDS", 200))
+    # Soft-deleted users move to tbl_User_Archive this many days after
+    # deletion (python -m MODULE.USER.service.archive_service, e.g. nightly),
+    # USER_ARCHIVE_BATCH_SIZE rows per transaction. Keep the retention well
+    # above how far behind a GET /users/changes consumer may fall: archived
+    # rows leave the feed.
+    USER_ARCHIVE_RETENTION_DAYS = float(os.getenv("USER_ARCHIVE_RETENTION_DAYS", 30))
+    USER_ARCHIVE_BATCH_SIZE = int(os.getenv("USER_ARCHIVE_BATCH_SIZE", 500))
+
+    # Email domain DNS checks (validate_email_domain). DNS_NEGATIVE_TTL
+    # applies to NXDOMAIN/NODATA only; timeouts and resolver errors are kept
+    # for DNS_ERROR_TTL seconds at most (0 = not cached).
+    DNS_CACHE_SIZE = int(os.getenv("DNS_CACHE_SIZE", 4096))
+    DNS_POSITIVE_TTL = float(os.getenv("DNS_POSITIVE_TTL", 3600))
+    DNS_NEGATIVE_TTL = float(os.getenv("DNS_NEGATIVE_TTL", 60))
+    DNS_ERROR_TTL = float(os.getenv("DNS_ERROR_TTL", 5))
+    DNS_LOOKUP_TIMEOUT = float(os.getenv("DNS_LOOKUP_TIMEOUT", 2.0))
+    DNS_MAX_WORKERS = int(os.getenv("DNS_MAX_WORKERS", 8))
+
+    # POST /users/bulk: answered 202 at once, imported by the job workers in
+    # tbl_Outbox jobs of BULK_JOB_ROWS rows (progress: GET /users/bulk/<id>)
+    BULK_IMPORT_MAX_ROWS = int(os.getenv("BULK_IMPORT_MAX_ROWS", 10000))
+    BULK_JOB_ROWS = int(os.getenv("BULK_JOB_ROWS", 500))
+    BULK_INSERT_CHUNK_SIZE = int(os.getenv("BULK_INSERT_CHUNK_SIZE", 1000))
+    # Hashing processes per job worker, at most one per CPU. One scrypt hash
+    # is ~50-70 ms of CPU, so a job of 500 rows takes ~35 s on one process:
+    # well inside JOBS_LEASE_SECONDS, after which another worker would claim
+    # it again. BENCHMARK.bulk_import_bench fails if a job does not fit.
+    BULK_HASH_WORKERS = min(int(os.getenv("BULK_HASH_WORKERS", 2)), os.cpu_count() or 1)
+
+    # get_user_details read-through cache. "memory" is per process and only
+    # sees its own worker's writes, so with WEB_CONCURRENCY > 1 (gunicorn's
+    # worker count, default 2) its TTL is capped at USER_CACHE_MEMORY_MAX_TTL.
+    # Use "redis" (optional package) for the full TTL across workers.
+    USER_CACHE_ENABLED = os.getenv("USER_CACHE_ENABLED", "true").lower() == "true"
+    USER_CACHE_BACKEND = os.getenv("USER_CACHE_BACKEND", "memory")
+    USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", 10000))
+    USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", 300))
+    USER_CACHE_MEMORY_MAX_TTL = float(os.getenv("USER_CACHE_MEMORY_MAX_TTL", 5))
+    WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", 2))
+    USER_CACHE_REDIS_URL = os.getenv("USER_CACHE_REDIS_URL", "redis://localhost:6379/0")
+
+    # Response encoding. JSON_PROVIDER "orjson" (optional package, falls back
+    # to the stdlib) or "default"; JSON_DATETIME_FORMAT "http" (RFC 822, as
+    # before) or "iso" (ISO 8601, cheapest with orjson). Buffered responses of
+    # at least COMPRESSION_MIN_SIZE bytes are gzip/deflate encoded when the
+    # client sends Accept-Encoding.
+    JSON_PROVIDER = os.getenv("JSON_PROVIDER", "orjson")
+    JSON_DATETIME_FORMAT = os.getenv("JSON_DATETIME_FORMAT", "http")
+    COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() == "true"
+    COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", 1024))
+    COMPRESSION_LEVEL = int(os.getenv("COMPRESSION_LEVEL", 1))
+
+    # Background jobs (tbl_Outbox). Each web worker process runs a poller and
+    # JOBS_WORKER_THREADS job threads when JOBS_WORKER_ENABLED; or disable it
+    # and run `python -m MODULE.JOBS.service.outbox_service --run` separately.
+    # Failed jobs retry with jittered exponential backoff, then go "dead".
+    JOBS_WORKER_ENABLED = os.getenv("JOBS_WORKER_ENABLED", "true").lower() == "true"
+    JOBS_WORKER_THREADS = int(os.getenv("JOBS_WORKER_THREADS", 2))
+    JOBS_BATCH_SIZE = int(os.getenv("JOBS_BATCH_SIZE", 10))
+    JOBS_POLL_SECONDS = float(os.getenv("JOBS_POLL_SECONDS", 2))
+    JOBS_LEASE_SECONDS = float(os.getenv("JOBS_LEASE_SECONDS", 120))
+    JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", 8))
+    JOBS_BACKOFF_BASE_SECONDS = float(os.getenv("JOBS_BACKOFF_BASE_SECONDS", 5))
+    JOBS_BACKOFF_MAX_SECONDS = float(os.getenv("JOBS_BACKOFF_MAX_SECONDS", 3600))
+
+    # Outgoing mail: "smtp" (default), or explicitly for local/test use
+    # "file" (writes .eml files, live reset links included, to MAIL_FILE_DIR)
+    # or "memory". RESET_URL_IN_RESPONSE also returns the reset link from
+    # /auth/forgot (local testing only).
+    MAIL_BACKEND = os.getenv("MAIL_BACKEND", "smtp")
+    MAIL_FROM = os.getenv("MAIL_FROM", "SignSpell <no-reply@signspell.io>")
+    MAIL_FILE_DIR = os.getenv("MAIL_FILE_DIR", "mail_outbox")
+    SMTP_HOST = os.getenv("SMTP_HOST", "localhost")
+    SMTP_PORT = int(os.getenv("SMTP_PORT", 587))
+    SMTP_USERNAME = os.getenv("SMTP_USERNAME", "")
+    SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
+    SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "true").lower() == "true"
+    SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT", 10))
+    RESET_URL_IN_RESPONSE = os.getenv("RESET_URL_IN_RESPONSE", "false").lower() == "true"
+
+    # Request/SQL metrics and GET /metrics; when disabled nothing is installed.
+    # /metrics needs "Authorization: Bearer <METRICS_TOKEN>"; without a token
+    # it answers 404 unless METRICS_PUBLIC (only where the port is internal).
+    METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+    METRICS_PUBLIC = os.getenv("METRICS_PUBLIC", "false").lower() == "true"
+    SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", 500))
+
+    # Swagger UI (/apidocs): "lazy" loads flasgger and swagger.yaml on the
+    # first docs request, "eager" at startup, "off" disables it (production)
+    SWAGGER_MODE = os.getenv("SWAGGER_MODE", "lazy")
     SWAGGER = {
         'title': 'SIGN SPELL API',
         'uiversion': 3
@@ -0,0 +1,35 @@
+# gunicorn.conf.py
+#
+#     gunicorn -c gunicorn.conf.py "app:create_app(start_jobs=False)"
+#
+# preload_app imports and builds the app once in the master, so workers fork
+# with it ready (faster boots and restarts, shared memory). Anything that
+# must not cross a fork is reset or started in the hooks below.
+
+import os
+
+from config import Config
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = Config.WEB_CONCURRENCY   # also caps the memory user cache's TTL
+threads = int(os.getenv('GUNICORN_THREADS', 1))
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true').lower() == 'true'
+# A sync worker busy longer than this is killed mid-request. Slow work
+# (bulk imports, email) goes to the job workers, not the request.
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+
+
+def post_fork(server, worker):
+    # Pooled connections opened in the master (if any) belong to it; drop
+    # them without closing so each worker opens its own
+    from DB_CONNECTION.config import engine, read_router
+    engine.dispose(close=False)
+    read_router.dispose(close=False)
+
+
+def post_worker_init(worker):
+    # Threads do not survive fork: start the job worker in each worker
+    from config import Config
+    if Config.JOBS_WORKER_ENABLED:
+        from app import start_job_worker
+        start_job_worker()
@@ -1,6 +1,8 @@
 # routes/auth.py
 
 import logging
+import time
+from functools import wraps
 from flask import Blueprint, request, jsonify, url_for
 from flask_jwt_extended import (
     create_access_token, create_refresh_token,
@@ -14,21 +16,43 @@ from config import Config
 from DB_CONNECTION.config import engine
 from CREATE_DB_CODE.tables_creation import tbl_User
 from MODULE.USER.service.user_service import User
-from MODULE.USER.util.user_util import encrypt_password
+from MODULE.JOBS.service.outbox_service import Outbox
+from MODULE.AUTH.util.revocation_util import build_revocation_store
+from MODULE.AUTH.util.rate_limit_util import build_auth_rate_limiter, client_ip
+from MODULE.COMMON.util.schema_util import validate_body, body_validator
 
 auth_bp = Blueprint('auth_bp', __name__, url_prefix='/auth')
 serializer = URLSafeTimedSerializer(Config.SECRET_KEY)
-JWT_BLOCKLIST = set()
+JWT_BLOCKLIST = build_revocation_store(Config.JWT_REVOCATION_BACKEND)
+AUTH_LIMITER = build_auth_rate_limiter()
+
+
+def rate_limited(endpoint: str):
+    """Reject over-limit callers with 429 before the view does any DB or hashing work."""
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if AUTH_LIMITER is not None:
+                data = request.get_json(silent=True)
+                email = data.get('str_Email') if isinstance(data, dict) else None
+                ip = client_ip(request.remote_addr, request.headers.get('X-Forwarded-For'),
+                               Config.TRUSTED_PROXY_COUNT)
+                retry_after = AUTH_LIMITER.check(endpoint, ip, email)
+                if retry_after:
+                    resp = jsonify({'ErrorCode': 9994, 'Message': 'Too many requests, try again later'})
+                    resp.status_code = 429
+                    resp.headers['Retry-After'] = str(retry_after)
+                    return resp
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
 
 
 @auth_bp.route('/signup', methods=['POST'])
+@rate_limited('signup')
+@validate_body('/auth/signup', message='All fields required')
 def signup():
-    data = request.get_json() or {}
-    # All required fields (User.save_user_service will enforce User_ID)
-    for f in ('str_First_Name', 'str_Last_Name', 'str_Email', 'str_Location', 'str_Password'):
-        if not data.get(f):
-            return jsonify({'ErrorCode': 9997, 'Message': 'All fields required'}), 400
-
+    data = request.get_json()
     # Delegate to service (with User_ID=0 for system)
     result = User.save_user_service({**data, 'User_ID': 0})
     status = 201 if result.get('ErrorCode') == 9999 else 400
@@ -36,26 +60,20 @@ def signup():
 
 
 @auth_bp.route('/login', methods=['POST'])
+@rate_limited('login')
+@validate_body('/auth/login', message='Email & Password required')
 def login():
-    data = request.get_json() or {}
-    email = data.get('str_Email')
-    pwd   = data.get('str_Password')
-    if not email or not pwd:
-        return jsonify({'ErrorCode': 9997, 'Message': 'Email & Password required'}), 400
+    data = request.get_json()
+    email = data['str_Email']
+    pwd   = data['str_Password']
 
     try:
-        stmt = select(tbl_User).where(
-            tbl_User.c.str_Email == email,
-            tbl_User.c.bln_IsDeleted == False
-        )
-        with engine.connect() as conn:
-            row = conn.execute(stmt).fetchone()
-
-        # Verify credentials
-        if not row or encrypt_password(pwd) != row.str_Password_hash:
+        # Verify credentials (upgrades a legacy/outdated hash on success)
+        user_id = User.authenticate_user(email, pwd)
+        if user_id is None:
             return jsonify({'ErrorCode': 9996, 'Message': 'Invalid credentials'}), 401
 
-        uid = str(row.lng_User_ID)
+        uid = str(user_id)
         return jsonify({
             'ErrorCode': '9999',
             'Message' : 'Login Successful',
@@ -79,19 +97,22 @@ def refresh():
 @auth_bp.route('/logout', methods=['POST'])
 @jwt_required()
 def logout():
-    JWT_BLOCKLIST.add(get_jwt()['jti'])
+    claims = get_jwt()
+    JWT_BLOCKLIST.revoke(claims['jti'], claims['exp'])
     return jsonify({'ErrorCode': '9999', 'Message': 'Logged out'}), 200
 
 
 @auth_bp.route('/forgot', methods=['POST'])
+@rate_limited('forgot')
+@validate_body('/auth/forgot', message='Email required')
 def forgot_password():
-    data = request.get_json() or {}
-    email = data.get('str_Email')
-    if not email:
-        return jsonify({'ErrorCode': 9997, 'Message': 'Email required'}), 400
+    email = request.get_json()['str_Email']
 
     try:
-        stmt = select(tbl_User).where(tbl_User.c.str_Email == email)
+        stmt = select(tbl_User).where(
+            tbl_User.c.str_Email == email,
+            tbl_User.c.bln_IsDeleted == False
+        )
         with engine.connect() as conn:
             row = conn.execute(stmt).fetchone()
 
@@ -100,8 +121,20 @@ def forgot_password():
 
         token = serializer.dumps(email, salt='pw-reset')
         link  = url_for('auth_bp.reset_password', token=token, _external=True)
-        # TODO: send link via email
-        return jsonify({'ErrorCode': '9999', 'reset_url': link}), 200
+        # Sent by the job worker; the key collapses repeats within a minute
+        queued = Outbox.enqueue('send_email', {
+            'to':      email,
+            'subject': 'Reset your SignSpell password',
+            'body':    f"Use this link to choose a new password:\n\n{link}\n\n"
+                       "It expires in one hour. If you did not ask for this, ignore this email."
+        }, idempotency_key=f"pw-reset:{email.lower()}:{int(time.time() // 60)}")
+        if queued['ErrorCode'] != 9999:
+            return jsonify({'ErrorCode': 9998, 'Message': 'Internal error'}), 500
+
+        result = {'ErrorCode': '9999', 'Message': 'Password reset email sent'}
+        if Config.RESET_URL_IN_RESPONSE:
+            result['reset_url'] = link
+        return jsonify(result), 200
 
     except Exception:
         logging.exception('forgot_password')
@@ -117,12 +150,14 @@ def reset_password(token):
     except BadSignature:
         return jsonify({'ErrorCode': 9996, 'Message': 'Invalid token'}), 400
 
+    # Validated after the token, so token errors keep precedence
     data = request.get_json() or {}
-    pwd  = data.get('str_Password')
-    if not pwd:
-        return jsonify({'ErrorCode': 9997, 'Message': 'Password required'}), 400
+    error = body_validator('/auth/reset/{token}', message='Password required').validate(data)
+    if error is not None:
+        return jsonify(error), 400
+    pwd = data['str_Password']
 
     # Delegate password reset to service
-    result = User.reset_password_service(email, encrypt_password(pwd))
+    result = User.reset_password_service(email, pwd)
     status = 200 if result.get('ErrorCode') == 9999 else 400
     return jsonify(result), status
\ No newline at end of file
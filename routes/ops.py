@@ -0,0 +1,28 @@
+# routes/ops.py
+
+from flask import Blueprint, jsonify
+from flask_jwt_extended import jwt_required
+
+from DB_CONNECTION.config import engine, read_router
+from DB_CONNECTION.pool import pool_stats
+from MODULE.USER.service.user_service import user_cache
+from MODULE.USER.service.archive_service import UserArchive
+from MODULE.USER.util.dns_util import domain_cache
+from MODULE.JOBS.service.outbox_service import Outbox
+
+ops_bp = Blueprint('ops_bp', __name__, url_prefix='/ops')
+
+
+@ops_bp.route('/stats', methods=['GET'])
+@jwt_required()
+def stats():
+    return jsonify({
+        'ErrorCode':  9999,
+        'User_Cache': user_cache.stats() if user_cache is not None else None,
+        'DNS_Cache':  domain_cache.stats(),
+        'DB_Pool':    pool_stats(engine),
+        'DB_Reads':   {**read_router.stats(), 'Health': read_router.check(),
+                       'Pools': {label: pool_stats(e) for label, e in read_router.named_engines()[1:]}},
+        'Outbox':     Outbox.stats(),
+        'Users':      UserArchive.stats()
+    }), 200
@@ -1,31 +1,197 @@
 # routes/users.py
 
-from flask import Blueprint, request, jsonify
+import json
+from datetime import datetime
+from flask import Blueprint, Response, request, jsonify, url_for
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
+from config import Config
 from MODULE.USER.service.user_service import User
+from MODULE.USER.service.bulk_import_service import BulkImport
+from MODULE.USER.service.export_service import EXPORT_FORMATS, parse_columns, export_users
+from MODULE.USER.util.stream_util import STREAM_FORMATS, encode_stream
+from MODULE.COMMON.util.http_cache_util import make_etag, conditional_json
+from MODULE.COMMON.util.schema_util import validate_body
 
 user_bp = Blueprint('user_bp', __name__, url_prefix='/users')
 
+def _page_limit():
+    """(limit, None) from ?limit= (default/capped by config), or (None, error response)."""
+    limit = request.args.get('limit', type=int)
+    if 'limit' not in request.args:
+        return Config.USERS_PAGE_DEFAULT_LIMIT, None
+    if limit is None or limit < 1:
+        return None, (jsonify({'ErrorCode': 9997, 'Message': 'limit must be a positive integer'}), 400)
+    return min(limit, Config.USERS_PAGE_MAX_LIMIT), None
+
+def _conditional_page(build_payload):
+    """Page response with the table-wide validator; 304 skips the page query."""
+    validator = User.users_validator()
+    if validator is None:
+        return conditional_json(build_payload, None)
+    token, last_modified = validator
+    return conditional_json(build_payload, make_etag('users', token, request.full_path), last_modified)
+
 @user_bp.route('', methods=['GET'])
 @jwt_required()
 def list_users():
-    return jsonify(User.list_users_service()), 200
+    after = request.args.get('after', type=int)
+    if 'after' in request.args and after is None:
+        return jsonify({'ErrorCode': 9997, 'Message': 'after must be an integer'}), 400
+
+    # ?stream=json|ndjson -> whole table from a server-side cursor
+    fmt = request.args.get('stream')
+    if fmt:
+        if fmt not in STREAM_FORMATS:
+            return jsonify({'ErrorCode': 9997, 'Message': f'stream must be one of {sorted(STREAM_FORMATS)}'}), 400
+        chunks = User.iter_users_service(Config.USERS_STREAM_CHUNK_SIZE, after)
+        return Response(encode_stream(chunks, fmt), mimetype=STREAM_FORMATS[fmt])
+
+    limit, error = _page_limit()
+    if error:
+        return error
+    return _conditional_page(lambda: User.list_users_service(limit, after))
+
+@user_bp.route('/search', methods=['GET'])
+@jwt_required()
+def search_users():
+    # ?name= / ?email= prefixes (case-insensitive), ?location= exact,
+    # ?status=active|deleted|all, ?limit=, ?after=<Next_Cursor>
+    limit, error = _page_limit()
+    if error:
+        return error
+    args = request.args
+
+    def search():
+        result = User.search_users_service(
+            name=args.get('name', '').strip() or None,
+            email=args.get('email', '').strip() or None,
+            location=args.get('location') or None,
+            status=args.get('status', 'active'),
+            limit=limit,
+            after=args.get('after') or None
+        )
+        return result, 400 if result['ErrorCode'] == 9997 else 200
+
+    return _conditional_page(search)
 
 @user_bp.route('', methods=['POST'])
 @jwt_required()
+@validate_body('/users')
 def create_user():
-    data = request.get_json() or {}
+    data = request.get_json()
     data['User_ID'] = get_jwt_identity()
     return jsonify(User.save_user_service(data)), 201
 
+@user_bp.route('/bulk', methods=['POST'])
+@jwt_required()
+def bulk_create_users():
+    # JSON array body, or one JSON object per line with Content-Type application/x-ndjson
+    try:
+        if request.mimetype == 'application/x-ndjson':
+            rows = [json.loads(line) for line in request.get_data(as_text=True).splitlines() if line.strip()]
+        else:
+            rows = request.get_json(silent=True)
+    except ValueError:
+        return jsonify({'ErrorCode': 9997, 'Message': 'Body must be a JSON array or NDJSON'}), 400
+
+    if not isinstance(rows, list) or not rows:
+        return jsonify({'ErrorCode': 9997, 'Message': 'Body must be a non-empty JSON array or NDJSON'}), 400
+    if len(rows) > Config.BULK_IMPORT_MAX_ROWS:
+        return jsonify({'ErrorCode': 9997, 'Message': f'At most {Config.BULK_IMPORT_MAX_ROWS} rows per upload'}), 400
+
+    # Hashing thousands of passwords takes minutes: the job workers do it
+    result = BulkImport.enqueue_service(rows, get_jwt_identity())
+    if result['ErrorCode'] != 9999:
+        return jsonify(result), 500
+    result['Status_URL'] = url_for('user_bp.bulk_import_status', import_id=result['Import_ID'])
+    return jsonify(result), 202, {'Location': result['Status_URL']}
+
+@user_bp.route('/bulk/<import_id>', methods=['GET'])
+@jwt_required()
+def bulk_import_status(import_id):
+    result = BulkImport.status_service(import_id)
+    status = {9999: 200, 9995: 404}.get(result['ErrorCode'], 500)
+    return jsonify(result), status
+
+@user_bp.route('/export', methods=['GET'])
+@jwt_required()
+def export_users_route():
+    fmt = request.args.get('format', 'ndjson')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'ErrorCode': 9997, 'Message': f'format must be one of {sorted(EXPORT_FORMATS)}'}), 400
+    try:
+        columns = parse_columns(request.args.get('columns'))
+        since = request.args.get('modified_since')
+        since = datetime.fromisoformat(since) if since else None
+    except ValueError as e:
+        return jsonify({'ErrorCode': 9997, 'Message': str(e)}), 400
+
+    include_deleted = request.args.get('include_deleted', '').lower() in ('1', 'true', 'yes')
+    gzip = request.accept_encodings['gzip'] > 0
+    body = export_users(fmt, columns, since, include_deleted, gzip, Config.USERS_STREAM_CHUNK_SIZE)
+
+    resp = Response(body, mimetype=EXPORT_FORMATS[fmt])
+    resp.headers['Content-Disposition'] = f'attachment; filename=users.{fmt}'
+    resp.headers['Vary'] = 'Accept-Encoding'
+    if gzip:
+        resp.headers['Content-Encoding'] = 'gzip'
+    return resp
+
+@user_bp.route('/changes', methods=['GET'])
+@jwt_required()
+def user_changes():
+    # ?since=<Next_Cursor from the previous poll> (omit for a full initial sync), ?limit=
+    limit, error = _page_limit()
+    if error:
+        return error
+    result = User.user_changes_service(limit, request.args.get('since') or None,
+                                       Config.USERS_CHANGES_SETTLE_SECONDS)
+    status = {9999: 200, 9997: 400}.get(result['ErrorCode'], 500)
+    return jsonify(result), status
+
+def _batch_response(ids):
+    """Shared by GET/POST /users/batch; ids as given by the client."""
+    try:
+        ids = [int(i) for i in ids]
+    except (TypeError, ValueError):
+        return jsonify({'ErrorCode': 9997, 'Message': 'ids must be integers'}), 400
+    if not ids:
+        return jsonify({'ErrorCode': 9997, 'Message': 'ids is required'}), 400
+    if len(ids) > Config.USERS_BATCH_MAX_IDS:
+        return jsonify({'ErrorCode': 9997, 'Message': f'At most {Config.USERS_BATCH_MAX_IDS} ids per request'}), 400
+
+    result, changed = User.get_user_entries(ids)
+    if result['ErrorCode'] != 9999:
+        return jsonify(result), 500
+    # Validator: every returned user's change time, plus which ids were missing
+    etag = make_etag('users-batch', *(f'{i}:{d.isoformat()}' for i, d in changed.items()), *result['Missing_IDs'])
+    return conditional_json(lambda: result, etag, max(changed.values(), default=None))
+
+@user_bp.route('/batch', methods=['GET'])
+@jwt_required()
+def get_users_batch():
+    # ?ids=3,1,2 (or repeated ?ids=); POST the same as {"ids": [...]} for long lists
+    ids = [i for arg in request.args.getlist('ids') for i in arg.split(',') if i.strip()]
+    return _batch_response(ids)
+
+@user_bp.route('/batch', methods=['POST'])
+@jwt_required()
+@validate_body('/users/batch')
+def post_users_batch():
+    return _batch_response(request.get_json()['ids'])
+
 @user_bp.route('/<int:lng_User_ID>', methods=['GET'])
 @jwt_required()
 def get_user(lng_User_ID):
-    return jsonify(User.get_user_details(lng_User_ID)), 200
+    result, changed = User.get_user_entry(lng_User_ID)
+    if changed is None:
+        return jsonify(result), 200
+    return conditional_json(lambda: result, make_etag('user', lng_User_ID, changed.isoformat()), changed)
 
 @user_bp.route('/<int:lng_User_ID>', methods=['PUT'])
 @jwt_required()
+@validate_body('/users/{lng_User_ID}', 'put')
 def update_user(lng_User_ID):
     data = request.get_json() or {}
     data.update({'User_ID': get_jwt_identity(), 'lng_User_ID': lng_User_ID})
@@ -1,7 +1,52 @@
 # swagger.py
-from flasgger import Swagger
 import os
+import threading
 
-def init_swagger(app):
-    yaml_path = os.path.join(os.path.dirname(__file__), 'swagger.yaml')
-    Swagger(app, template_file=yaml_path)
+SWAGGER_YAML = os.path.join(os.path.dirname(__file__), 'swagger.yaml')
+SWAGGER_MODES = ('lazy', 'eager', 'off')
+
+# URL prefixes flasgger serves (UI, spec JSON, static assets)
+_DOCS_PREFIXES = ('/apidocs', '/apispec', '/flasgger_static')
+
+
+class LazySwagger:
+    """
+    WSGI middleware: docs URLs go to a small Flask app that imports flasgger
+    and loads swagger.yaml on the first docs request; everything else goes
+    straight to the wrapped app. The spec is entirely swagger.yaml (views
+    carry no docstring specs), so the docs app serves the same document.
+    """
+
+    def __init__(self, wsgi_app, swagger_config: dict = None):
+        self.wsgi_app = wsgi_app
+        self.swagger_config = swagger_config
+        self._docs = None
+        self._lock = threading.Lock()
+
+    def _docs_app(self):
+        if self._docs is None:
+            with self._lock:
+                if self._docs is None:
+                    from flask import Flask
+                    from flasgger import Swagger
+                    docs = Flask('swagger')
+                    if self.swagger_config:
+                        docs.config['SWAGGER'] = self.swagger_config
+                    Swagger(docs, template_file=SWAGGER_YAML)
+                    self._docs = docs
+        return self._docs
+
+    def __call__(self, environ, start_response):
+        if environ.get('PATH_INFO', '').startswith(_DOCS_PREFIXES):
+            return self._docs_app()(environ, start_response)
+        return self.wsgi_app(environ, start_response)
+
+
+def init_swagger(app, mode: str = 'lazy'):
+    if mode not in SWAGGER_MODES:
+        raise ValueError(f'Unknown SWAGGER_MODE: {mode}')
+    if mode == 'eager':
+        from flasgger import Swagger
+        Swagger(app, template_file=SWAGGER_YAML)
+    elif mode == 'lazy':
+        app.wsgi_app = LazySwagger(app.wsgi_app, app.config.get('SWAGGER'))